@@ -6,9 +6,10 @@ import numpy as np
 import math
 from config import APF_ATTRACT_GAIN, APF_REPULSE_GAIN, APF_INFLUENCE_DISTANCE, TILE_SIZE
 from game.grid import is_valid_grid, is_walkable
+from algos.planner import Planner, roll_out
 
 
-class APFPlanner:
+class APFPlanner(Planner):
     """Artificial Potential Field 경로 계획"""
     
     def __init__(self, k_att=APF_ATTRACT_GAIN, k_rep=APF_REPULSE_GAIN, 
@@ -79,6 +80,13 @@ class APFPlanner:
         
         return fx_total, fy_total
     
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 목표까지 그리드 스텝을 반복한 전체 경로 (로컬 미니멈이면 [])"""
+        return roll_out(
+            lambda current, target: self.plan_step_grid(current, target, nav.grid_map),
+            start, goal
+        )
+    
     def plan_step_grid(self, current_grid, goal_grid, grid_map):
         """
         그리드 기반 한 스텝 계획
@@ -137,7 +145,7 @@ class APFPlanner:
             for dx in range(-radius, radius + 1):
                 nx, ny = gx + dx, gy + dy
                 
-                if is_valid_grid(nx, ny) and not is_walkable(grid_map, nx, ny):
+                if is_valid_grid(nx, ny, grid_map) and not is_walkable(grid_map, nx, ny):
                     # 장애물의 월드 좌표
                     ox = nx * TILE_SIZE + TILE_SIZE / 2
                     oy = ny * TILE_SIZE + TILE_SIZE / 2
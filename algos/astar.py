@@ -0,0 +1,230 @@
+"""
+그리드 A* / Jump Point Search
+이동 가능 마스크 위에서 8방향 (모서리 통과 금지) 최단 경로 탐색
+"""
+
+import math
+from heapq import heappush, heappop
+from algos.planner import Planner, run_steps
+
+
+SQRT2 = math.sqrt(2)
+
+# 8방향 이웃 (dx, dy, 비용)
+NEIGHBORS_8 = [
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2)
+]
+
+
+def octile(dx, dy):
+    """8방향 이동 거리 휴리스틱"""
+    dx = abs(dx)
+    dy = abs(dy)
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+class AStarPlanner(Planner):
+    """배열 기반 그리드 A* (이진 힙, 미리 할당한 g/parent 배열)"""
+    
+    STEP_EXPANSIONS = 64  # plan_steps에서 yield 사이에 확장하는 노드 수
+    
+    def __init__(self):
+        self.expanded = 0  # 마지막 탐색에서 확장한 노드 수
+    
+    def plan(self, start, goal, nav):
+        """start에서 goal까지 타일 경로 (start 포함, 없으면 [])"""
+        return run_steps(self.plan_steps(start, goal, nav))
+    
+    def plan_steps(self, start, goal, nav):
+        """plan()의 제너레이터 형태 (STEP_EXPANSIONS개 확장마다 yield, 오픈셋은 그대로 유지)"""
+        width, height = nav.width, nav.height
+        if not nav.is_walkable(*start) or not nav.is_walkable(*goal):
+            return []
+        if start == goal:
+            return [start]
+        
+        self._width = width
+        self._height = height
+        self._free = nav.free
+        self._goal = goal
+        
+        n = width * height
+        g = [math.inf] * n
+        parent = [-1] * n
+        closed = [False] * n
+        
+        s = start[1] * width + start[0]
+        t = goal[1] * width + goal[0]
+        g[s] = 0.0
+        
+        open_heap = [(octile(goal[0] - start[0], goal[1] - start[1]), 0.0, s)]
+        self.expanded = 0
+        
+        while open_heap:
+            _, _, current = heappop(open_heap)
+            if closed[current]:
+                continue
+            if current == t:
+                return self._reconstruct(parent, current)
+            
+            closed[current] = True
+            self.expanded += 1
+            if self.expanded % self.STEP_EXPANSIONS == 0:
+                yield
+            cx = current % width
+            cy = current // width
+            
+            for nx, ny, cost in self._successors(cx, cy, parent[current]):
+                ni = ny * width + nx
+                if closed[ni]:
+                    continue
+                ng = g[current] + cost
+                if ng < g[ni]:
+                    g[ni] = ng
+                    parent[ni] = current
+                    # 같은 f면 g가 큰(목표에 가까운) 노드 우선
+                    heappush(open_heap, (ng + octile(goal[0] - nx, goal[1] - ny), -ng, ni))
+        
+        return []
+    
+    def _walkable(self, x, y):
+        return 0 <= x < self._width and 0 <= y < self._height and self._free[y * self._width + x]
+    
+    def _successors(self, x, y, parent_index):
+        """이웃 노드 (x, y, 비용) - 대각선은 양쪽 직교 타일이 모두 비어 있을 때만"""
+        walkable = self._walkable
+        for dx, dy, cost in NEIGHBORS_8:
+            nx, ny = x + dx, y + dy
+            if not walkable(nx, ny):
+                continue
+            if dx and dy and not (walkable(nx, y) and walkable(x, ny)):
+                continue
+            yield nx, ny, cost
+    
+    def _reconstruct(self, parent, index):
+        """parent 배열을 따라 경로 복원"""
+        width = self._width
+        path = []
+        while index != -1:
+            path.append((index % width, index // width))
+            index = parent[index]
+        path.reverse()
+        return path
+
+
+class JPSPlanner(AStarPlanner):
+    """Jump Point Search (모서리 통과 금지 변형)
+    
+    직선/대각선으로 강제 이웃이 나올 때까지 건너뛰어 확장 노드 수를 줄인다.
+    결과 경로는 점프 지점 사이를 타일 단위로 채워 A*와 같은 형식으로 반환한다.
+    """
+    
+    def _successors(self, x, y, parent_index):
+        """가지치기한 이웃 방향마다 점프해서 찾은 점프 지점"""
+        for dx, dy in self._pruned_directions(x, y, parent_index):
+            point = self._jump(x + dx, y + dy, dx, dy)
+            if point is not None:
+                jx, jy = point
+                yield jx, jy, octile(jx - x, jy - y)
+    
+    def _pruned_directions(self, x, y, parent_index):
+        """부모에서 온 방향 기준으로 탐색할 방향 (자연 이웃 + 강제 이웃)"""
+        walkable = self._walkable
+        
+        if parent_index == -1:
+            for dx, dy, _ in NEIGHBORS_8:
+                if not walkable(x + dx, y + dy):
+                    continue
+                if dx and dy and not (walkable(x + dx, y) and walkable(x, y + dy)):
+                    continue
+                yield dx, dy
+            return
+        
+        px = parent_index % self._width
+        py = parent_index // self._width
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        
+        if dx and dy:
+            walk_x = walkable(x + dx, y)
+            walk_y = walkable(x, y + dy)
+            if walk_y:
+                yield 0, dy
+            if walk_x:
+                yield dx, 0
+            if walk_x and walk_y:
+                yield dx, dy
+        elif dx:
+            ahead = walkable(x + dx, y)
+            up = walkable(x, y - 1)
+            down = walkable(x, y + 1)
+            if ahead:
+                yield dx, 0
+                if up:
+                    yield dx, -1
+                if down:
+                    yield dx, 1
+            if up:
+                yield 0, -1
+            if down:
+                yield 0, 1
+        else:
+            ahead = walkable(x, y + dy)
+            left = walkable(x - 1, y)
+            right = walkable(x + 1, y)
+            if ahead:
+                yield 0, dy
+                if left:
+                    yield -1, dy
+                if right:
+                    yield 1, dy
+            if left:
+                yield -1, 0
+            if right:
+                yield 1, 0
+    
+    def _jump(self, x, y, dx, dy):
+        """(dx, dy) 방향으로 점프 지점을 찾을 때까지 전진 (없으면 None)"""
+        walkable = self._walkable
+        goal = self._goal
+        
+        while True:
+            if not walkable(x, y):
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            
+            if dx and dy:
+                # 대각선 이동 중: 직교 방향 점프에서 무언가 찾으면 여기가 점프 지점
+                if self._jump(x + dx, y, dx, 0) is not None or \
+                   self._jump(x, y + dy, 0, dy) is not None:
+                    return (x, y)
+                if not (walkable(x + dx, y) and walkable(x, y + dy)):
+                    return None
+            elif dx:
+                # 옆이 열리고 뒤쪽 대각선이 막혔으면 강제 이웃
+                if (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or \
+                   (walkable(x, y + 1) and not walkable(x - dx, y + 1)):
+                    return (x, y)
+            else:
+                if (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or \
+                   (walkable(x + 1, y) and not walkable(x + 1, y - dy)):
+                    return (x, y)
+            
+            x += dx
+            y += dy
+    
+    def _reconstruct(self, parent, index):
+        """점프 지점 사이를 한 칸씩 채운 전체 경로"""
+        jump_points = super()._reconstruct(parent, index)
+        path = [jump_points[0]]
+        for x1, y1 in jump_points[1:]:
+            x, y = path[-1]
+            dx = (x1 > x) - (x1 < x)
+            dy = (y1 > y) - (y1 < y)
+            while (x, y) != (x1, y1):
+                x += dx
+                y += dy
+                path.append((x, y))
+        return path
@@ -5,20 +5,22 @@ Probabilistic Localization (Bayesian Filter)
 
 import numpy as np
 import math
-from game.grid import is_valid_grid, is_walkable, line_of_sight, distance_world
+from game.grid import is_valid_grid, is_walkable, line_of_sight, distance_world, walkable_mask
 from config import TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
 
 
 class BeliefPlanner:
     """Belief 기반 추적 플래너"""
     
-    def __init__(self, grid_resolution=4, sensor_range=300, sensor_noise=40, motion_noise=20):
+    def __init__(self, grid_resolution=4, sensor_range=300, sensor_noise=40, motion_noise=20,
+                 map_size=(GRID_WIDTH, GRID_HEIGHT)):
         """
         Args:
             grid_resolution: Belief 그리드 해상도 (값이 클수록 저해상도)
             sensor_range: 센서 감지 범위
             sensor_noise: 센서 노이즈 (표준편차)
             motion_noise: 모션 노이즈 (표준편차)
+            map_size: 맵 크기 (타일 단위 (너비, 높이), 다른 맵이면 fit_map으로 맞춤)
         """
         self.resolution = grid_resolution
         self.sensor_range = sensor_range
@@ -26,8 +28,9 @@ class BeliefPlanner:
         self.motion_noise = motion_noise
         
         # Belief 그리드 크기
-        self.belief_width = GRID_WIDTH // grid_resolution
-        self.belief_height = GRID_HEIGHT // grid_resolution
+        self.map_size = map_size
+        self.belief_width = map_size[0] // grid_resolution
+        self.belief_height = map_size[1] // grid_resolution
         
         # Belief 분포 (확률)
         self.belief = np.ones((self.belief_height, self.belief_width))
@@ -35,19 +38,60 @@ class BeliefPlanner:
         
         # 이전 측정값
         self.last_measurement = None
+        
+        # Belief가 바뀔 때마다 증가 (히트맵 캐시 무효화용)
+        self.version = 0
     
     def reset(self):
         """Belief 초기화 (균등 분포)"""
         self.belief = np.ones((self.belief_height, self.belief_width))
         self.belief /= self.belief.sum()
         self.last_measurement = None
+        self.version += 1
+    
+    def fit_map(self, grid_map):
+        """맵 크기가 바뀌었으면 Belief 그리드 크기를 맞추고 초기화 (바뀌었으면 True)"""
+        height, width = np.shape(grid_map)
+        if (width, height) == self.map_size:
+            return False
+        self.map_size = (width, height)
+        self.belief_width = width // self.resolution
+        self.belief_height = height // self.resolution
+        self.reset()
+        return True
     
-    def predict(self, motion_model):
+    def seed(self, position, spread, grid_map=None, map_version=None):
+        """
+        주어진 위치 주변의 가우시안 분포로 Belief 초기화
+        
+        Args:
+            position: (x, y) 중심 (월드 좌표)
+            spread: 표준편차 (월드 단위)
+            grid_map, map_version: 사용하지 않음 (ParticleBeliefPlanner와 인터페이스 호환용)
+        """
+        cell = self.resolution * TILE_SIZE
+        sigma = max(spread / cell, 0.5)
+        cx = position[0] / cell - 0.5
+        cy = position[1] / cell - 0.5
+        
+        xs = np.arange(self.belief_width)
+        ys = np.arange(self.belief_height)[:, None]
+        self.belief = np.exp(-((xs - cx) ** 2 + (ys - cy) ** 2) / (2 * sigma * sigma))
+        
+        belief_sum = self.belief.sum()
+        if belief_sum > 1e-10:
+            self.belief /= belief_sum
+        else:
+            self.reset()
+        self.version += 1
+    
+    def predict(self, motion_model, grid_map=None, map_version=None):
         """
         Prediction step (Motion Model)
         
         Args:
             motion_model: (dx, dy) 예상 이동량 (그리드 단위)
+            grid_map, map_version: 사용하지 않음 (ParticleBeliefPlanner와 인터페이스 호환용)
         """
         dx, dy = motion_model
         
@@ -72,8 +116,9 @@ class BeliefPlanner:
         
         self.belief = new_belief
         self.belief /= (self.belief.sum() + 1e-10)  # 정규화
+        self.version += 1
     
-    def update(self, measurement, grid_map, enemy_pos):
+    def update(self, measurement, grid_map, enemy_pos, sensor_range=None, visible=None):
         """
         Update step (Sensor Model)
         
@@ -81,14 +126,19 @@ class BeliefPlanner:
             measurement: (x, y) 플레이어 측정 위치 (월드 좌표)
             grid_map: 맵 (시야 체크용)
             enemy_pos: (x, y) 적 위치 (월드 좌표)
+            sensor_range: 측정한 적의 센서 범위 (None이면 self.sensor_range)
+            visible: 측정 위치가 보이는지 (None이면 line_of_sight로 계산)
         """
+        if sensor_range is None:
+            sensor_range = self.sensor_range
+        
         # 측정값을 belief 그리드 좌표로 변환
         meas_gx = int(measurement[0] / TILE_SIZE / self.resolution)
         meas_gy = int(measurement[1] / TILE_SIZE / self.resolution)
         
         # 거리 체크
         dist = distance_world(enemy_pos, measurement)
-        if dist > self.sensor_range:
+        if dist > sensor_range:
             # 범위 밖이면 업데이트 안 함
             return
         
@@ -96,7 +146,9 @@ class BeliefPlanner:
         enemy_grid = (int(enemy_pos[0] / TILE_SIZE), int(enemy_pos[1] / TILE_SIZE))
         meas_grid = (int(measurement[0] / TILE_SIZE), int(measurement[1] / TILE_SIZE))
         
-        has_line_of_sight = line_of_sight(grid_map, enemy_grid, meas_grid)
+        has_line_of_sight = visible
+        if has_line_of_sight is None:
+            has_line_of_sight = line_of_sight(grid_map, enemy_grid, meas_grid)
         
         # Likelihood 계산
         for y in range(self.belief_height):
@@ -126,6 +178,7 @@ class BeliefPlanner:
             self.reset()
         
         self.last_measurement = measurement
+        self.version += 1
     
     def get_estimated_position(self):
         """가장 확률이 높은 위치 반환 (월드 좌표)"""
@@ -173,3 +226,412 @@ class BeliefPlanner:
     def get_belief_heatmap(self):
         """시각화용 히트맵 데이터"""
         return self.belief.copy()
+
+
+class ParticleBeliefPlanner:
+    """파티클 필터 기반 추적 플래너
+    
+    히스토그램 필터와 달리 비용이 맵 크기가 아닌 파티클 수에 비례한다.
+    BeliefPlanner와 같은 인터페이스(predict/update/get_*_position)를 제공한다.
+    """
+    
+    def __init__(self, num_particles=400, grid_resolution=4, sensor_range=300,
+                 sensor_noise=40, motion_noise=20, map_size=(GRID_WIDTH, GRID_HEIGHT)):
+        """
+        Args:
+            num_particles: 파티클 개수 (비용 조절용)
+            grid_resolution: 히트맵/불확실성 계산용 Belief 그리드 해상도
+            sensor_range: 센서 감지 범위
+            sensor_noise: 센서 노이즈 (표준편차, 월드 단위)
+            motion_noise: 모션 노이즈 (표준편차, 월드 단위)
+            map_size: 맵 크기 (타일 단위 (너비, 높이), 다른 맵이면 fit_map으로 맞춤)
+        """
+        self.num_particles = num_particles
+        self.resolution = grid_resolution
+        self.sensor_range = sensor_range
+        self.sensor_noise = sensor_noise
+        self.motion_noise = motion_noise
+        
+        # 히트맵용 Belief 그리드 크기 (BeliefPlanner와 동일)
+        self.map_size = map_size
+        self.belief_width = map_size[0] // grid_resolution
+        self.belief_height = map_size[1] // grid_resolution
+        
+        self.rng = np.random.default_rng()
+        
+        # 파티클 (월드 좌표)과 가중치
+        self.particles = np.zeros((num_particles, 2))
+        self.weights = np.full(num_particles, 1.0 / num_particles)
+        
+        # 재샘플링 기준 (유효 샘플 수 비율)
+        self.resample_threshold = 0.5
+        
+        self.last_measurement = None
+        self._initialized = False
+        
+        # 이동 가능 마스크 캐시 (같은 맵, 같은 맵 버전이면 재사용)
+        self._mask = None
+        self._mask_map = None
+        self._mask_version = None
+        
+        # 파티클이 바뀔 때마다 증가 (히트맵 캐시 무효화용)
+        self.version = 0
+        self.reset()
+    
+    def reset(self, grid_map=None):
+        """파티클 초기화 (이동 가능 영역에 균등 분포)"""
+        n = self.num_particles
+        sampled = False
+        
+        if grid_map is not None:
+            mask = self._walkable(grid_map)
+            free = np.flatnonzero(mask)
+            if len(free) > 0:
+                cells = self.rng.choice(free, size=n)
+                gy, gx = np.divmod(cells, mask.shape[1])
+                self.particles[:, 0] = (gx + self.rng.random(n)) * TILE_SIZE
+                self.particles[:, 1] = (gy + self.rng.random(n)) * TILE_SIZE
+                self._initialized = True
+                sampled = True
+        
+        if not sampled:
+            # 맵을 모르면 전체 영역에 균등 분포
+            self.particles[:, 0] = self.rng.random(n) * self.map_size[0] * TILE_SIZE
+            self.particles[:, 1] = self.rng.random(n) * self.map_size[1] * TILE_SIZE
+        
+        self.weights.fill(1.0 / n)
+        self.last_measurement = None
+        self.version += 1
+    
+    def fit_map(self, grid_map):
+        """맵 크기가 바뀌었으면 히트맵 그리드 크기를 맞추고 파티클을 새 맵에 다시 뿌림"""
+        height, width = np.shape(grid_map)
+        if (width, height) == self.map_size:
+            return False
+        self.map_size = (width, height)
+        self.belief_width = width // self.resolution
+        self.belief_height = height // self.resolution
+        self.reset(grid_map)
+        return True
+    
+    def seed(self, position, spread, grid_map=None, map_version=None, retries=5):
+        """
+        주어진 위치 주변의 가우시안 분포로 파티클 초기화
+        
+        Args:
+            position: (x, y) 중심 (월드 좌표)
+            spread: 표준편차 (월드 단위)
+            grid_map: 맵 (주어지면 벽/맵 밖에 떨어진 파티클을 다시 뽑음)
+            map_version: grid_map의 버전 (이동 가능 마스크 캐시용)
+            retries: 다시 뽑는 횟수 (그래도 벽에 있으면 이동 가능한 다른 파티클 위치를 복사)
+        """
+        center = np.asarray(position, dtype=float)
+        self.particles = center + self.rng.normal(0.0, spread, size=self.particles.shape)
+        self.weights.fill(1.0 / self.num_particles)
+        self.version += 1
+        if grid_map is None:
+            return
+        
+        mask = self._walkable(grid_map, map_version)
+        bad = ~self._on_free(self.particles, mask)
+        for _ in range(retries):
+            if not bad.any():
+                return
+            self.particles[bad] = center + self.rng.normal(0.0, spread, size=(int(bad.sum()), 2))
+            bad = ~self._on_free(self.particles, mask)
+        
+        good = np.flatnonzero(~bad)
+        if len(good) == 0:
+            # 중심 주변이 모두 막혀 있으면 이동 가능 영역 전체에 다시 뿌림
+            self.reset(grid_map)
+        elif bad.any():
+            self.particles[bad] = self.particles[self.rng.choice(good, size=int(bad.sum()))]
+    
+    def _walkable(self, grid_map, map_version=None):
+        """grid_map의 이동 가능 마스크 (버전을 모르면 매번 계산)"""
+        if (self._mask is None or map_version is None or grid_map is not self._mask_map or
+                map_version != self._mask_version):
+            self._mask = walkable_mask(grid_map)
+            self._mask_map = grid_map
+            self._mask_version = map_version
+        return self._mask
+    
+    @staticmethod
+    def _on_free(points, mask):
+        """월드 좌표 점들이 맵 안의 이동 가능한 타일 위에 있는지 (bool 배열)"""
+        height, width = mask.shape
+        gx = np.floor(points[:, 0] / TILE_SIZE).astype(int)
+        gy = np.floor(points[:, 1] / TILE_SIZE).astype(int)
+        inside = (gx >= 0) & (gx < width) & (gy >= 0) & (gy < height)
+        ok = inside.copy()
+        ok[inside] = mask[gy[inside], gx[inside]]
+        return ok
+    
+    def predict(self, motion_model, grid_map=None, map_version=None):
+        """
+        Prediction step (벽을 고려한 모션 모델)
+        
+        Args:
+            motion_model: (dx, dy) 예상 이동량 (Belief 그리드 단위)
+            grid_map: 맵 (주어지면 벽으로 들어가는 파티클은 제자리에 머묾)
+            map_version: grid_map의 버전 (주어지면 버전이 바뀔 때만 이동 가능 마스크를 다시 계산)
+        """
+        if grid_map is not None and not self._initialized:
+            self.reset(grid_map)
+        
+        dx, dy = motion_model
+        scale = self.resolution * TILE_SIZE
+        
+        noise = self.rng.normal(0.0, self.motion_noise, size=self.particles.shape)
+        moved = self.particles + noise
+        moved[:, 0] += dx * scale
+        moved[:, 1] += dy * scale
+        
+        if grid_map is not None:
+            ok = self._on_free(moved, self._walkable(grid_map, map_version))
+            # 벽/맵 밖으로 나간 파티클은 이전 위치 유지
+            moved[~ok] = self.particles[~ok]
+        
+        self.particles = moved
+        self.version += 1
+    
+    def update(self, measurement, grid_map, enemy_pos, sensor_range=None, visible=None):
+        """
+        Update step (Sensor Model)
+        
+        Args:
+            measurement: (x, y) 플레이어 측정 위치 (월드 좌표)
+            grid_map: 맵 (시야 체크용)
+            enemy_pos: (x, y) 적 위치 (월드 좌표)
+            sensor_range: 측정한 적의 센서 범위 (None이면 self.sensor_range)
+            visible: 측정 위치가 보이는지 (None이면 line_of_sight로 계산)
+        """
+        if sensor_range is None:
+            sensor_range = self.sensor_range
+        
+        # 거리 체크
+        dist = distance_world(enemy_pos, measurement)
+        if dist > sensor_range:
+            return
+        
+        # 시야 체크
+        enemy_grid = (int(enemy_pos[0] / TILE_SIZE), int(enemy_pos[1] / TILE_SIZE))
+        meas_grid = (int(measurement[0] / TILE_SIZE), int(measurement[1] / TILE_SIZE))
+        if visible is None:
+            visible = line_of_sight(grid_map, enemy_grid, meas_grid)
+        
+        sigma = self.sensor_noise if visible else self.sensor_noise * 2
+        
+        # 가우시안 likelihood (정규화 상수는 가중치 정규화에서 상쇄)
+        d2 = ((self.particles[:, 0] - measurement[0]) ** 2 +
+              (self.particles[:, 1] - measurement[1]) ** 2)
+        self.weights *= np.exp(-d2 / (2 * sigma * sigma))
+        
+        weight_sum = self.weights.sum()
+        if weight_sum > 1e-300:
+            self.weights /= weight_sum
+        else:
+            # 모든 파티클이 측정과 맞지 않으면 측정값 주변으로 재초기화
+            self.seed(measurement, sigma, grid_map)
+        
+        # 유효 샘플 수가 떨어지면 재샘플링
+        if self.effective_sample_size() < self.resample_threshold * self.num_particles:
+            self._systematic_resample()
+        
+        self.last_measurement = measurement
+        self.version += 1
+    
+    def effective_sample_size(self):
+        """유효 샘플 수 (ESS = 1 / Σw²)"""
+        return 1.0 / np.sum(self.weights * self.weights)
+    
+    def _systematic_resample(self):
+        """Systematic resampling (O(N))"""
+        n = self.num_particles
+        positions = (self.rng.random() + np.arange(n)) / n
+        cumulative = np.cumsum(self.weights)
+        cumulative[-1] = 1.0  # 반올림 오차 방지
+        indices = np.searchsorted(cumulative, positions)
+        
+        self.particles = self.particles[indices]
+        self.weights.fill(1.0 / n)
+    
+    @property
+    def belief(self):
+        """Belief 그리드 히스토그램 (BeliefPlanner.belief와 같은 형태)"""
+        scale = self.resolution * TILE_SIZE
+        bx = np.clip((self.particles[:, 0] // scale).astype(int), 0, self.belief_width - 1)
+        by = np.clip((self.particles[:, 1] // scale).astype(int), 0, self.belief_height - 1)
+        
+        hist = np.bincount(by * self.belief_width + bx, weights=self.weights,
+                           minlength=self.belief_width * self.belief_height)
+        return hist.reshape(self.belief_height, self.belief_width)
+    
+    def get_estimated_position(self):
+        """가장 확률이 높은 Belief 셀 중심 반환 (월드 좌표)"""
+        by, bx = np.unravel_index(np.argmax(self.belief), (self.belief_height, self.belief_width))
+        
+        world_x = (bx * self.resolution + self.resolution / 2) * TILE_SIZE
+        world_y = (by * self.resolution + self.resolution / 2) * TILE_SIZE
+        
+        return (world_x, world_y)
+    
+    def get_mean_position(self):
+        """파티클 가중평균 위치 반환 (월드 좌표)"""
+        mean = np.average(self.particles, axis=0, weights=self.weights)
+        return (float(mean[0]), float(mean[1]))
+    
+    def get_belief_heatmap(self):
+        """시각화용 히트맵 데이터"""
+        return self.belief
+
+
+class TeamBeliefTracker:
+    """여러 Belief 적이 공유하는 레벨 단위 Belief
+    
+    예측(predict)은 틱마다 한 번만 수행하고, 각 적은 자신의 위치/시야/센서 범위로
+    측정 업데이트만 수행해 하나의 사후 분포로 융합한다.
+    """
+    
+    def __init__(self, planner, predict_interval=0.5):
+        """
+        Args:
+            planner: 공유할 BeliefPlanner 또는 ParticleBeliefPlanner
+            predict_interval: 공유 예측 주기 (초)
+        """
+        self.planner = planner
+        self.predict_interval = predict_interval
+        self.last_predict_time = None
+        self.members = []
+    
+    def join(self, member):
+        """팀에 합류 (첫 멤버가 대표로 히트맵을 그림)"""
+        self.members.append(member)
+        return len(self.members) == 1
+    
+    def predict(self, now, motion_model, grid_map=None, map_version=None):
+        """
+        공유 Prediction step (같은 틱에 여러 번 호출되어도 한 번만 수행)
+        
+        Args:
+            now: 현재 시각 (레벨 경과 시간)
+            motion_model: (dx, dy) 예상 이동량 (Belief 그리드 단위)
+            grid_map: 맵
+            map_version: grid_map의 버전
+        
+        Returns:
+            bool: 실제로 예측을 수행했는지 여부
+        """
+        if self.last_predict_time is not None and \
+           now - self.last_predict_time < self.predict_interval - 1e-6:
+            return False
+        
+        self.last_predict_time = now
+        self.planner.predict(motion_model, grid_map, map_version)
+        return True
+    
+    def update(self, measurement, grid_map, enemy_pos, sensor_range=None, visible=None):
+        """각 적의 측정값을 공유 사후 분포에 융합"""
+        self.planner.update(measurement, grid_map, enemy_pos, sensor_range, visible)
+
+
+class KalmanTracker:
+    """등속도(constant-velocity) 칼만 필터 추적기
+    
+    상태는 (x, y, vx, vy) 4개뿐이라 예측/업데이트가 닫힌 형태의 작은 행렬 연산으로 끝난다.
+    시야가 확보되어 측정이 믿을 만할 때 사용한다.
+    """
+    
+    def __init__(self, sensor_noise=40, process_noise=300):
+        """
+        Args:
+            sensor_noise: 위치 측정 노이즈 (표준편차, 월드 단위)
+            process_noise: 가속도 노이즈 (표준편차, 월드 단위/s²)
+        """
+        self.sensor_noise = sensor_noise
+        self.process_noise = process_noise
+        self.reset()
+    
+    def reset(self):
+        """상태 초기화"""
+        self.state = np.zeros(4)
+        self.covariance = np.diag([1e6, 1e6, 1e4, 1e4])
+        self.initialized = False
+    
+    def predict(self, dt):
+        """
+        Prediction step (등속도 모델)
+        
+        Args:
+            dt: 경과 시간 (초)
+        """
+        if not self.initialized or dt <= 0:
+            return
+        
+        x, y, vx, vy = self.state
+        self.state = np.array([x + vx * dt, y + vy * dt, vx, vy])
+        
+        F = np.array([
+            [1.0, 0.0, dt, 0.0],
+            [0.0, 1.0, 0.0, dt],
+            [0.0, 0.0, 1.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ])
+        
+        # 이산 백색 가속도 노이즈
+        q = self.process_noise * self.process_noise
+        dt2 = dt * dt
+        q_pp = q * dt2 * dt2 / 4
+        q_pv = q * dt2 * dt / 2
+        q_vv = q * dt2
+        Q = np.array([
+            [q_pp, 0.0, q_pv, 0.0],
+            [0.0, q_pp, 0.0, q_pv],
+            [q_pv, 0.0, q_vv, 0.0],
+            [0.0, q_pv, 0.0, q_vv],
+        ])
+        
+        self.covariance = F @ self.covariance @ F.T + Q
+    
+    def update(self, measurement):
+        """
+        Update step (위치 측정)
+        
+        Args:
+            measurement: (x, y) 측정 위치 (월드 좌표)
+        """
+        r = self.sensor_noise * self.sensor_noise
+        
+        if not self.initialized:
+            self.state = np.array([measurement[0], measurement[1], 0.0, 0.0])
+            self.covariance = np.diag([r, r, 1e4, 1e4])
+            self.initialized = True
+            return
+        
+        P = self.covariance
+        
+        # 혁신(innovation)과 2x2 공분산의 닫힌 형태 역행렬
+        y0 = measurement[0] - self.state[0]
+        y1 = measurement[1] - self.state[1]
+        s00 = P[0, 0] + r
+        s01 = P[0, 1]
+        s11 = P[1, 1] + r
+        det = s00 * s11 - s01 * s01
+        S_inv = np.array([[s11, -s01], [-s01, s00]]) / det
+        
+        K = P[:, :2] @ S_inv  # 4x2 칼만 게인
+        self.state = self.state + K @ np.array([y0, y1])
+        self.covariance = P - K @ P[:2, :]
+    
+    def get_position(self, lead_time=0.0):
+        """추정 위치 반환 (lead_time초 뒤로 외삽 가능)"""
+        x, y, vx, vy = self.state
+        return (float(x + vx * lead_time), float(y + vy * lead_time))
+    
+    def get_velocity(self):
+        """추정 속도 반환 (월드 단위/s)"""
+        return (float(self.state[2]), float(self.state[3]))
+    
+    def get_position_std(self):
+        """위치 불확실성 (표준편차, 월드 단위)"""
+        return float(math.sqrt(max(self.covariance[0, 0], self.covariance[1, 1])))
@@ -4,23 +4,60 @@ Bug 알고리즘 (Bug1, Bug2, Tangent Bug)
 
 import math
 import numpy as np
-from game.grid import is_walkable, line_of_sight, get_neighbors
+from game.grid import is_walkable, get_neighbors
+from algos.obstacles import get_obstacle_map
+from algos.fov import get_field_of_view
+from algos.planner import Planner, roll_out
+from config import TANGENT_SENSOR_RANGE
 
 
-class Bug1Planner:
+class Bug1Planner(Planner):
     """Bug1 알고리즘"""
     
     def __init__(self):
         self.state = 'motion_to_goal'  # 'motion_to_goal', 'boundary_following', 'leave_wall'
         self.hit_point = None
-        self.obstacle_tiles = set()  # 처음 부딪힌 장애물의 타일들 (BFS로 탐색)
+        self.obstacle_label = 0  # 처음 부딪힌 장애물의 라벨 (0 = 없음)
+        self.obstacles = None  # 부딪힌 시점의 ObstacleMap
         self.leave_point = None
-        self.wall_points = []
         self.circumnavigate_complete = False
         self.min_distance = float('inf')
+        
+        # 경계 윤곽 추종 상태
+        self.contour = None
+        self.route = None  # hit point부터 한 바퀴 도는 윤곽 인덱스 배열
+        self.route_pos = 0  # route 안에서의 현재 위치
+        self.leave_route_pos = 0  # route 안에서 목표에 가장 가까운 위치
+        self.map_version = None
     
-    def plan_step(self, current_pos, goal_pos, grid_map):
-        """한 스텝 계획"""
+    @property
+    def wall_points(self):
+        """지금까지 따라간 벽 경로 (시각화용, 윤곽 길이로 제한됨)"""
+        if self.route is None or self.state != 'boundary_following':
+            return []
+        
+        if self.circumnavigate_complete:
+            indices = self.route
+        else:
+            indices = self.route[:self.route_pos + 1]
+        return [tuple(t) for t in self.contour.tiles[indices]]
+    
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 새 Bug1 상태로 목표까지 스텝을 반복한 전체 경로"""
+        rollout = Bug1Planner()
+        return roll_out(
+            lambda current, target: rollout.plan_step(current, target, nav.grid_map,
+                                                      map_version=nav.map_version),
+            start, goal
+        )
+    
+    def plan_step(self, current_pos, goal_pos, grid_map, map_version=None):
+        """한 스텝 계획
+        
+        Args:
+            map_version: Level.map_version (같은 버전의 장애물 라벨/윤곽을 재사용)
+        """
+        self.map_version = map_version
         gx, gy = current_pos
         goal_gx, goal_gy = goal_pos
         
@@ -35,17 +72,17 @@ class Bug1Planner:
             
             # 장애물 만남
             if not is_walkable(grid_map, next_pos[0], next_pos[1]):
-                # BFS로 부딪힌 장애물의 모든 타일 찾기
-                found_tiles = self._find_obstacle_tiles(next_pos, grid_map)
+                # 라벨 배열에서 부딪힌 장애물 찾기 (맵 경계는 라벨 0)
+                obstacles = get_obstacle_map(grid_map, map_version)
+                label = obstacles.label_at(next_pos[0], next_pos[1])
                 
                 # 실제 장애물을 찾았으면 boundary following 시작
-                if found_tiles:
-                    self.state = 'boundary_following'
-                    self.hit_point = current_pos
-                    self.obstacle_tiles = found_tiles
-                    self.wall_points = []
-                    self.min_distance = self._distance(current_pos, goal_pos)
-                    self.circumnavigate_complete = False
+                # (벽 안에 서 있으면 윤곽을 추적할 수 없으므로 먼저 빠져나옴)
+                if label and is_walkable(grid_map, gx, gy):
+                    self.obstacle_label = label
+                    self.obstacles = obstacles
+                    wall_dir = (next_pos[0] - gx, next_pos[1] - gy)
+                    self._start_boundary_following(current_pos, wall_dir, goal_pos)
                     return self._follow_wall(current_pos, goal_pos, grid_map)
                 else:
                     # 장애물을 찾지 못함 (플레이어 등) - 다른 방향으로 우회
@@ -59,39 +96,52 @@ class Bug1Planner:
         
         # Boundary following 상태
         elif self.state == 'boundary_following':
-            current_dist = self._distance(current_pos, goal_pos)
-            
-            # 최소 거리 업데이트 (한 바퀴 도는 동안 가장 가까운 지점 기록)
-            if current_dist < self.min_distance:
-                self.min_distance = current_dist
-                self.leave_point = current_pos
-            
-            # Bug1 규칙: 반드시 한 바퀴를 완전히 돌아야 함
-            # 충분히 돌았고(최소 10스텝) 시작점으로 돌아왔는지 확인
-            if len(self.wall_points) > 10 and self._distance(current_pos, self.hit_point) < 1.5:
-                self.circumnavigate_complete = True
-                if self.leave_point:
-                    self.state = 'leave_wall'
-                    return self.leave_point
-            
             # Bug1 핵심: boundary following 중에는 목표를 완전히 무시하고 무조건 벽만 따라감
-            # 플레이어가 어디 있든 상관없이 오직 벽을 따라 한 바퀴 도는 것만 수행
-            self.wall_points.append(current_pos)
+            # 플레이어가 어디 있든 상관없이 오직 윤곽을 따라 한 바퀴 도는 것만 수행
             return self._follow_wall(current_pos, goal_pos, grid_map)
         
         # Leave wall 상태
         elif self.state == 'leave_wall':
             # 벽에서 벗어남
-            if line_of_sight(grid_map, current_pos, goal_pos):
+            if get_field_of_view(grid_map).can_see(current_pos, goal_pos):
                 self.state = 'motion_to_goal'
                 self.hit_point = None
                 self.leave_point = None
-                self.wall_points = []
+                self.route = None
             
             return self._move_towards(current_pos, goal_pos)
         
         return current_pos
     
+    def _start_boundary_following(self, current_pos, wall_dir, goal_pos):
+        """윤곽을 가져오고 leave point(목표에 가장 가까운 경계점)를 미리 계산"""
+        self.state = 'boundary_following'
+        self.hit_point = current_pos
+        self.circumnavigate_complete = False
+        
+        # 오른손 법칙으로 도는 윤곽 (맵 버전마다 한 번만 추적)
+        self.contour, index = self.obstacles.contour_from(current_pos, wall_dir, 'right')
+        self.route = self.contour.route_from(index)
+        self.route_pos = 0
+        
+        # 윤곽 전체에 대해 목표까지의 거리를 한 번에 계산
+        tiles = self.contour.tiles[self.route]
+        dists = np.hypot(tiles[:, 0] - goal_pos[0], tiles[:, 1] - goal_pos[1])
+        
+        # 부딪힌 장애물에 인접한 경계점 중에서 leave point 선택
+        adjacent = self.obstacles.adjacent_mask(self.obstacle_label)[tiles[:, 1], tiles[:, 0]]
+        if adjacent.any():
+            dists = np.where(adjacent, dists, np.inf)
+        
+        # 출발점이 루프 밖이면 한 바퀴 뒤 돌아갈 수 있는 루프 위 점만 후보
+        first = self.contour.route_loop_start(self.route)
+        if first and np.isfinite(dists[first:]).any():
+            dists[:first] = np.inf
+        
+        self.leave_route_pos = int(np.argmin(dists))
+        self.min_distance = float(dists[self.leave_route_pos])
+        self.leave_point = tuple(int(v) for v in tiles[self.leave_route_pos])
+    
     def _move_towards(self, current, goal):
         """목표를 향해 한 칸 이동"""
         dx = goal[0] - current[0]
@@ -106,102 +156,47 @@ class Bug1Planner:
             return current
     
     def _follow_wall(self, current_pos, goal_pos, grid_map):
-        """벽을 따라 이동 (boundary following with right-hand rule)
-        Bug1 규칙: boundary following 중에는 목표를 완전히 무시하고 오직 벽만 따라감
-        벽에서 1-2칸 떨어져서 크게 돌도록 수정"""
-        gx, gy = current_pos
-        
-        # 갈 수 있는 이웃들
-        neighbors = get_neighbors(gx, gy, grid_map, diagonal=True)
-        
-        if not neighbors:
-            return current_pos
-        
-        # 처음 부딪힌 장애물에만 인접한 이웃만 선택
-        if self.obstacle_tiles:
-            valid_neighbors = []
-            for nx, ny in neighbors:
-                # 이 위치가 처음 부딪힌 장애물에 인접한지 확인
-                for dy in [-1, 0, 1]:
-                    for dx in [-1, 0, 1]:
-                        if (nx + dx, ny + dy) in self.obstacle_tiles:
-                            valid_neighbors.append((nx, ny))
-                            break
-                    else:
-                        continue
-                    break
-            
-            # 처음 부딪힌 장애물에 인접한 이웃만 사용
-            if valid_neighbors:
-                neighbors = valid_neighbors
-        
-        # 이전 위치 기반으로 벽을 따라 계속 이동
-        if len(self.wall_points) >= 2:
-            # 일관된 방향으로 벽을 따라감 (목표 완전 무시)
-            prev_pos = self.wall_points[-1]
-            prev_prev_pos = self.wall_points[-2]
-            
-            # 이전 이동 방향 벡터
-            prev_dir_x = prev_pos[0] - prev_prev_pos[0]
-            prev_dir_y = prev_pos[1] - prev_prev_pos[1]
-            
-            # Bug1: 방향 연속성만 고려
-            best = min(neighbors, key=lambda n: (
-                # 이전 방향과의 일관성
-                -(prev_dir_x * (n[0] - gx) + prev_dir_y * (n[1] - gy))
-            ))
-            return best
-        
-        # 첫 벽 따라가기 시작 - 벽과 가장 가까운 곳으로
-        best = min(neighbors, key=lambda n: (
-            # 장애물과의 인접도
-            -sum(1 for dy in [-1, 0, 1] for dx in [-1, 0, 1] 
-                 if not is_walkable(grid_map, n[0] + dx, n[1] + dy))
-        ))
-        
-        return best
-    
-    def _find_obstacle_tiles(self, start_tile, grid_map):
-        """BFS로 부딪힌 장애물의 모든 타일 찾기"""
-        from collections import deque
-        
-        map_width = len(grid_map[0])
-        map_height = len(grid_map)
+        """윤곽 인덱스를 한 칸 전진 (boundary following with right-hand rule)
+        Bug1 규칙: 한 바퀴를 완전히 돈 뒤, 짧은 쪽으로 leave point까지 돌아가서 떠남"""
+        tiles = self.contour.tiles
+        route = self.route
+        n = len(route)
+        
+        # 예상 위치에서 벗어났으면 (막힘/밀림) 윤곽 위 현재 위치로 재동기화
+        if tuple(tiles[route[self.route_pos]]) != tuple(current_pos):
+            matches = np.flatnonzero((tiles[route, 0] == current_pos[0]) &
+                                     (tiles[route, 1] == current_pos[1]))
+            if len(matches) == 0:
+                self.state = 'motion_to_goal'
+                return self._move_towards(current_pos, goal_pos)
+            self.route_pos = int(matches[0])
         
-        # 맵 경계인지 확인
-        def is_boundary(x, y):
-            return x == 0 or x == map_width - 1 or y == 0 or y == map_height - 1
+        if not self.circumnavigate_complete:
+            # 한 바퀴 돌기 (끝나면 hit point, 루프 밖에서 출발했으면 루프 시작으로 복귀)
+            next_pos = self.contour.route_step(route, self.route_pos)
+            if next_pos <= self.route_pos:
+                self.circumnavigate_complete = True
+            self.route_pos = next_pos
+        elif self.route_pos == self.leave_route_pos:
+            # leave point 도착 → 벽에서 떠남
+            self.state = 'leave_wall'
+            return self._move_towards(current_pos, goal_pos)
+        else:
+            # leave point까지 루프 위에서 짧은 방향으로 이동
+            first = self.contour.route_loop_start(route)
+            loop = n - first
+            forward = (self.leave_route_pos - self.route_pos) % loop
+            step = 1 if self.route_pos < first or forward <= loop - forward else -1
+            self.route_pos = self.contour.route_step(route, self.route_pos, step)
         
-        # 시작 타일이 맵 경계면 빈 set 반환 (경계는 무시)
-        if is_boundary(start_tile[0], start_tile[1]):
-            return set()
+        next_pos = tuple(int(v) for v in tiles[route[self.route_pos]])
         
-        # BFS로 연결된 장애물 타일들 찾기
-        visited = set()
-        queue = deque([start_tile])
-        visited.add(start_tile)
-        obstacle_tiles = {start_tile}
+        # 추적 이후 임시 벽 등으로 막혔으면 현재 맵 기준으로 다시 계획 (새 윤곽 사용)
+        if not is_walkable(grid_map, next_pos[0], next_pos[1]):
+            self.state = 'motion_to_goal'
+            return self.plan_step(current_pos, goal_pos, grid_map, self.map_version)
         
-        while queue:
-            x, y = queue.popleft()
-            
-            # 4방향 탐색
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-                nx, ny = x + dx, y + dy
-                
-                if (nx, ny) in visited:
-                    continue
-                if nx < 0 or nx >= map_width or ny < 0 or ny >= map_height:
-                    continue
-                
-                visited.add((nx, ny))
-                
-                # 벽이면서 맵 경계가 아닌 경우만 포함
-                if not is_walkable(grid_map, nx, ny) and not is_boundary(nx, ny):
-                    obstacle_tiles.add((nx, ny))
-                    queue.append((nx, ny))
-        
-        return obstacle_tiles
+        return next_pos
     
     def _find_nearby_obstacle_center(self, pos, grid_map):
         """현재 위치 주변의 내부 장애물들을 찾아서 중심점 반환 (맵 경계 제외)"""
@@ -241,19 +236,42 @@ class Bug1Planner:
         return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
 
-class Bug2Planner:
+class Bug2Planner(Planner):
     """Bug2 알고리즘 - M-line 기반"""
     
     def __init__(self):
         self.state = 'motion_to_goal'  # 'motion_to_goal', 'boundary_following'
         self.m_line = None  # (start, goal)
         self.hit_point = None
-        self.obstacle_tiles = set()  # 처음 부딪힌 장애물의 타일들
+        self.obstacle_label = 0  # 처음 부딪힌 장애물의 라벨 (0 = 없음)
+        self.obstacles = None  # 부딪힌 시점의 ObstacleMap
         self.start_pos = None  # M-line 시각화용
         self.goal_pos = None   # M-line 시각화용
+        
+        # 경계 윤곽 추종 상태
+        self.contour = None
+        self.route = None  # hit point부터 선택한 방향으로 한 바퀴 도는 윤곽 인덱스 배열
+        self.route_pos = 0
+        self._leave_mask = None  # route 위치별 "M-line 교차 + hit point보다 가까움"
+        self._leave_mask_goal = None
+        self.map_version = None
     
-    def plan_step(self, current_pos, goal_pos, grid_map, start_pos=None):
-        """한 스텝 계획"""
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 새 Bug2 상태로 목표까지 스텝을 반복한 전체 경로"""
+        rollout = Bug2Planner()
+        return roll_out(
+            lambda current, target: rollout.plan_step(current, target, nav.grid_map, start,
+                                                      map_version=nav.map_version),
+            start, goal
+        )
+    
+    def plan_step(self, current_pos, goal_pos, grid_map, start_pos=None, map_version=None):
+        """한 스텝 계획
+        
+        Args:
+            map_version: Level.map_version (같은 버전의 장애물 라벨/윤곽을 재사용)
+        """
+        self.map_version = map_version
         if start_pos is None:
             start_pos = current_pos
         
@@ -277,16 +295,22 @@ class Bug2Planner:
             # M-line을 따라 목표로 이동
             next_pos = self._move_along_m_line(current_pos, goal_pos, grid_map)
             
+            # 움직일 이웃이 없음 (임시 벽 위에 서 있는 경우 등) - 벽 방향을 정할 수 없으므로 대기
+            if next_pos == current_pos:
+                return current_pos
+            
             # 장애물 만남
             if not is_walkable(grid_map, next_pos[0], next_pos[1]):
-                # BFS로 부딪힌 장애물의 모든 타일 찾기
-                found_tiles = self._find_obstacle_tiles(next_pos, grid_map)
+                # 라벨 배열에서 부딪힌 장애물 찾기
+                obstacles = get_obstacle_map(grid_map, map_version)
+                label = self._find_obstacle_label(next_pos, obstacles)
                 
                 # 실제 장애물을 찾았으면 boundary following 시작
-                if found_tiles:
-                    self.state = 'boundary_following'
-                    self.hit_point = current_pos
-                    self.obstacle_tiles = found_tiles
+                if label:
+                    self.obstacle_label = label
+                    self.obstacles = obstacles
+                    wall_dir = (next_pos[0] - gx, next_pos[1] - gy)
+                    self._start_boundary_following(current_pos, wall_dir, goal_pos)
                     return self._follow_wall(current_pos, goal_pos, grid_map)
                 else:
                     # 장애물을 찾지 못함 (플레이어 등) - 다른 방향으로 우회
@@ -300,22 +324,47 @@ class Bug2Planner:
         
         # Boundary following 상태
         elif self.state == 'boundary_following':
-            # M-line에 도달하고 hit point보다 목표에 가까우면서, 목표로 가는 길이 clear한가?
-            if self._on_m_line(current_pos) and \
-               self._distance(current_pos, goal_pos) < self._distance(self.hit_point, goal_pos):
-                # 목표를 향한 다음 이동이 안전한지 확인
-                next_towards_goal = self._move_towards(current_pos, goal_pos)
-                if is_walkable(grid_map, next_towards_goal[0], next_towards_goal[1]):
-                    self.state = 'motion_to_goal'
-                    self.hit_point = None
-                    self.obstacle_tiles = set()  # 장애물 타일 초기화
-                    return next_towards_goal
-            
-            # boundary following 중에는 무조건 벽을 따라감 (목표 방향 무시)
+            # 미리 계산한 M-line 교차점에서 목표 쪽이 열려 있으면 떠나고, 아니면 윤곽을 따라감
             return self._follow_wall(current_pos, goal_pos, grid_map)
         
         return current_pos
     
+    def _start_boundary_following(self, current_pos, wall_dir, goal_pos):
+        """양쪽 윤곽 중 M-line 교차점에 더 빨리 닿는 방향 선택"""
+        self.state = 'boundary_following'
+        self.hit_point = current_pos
+        
+        best = None
+        for hand in ('right', 'left'):
+            contour, index = self.obstacles.contour_from(current_pos, wall_dir, hand)
+            route = contour.route_from(index)
+            mask = self._compute_leave_mask(contour.tiles[route], goal_pos)
+            mask[0] = False  # hit point 자체에서는 떠나지 않음
+            
+            crossings = np.flatnonzero(mask)
+            steps = int(crossings[0]) if len(crossings) else len(route) + 1
+            if best is None or steps < best[0]:
+                best = (steps, contour, route, mask)
+        
+        _, self.contour, self.route, self._leave_mask = best
+        self._leave_mask_goal = goal_pos
+        self.route_pos = 0
+    
+    def _compute_leave_mask(self, tiles, goal_pos):
+        """윤곽 타일 전체에 대해 M-line 교차 여부를 한 번에 계산 (벡터화)"""
+        (x1, y1), (x2, y2) = self.start_pos, goal_pos
+        x0 = tiles[:, 0]
+        y0 = tiles[:, 1]
+        
+        den = math.sqrt((y2 - y1)**2 + (x2 - x1)**2)
+        if den == 0:
+            line_dist = np.hypot(x0 - x1, y0 - y1)
+        else:
+            line_dist = np.abs((y2 - y1) * x0 - (x2 - x1) * y0 + x2 * y1 - y2 * x1) / den
+        
+        goal_dist = np.hypot(x0 - x2, y0 - y2)
+        return (line_dist < 1.5) & (goal_dist < self._distance(self.hit_point, goal_pos))
+    
     def _move_towards(self, current, goal):
         """목표를 향해 한 칸 이동"""
         dx = goal[0] - current[0]
@@ -356,39 +405,48 @@ class Bug2Planner:
         return best_neighbor
     
     def _follow_wall(self, current_pos, goal_pos, grid_map):
-        """벽을 따라 이동하면서 M-line으로 복귀 시도 (특정 장애물만 따라감)"""
-        gx, gy = current_pos
-        neighbors = get_neighbors(gx, gy, grid_map, diagonal=True)
-        
-        if not neighbors:
-            return current_pos
-        
-        # 처음 부딪힌 장애물과 인접한 이웃만 필터링
-        if self.obstacle_tiles:
-            offsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-            valid_neighbors = []
-            for n in neighbors:
-                # 이 이웃이 처음 부딪힌 장애물 타일에 인접한가?
-                is_adjacent = any(
-                    (n[0] + dx, n[1] + dy) in self.obstacle_tiles
-                    for dx, dy in offsets
-                )
-                if is_adjacent:
-                    valid_neighbors.append(n)
-            
-            # 유효한 이웃이 있으면 그 중에서만 선택
-            if valid_neighbors:
-                neighbors = valid_neighbors
-        
-        # Bug2: M-line에 가까워지는 방향으로 이동
-        best_neighbor = min(neighbors, key=lambda n: (
-            self._distance_to_m_line(n),  # M-line에 가까운 곳 우선
-            # 벽과의 인접성도 고려 (벽을 따라가기 위해)
-            -sum(1 for dy in [-1, 0, 1] for dx in [-1, 0, 1] 
-                 if not is_walkable(grid_map, n[0] + dx, n[1] + dy)) * 0.1
-        ))
-        
-        return best_neighbor
+        """윤곽 인덱스를 한 칸 전진 (M-line 교차점에서 목표 방향이 열려 있으면 떠남)"""
+        tiles = self.contour.tiles
+        route = self.route
+        
+        # 예상 위치에서 벗어났으면 (막힘/밀림) 윤곽 위 현재 위치로 재동기화
+        if tuple(tiles[route[self.route_pos]]) != tuple(current_pos):
+            matches = np.flatnonzero((tiles[route, 0] == current_pos[0]) &
+                                     (tiles[route, 1] == current_pos[1]))
+            if len(matches) == 0:
+                self._leave_wall()
+                return self._move_along_m_line(current_pos, goal_pos, grid_map)
+            self.route_pos = int(matches[0])
+        
+        # 목표가 움직였으면 M-line이 바뀌므로 교차점 다시 계산
+        if goal_pos != self._leave_mask_goal:
+            self._leave_mask = self._compute_leave_mask(tiles[route], goal_pos)
+            self._leave_mask_goal = goal_pos
+        
+        # M-line에 도달하고 hit point보다 목표에 가까우면서, 목표로 가는 길이 clear한가?
+        if self._leave_mask[self.route_pos]:
+            next_towards_goal = self._move_towards(current_pos, goal_pos)
+            if is_walkable(grid_map, next_towards_goal[0], next_towards_goal[1]):
+                self._leave_wall()
+                return next_towards_goal
+        
+        # boundary following 중에는 무조건 윤곽을 따라감 (목표 방향 무시)
+        self.route_pos = self.contour.route_step(route, self.route_pos)
+        next_pos = tuple(int(v) for v in tiles[route[self.route_pos]])
+        
+        # 추적 이후 임시 벽 등으로 막혔으면 현재 맵 기준으로 다시 계획 (새 윤곽 사용)
+        if not is_walkable(grid_map, next_pos[0], next_pos[1]):
+            self._leave_wall()
+            return self.plan_step(current_pos, goal_pos, grid_map, self.start_pos, self.map_version)
+        
+        return next_pos
+    
+    def _leave_wall(self):
+        """boundary following 종료"""
+        self.state = 'motion_to_goal'
+        self.hit_point = None
+        self.obstacle_label = 0  # 장애물 라벨 초기화
+        self.route = None
     
     def _on_m_line(self, pos, threshold=1.5):
         """M-line 위에 있는지 확인"""
@@ -417,64 +475,50 @@ class Bug2Planner:
         
         return num / den
     
-    def _find_obstacle_tiles(self, start_pos, grid_map):
-        """처음 부딪힌 장애물의 모든 타일을 BFS로 찾기 (맵 경계 제외)"""
+    def _find_obstacle_label(self, start_pos, obstacles):
+        """처음 부딪힌 장애물의 라벨 찾기 (맵 경계 제외, 없으면 0)"""
         gx, gy = start_pos
-        map_width = len(grid_map[0])
-        map_height = len(grid_map)
         
-        # 시작 위치가 벽이 아니면 인접한 벽 찾기
-        if is_walkable(grid_map, gx, gy):
-            # 4방향에서 벽 찾기
+        # 시작 위치가 벽이 아니면 4방향에서 인접한 장애물 찾기
+        if obstacles.walkable[gy, gx]:
             for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = gx + dx, gy + dy
-                if 0 <= nx < map_width and 0 <= ny < map_height:
-                    if not is_walkable(grid_map, nx, ny):
-                        # 맵 경계가 아닌 벽이면 이것을 시작점으로
-                        if not (nx == 0 or nx == map_width - 1 or ny == 0 or ny == map_height - 1):
-                            gx, gy = nx, ny
-                            break
-        
-        # BFS로 연결된 모든 장애물 타일 찾기
-        obstacle_tiles = set()
-        queue = [(gx, gy)]
-        visited = {(gx, gy)}
-        
-        while queue:
-            x, y = queue.pop(0)
-            
-            # 맵 경계는 제외
-            if x == 0 or x == map_width - 1 or y == 0 or y == map_height - 1:
-                continue
-            
-            # 벽이면 추가
-            if not is_walkable(grid_map, x, y):
-                obstacle_tiles.add((x, y))
-                
-                # 4방향 탐색
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < map_width and 0 <= ny < map_height:
-                        if (nx, ny) not in visited:
-                            visited.add((nx, ny))
-                            queue.append((nx, ny))
-        
-        return obstacle_tiles
+                label = obstacles.label_at(gx + dx, gy + dy)
+                if label:
+                    return label
+            return 0
+        
+        return obstacles.label_at(gx, gy)
     
     def _distance(self, p1, p2):
         """유클리드 거리"""
         return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
 
-class TangentBugPlanner:
+class TangentBugPlanner(Planner):
     """Tangent Bug 알고리즘 (간소화 버전)"""
     
-    def __init__(self, sensor_range=10):
+    def __init__(self, sensor_range=TANGENT_SENSOR_RANGE, sensor=None):
+        """
+        Args:
+            sensor_range: 센서 범위 (타일)
+            sensor: RangeSensor (있으면 스캔의 불연속점을, 없으면 볼록 모서리 인덱스를 후보로 사용)
+        """
         self.state = 'go_to_goal'
         self.sensor_range = sensor_range
+        self.sensor = sensor
+        self.last_scan = None  # 시각화용
         self.tangent_point = None  # 시각화용
     
-    def plan_step(self, current_pos, goal_pos, grid_map):
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 새 Tangent Bug 상태로 목표까지 스텝을 반복한 전체 경로"""
+        rollout = TangentBugPlanner(self.sensor_range, self.sensor)
+        return roll_out(
+            lambda current, target: rollout.plan_step(current, target, nav.grid_map,
+                                                      map_version=nav.map_version),
+            start, goal
+        )
+    
+    def plan_step(self, current_pos, goal_pos, grid_map, map_version=None):
         """한 스텝 계획"""
         gx, gy = current_pos
         goal_gx, goal_gy = goal_pos
@@ -484,7 +528,7 @@ class TangentBugPlanner:
             return current_pos
         
         # 목표까지 시야 확보되면 직진
-        if line_of_sight(grid_map, current_pos, goal_pos):
+        if get_field_of_view(grid_map).can_see(current_pos, goal_pos):
             next_pos = self._move_towards(current_pos, goal_pos)
             # 다음 위치가 갈 수 있는지 확인
             if is_walkable(grid_map, next_pos[0], next_pos[1]):
@@ -498,7 +542,7 @@ class TangentBugPlanner:
                 return current_pos
         
         # Tangent 포인트 찾기
-        tangent_point = self._find_tangent_point(current_pos, goal_pos, grid_map)
+        tangent_point = self._find_tangent_point(current_pos, goal_pos, grid_map, map_version)
         self.tangent_point = tangent_point  # 시각화용 저장
         
         if tangent_point and tangent_point != current_pos:
@@ -525,43 +569,43 @@ class TangentBugPlanner:
                 return best
             return current_pos
     
-    def _find_tangent_point(self, current_pos, goal_pos, grid_map):
-        """Tangent 포인트 찾기 (센서 범위 내 장애물 모서리)"""
+    def _find_tangent_point(self, current_pos, goal_pos, grid_map, map_version=None):
+        """Tangent 포인트 찾기 (센서 범위 내에서 보이는 장애물 모서리)"""
         gx, gy = current_pos
-        candidates = set()  # 중복 제거를 위해 set 사용
+        obstacles = get_obstacle_map(grid_map, map_version)
         
-        for dy in range(-self.sensor_range, self.sensor_range + 1):
-            for dx in range(-self.sensor_range, self.sensor_range + 1):
-                nx, ny = gx + dx, gy + dy
-                
-                # 범위 체크 및 장애물인지 확인
-                if not is_walkable(grid_map, nx, ny):
-                    # 장애물 주변의 빈 공간 찾기
-                    for neighbor in get_neighbors(nx, ny, grid_map, diagonal=True):
-                        # 현재 위치에서 시야가 확보되는 지점
-                        if line_of_sight(grid_map, current_pos, neighbor):
-                            candidates.add(neighbor)
+        if self.sensor is not None:
+            # 거리 스캔의 불연속점 = 센서로 본 장애물 모서리
+            self.last_scan = self.sensor.scan(grid_map, current_pos, map_version,
+                                              walkable=obstacles.walkable)
+            candidates = self.last_scan.discontinuities()
+        else:
+            # 볼록 모서리만 접선 후보가 될 수 있음
+            corners = obstacles.corners_within(current_pos, self.sensor_range)
+            if len(corners) == 0:
+                return None
+            
+            # 현재 위치에서 시야가 확보되는 모서리만 남김
+            fov = get_field_of_view(grid_map, self.sensor_range)
+            visible = fov.visible_mask(current_pos, map_version)
+            candidates = corners[visible[corners[:, 1], corners[:, 0]]]
+        
+        if len(candidates) == 0:
+            return None
         
         # 목표로 가는 방향에 있는 tangent point 선택
-        if candidates:
-            # 목표 방향으로 가장 많이 진전되는 점 선택
-            goal_dir_x = goal_pos[0] - gx
-            goal_dir_y = goal_pos[1] - gy
-            goal_dist = math.sqrt(goal_dir_x**2 + goal_dir_y**2)
-            
-            if goal_dist > 0:
-                goal_dir_x /= goal_dist
-                goal_dir_y /= goal_dist
-                
-                best = max(candidates, key=lambda p: 
-                    # 목표 방향으로의 투영 (progress toward goal)
-                    (p[0] - gx) * goal_dir_x + (p[1] - gy) * goal_dir_y
-                )
-                return best
-            else:
-                return min(candidates, key=lambda p: self._distance(p, goal_pos))
+        goal_dir_x = goal_pos[0] - gx
+        goal_dir_y = goal_pos[1] - gy
+        
+        if goal_dir_x != 0 or goal_dir_y != 0:
+            # 목표 방향으로 가장 많이 진전되는 점 선택 (투영, 정규화 불필요)
+            progress = (candidates[:, 0] - gx) * goal_dir_x + (candidates[:, 1] - gy) * goal_dir_y
+            best = candidates[np.argmax(progress)]
+        else:
+            dist = (candidates[:, 0] - goal_pos[0]) ** 2 + (candidates[:, 1] - goal_pos[1]) ** 2
+            best = candidates[np.argmin(dist)]
         
-        return None
+        return (int(best[0]), int(best[1]))
     
     def _move_towards(self, current, goal):
         """목표를 향해 한 칸 이동"""
@@ -0,0 +1,269 @@
+"""
+협력 경로 탐색 (Windowed Hierarchical Cooperative A*)
+적들이 레벨 단위 시공간 예약표를 공유해서, 먼저 계획한 적이 예약한 (타일, 스텝)을 피해 경로를 잡음
+"""
+
+import math
+from collections import OrderedDict
+from heapq import heappush, heappop
+from algos.planner import Planner
+from algos.astar import NEIGHBORS_8, octile
+from config import (WHCA_WINDOW, WHCA_STEP_TIME, WHCA_MAX_EXPANSIONS, WHCA_DISTANCE_CACHE,
+                    WHCA_HEURISTIC_EXPANSIONS)
+
+
+# 한 스텝에 할 수 있는 행동 (제자리 대기 + 8방향 이동, 비용)
+MOVES = [(0, 0, 1.0)] + NEIGHBORS_8
+
+
+class ReservationTable:
+    """(타일, 스텝) 예약표 (레벨의 모든 적이 공유)
+    
+    시간은 WHCA_STEP_TIME초 단위 스텝으로 센다. 적마다 마지막으로 예약한 경로만 유지하고,
+    지나간 스텝의 예약은 스텝이 넘어갈 때 정리한다.
+    """
+    
+    def __init__(self, step_time=WHCA_STEP_TIME):
+        self.step_time = step_time
+        self.time = 0.0
+        self._cells = {}  # (x, y, step) -> 예약한 적
+        self._agents = {}  # 적 -> [(x, y, step), ...]
+    
+    def __len__(self):
+        return len(self._cells)
+    
+    @property
+    def step(self):
+        """현재 스텝"""
+        return int(self.time / self.step_time)
+    
+    def advance(self, dt):
+        """시간 진행 (스텝이 바뀌면 지나간 예약 정리)"""
+        before = self.step
+        self.time += dt
+        if self.step != before:
+            self._prune(self.step)
+    
+    def owner(self, x, y, step):
+        """(x, y)를 step에 예약한 적 (없으면 None)"""
+        return self._cells.get((x, y, step))
+    
+    def reserve(self, agent, path, start_step):
+        """agent의 이전 예약을 지우고 path[i]를 start_step + i에 예약 (이미 다른 적이 예약한 칸은 건너뜀)"""
+        self.release(agent)
+        keys = []
+        for i, (x, y) in enumerate(path):
+            key = (x, y, start_step + i)
+            if self._cells.setdefault(key, agent) is agent:
+                keys.append(key)
+        self._agents[agent] = keys
+    
+    def release(self, agent):
+        """agent의 예약 모두 해제"""
+        for key in self._agents.pop(agent, ()):
+            if self._cells.get(key) is agent:
+                del self._cells[key]
+    
+    def clear(self):
+        self.time = 0.0
+        self._cells.clear()
+        self._agents.clear()
+    
+    def _prune(self, step):
+        for agent, keys in list(self._agents.items()):
+            stale = 0
+            while stale < len(keys) and keys[stale][2] < step:
+                if self._cells.get(keys[stale]) is agent:
+                    del self._cells[keys[stale]]
+                stale += 1
+            if stale == len(keys):
+                del self._agents[agent]
+            elif stale:
+                del keys[:stale]
+
+
+class TrueDistance:
+    """목표까지의 실제 최단 거리 (목표에서 거꾸로 퍼지는 재개 가능한 다익스트라)
+    
+    다른 적을 무시한 추상 거리로, 창 끝에서 남은 비용을 정확히 추정하는 휴리스틱이다.
+    묻는 타일이 아직 닫히지 않았을 때만 그 타일까지 탐색을 이어 가므로 질의가 같은 목표 주변에
+    몰리면 한 번 넓힌 탐색을 여러 적이 재사용한다.
+    탐색은 budget만큼만 이어 가고, 예산이 떨어진 뒤 닫히지 않은 타일은 옥타일 거리(하한)를 돌려준다.
+    그래서 목표가 바뀐 직후에도 계획 한 번의 비용이 맵 크기와 무관하게 묶이고,
+    같은 목표로 계획할수록 정확한 거리가 넓어진다.
+    """
+    
+    def __init__(self, goal, nav):
+        self.goal = goal
+        self.nav = nav
+        self.budget = math.inf  # 남은 확장 수 (WHCAPlanner가 계획마다 채움)
+        n = nav.width * nav.height
+        self.g = [math.inf] * n
+        self.closed = [False] * n
+        
+        index = goal[1] * nav.width + goal[0]
+        self.g[index] = 0.0
+        self.open_heap = [(0.0, index)]
+    
+    def __call__(self, x, y):
+        """(x, y)에서 목표까지 거리 (도달할 수 없으면 inf, 예산이 떨어지면 옥타일 거리)"""
+        width = self.nav.width
+        index = y * width + x
+        if self.closed[index]:
+            return self.g[index]
+        
+        free = self.nav.free
+        height = self.nav.height
+        g, closed, open_heap = self.g, self.closed, self.open_heap
+        while open_heap and self.budget > 0:
+            cost, current = heappop(open_heap)
+            if closed[current]:
+                continue
+            closed[current] = True
+            self.budget -= 1
+            cx, cy = current % width, current // width
+            
+            for dx, dy, step in NEIGHBORS_8:
+                nx, ny = cx + dx, cy + dy
+                if not (0 <= nx < width and 0 <= ny < height) or not free[ny * width + nx]:
+                    continue
+                # 대각선은 양쪽 직교 타일이 모두 비어 있을 때만 (A*와 같은 규칙)
+                if dx and dy and not (free[cy * width + nx] and free[ny * width + cx]):
+                    continue
+                ni = ny * width + nx
+                if cost + step < g[ni]:
+                    g[ni] = cost + step
+                    heappush(open_heap, (g[ni], ni))
+            
+            if current == index:
+                return cost
+        
+        if not open_heap:
+            return math.inf  # 닿을 수 있는 타일을 모두 닫았는데 없음
+        return octile(x - self.goal[0], y - self.goal[1])
+
+
+class WHCAPlanner(Planner):
+    """창 단위 협력 A* (예약표와 목표별 실제 거리 캐시를 레벨의 적들이 공유)
+    
+    상태는 (타일, 스텝)이고 8방향 이동과 제자리 대기가 한 스텝씩 걸린다. 창 크기(window) 스텝까지만
+    시공간 탐색을 하고 창 끝에서는 TrueDistance로 남은 거리를 더하므로 적 하나의 비용은
+    맵 크기나 적 수와 무관하게 window, max_expansions, heuristic_expansions로 묶인다.
+    경로는 창 안의 스텝마다 타일 하나 (대기 스텝은 같은 타일 반복). 창의 일부를 따라간 뒤
+    현재 위치에서 다시 계획하는 식으로 굴려 쓴다.
+    """
+    
+    def __init__(self, reservations, window=WHCA_WINDOW, max_expansions=WHCA_MAX_EXPANSIONS,
+                 distance_cache=WHCA_DISTANCE_CACHE, heuristic_expansions=WHCA_HEURISTIC_EXPANSIONS):
+        self.reservations = reservations
+        self.window = window
+        self.max_expansions = max_expansions
+        self.heuristic_expansions = heuristic_expansions
+        self.distance_cache = distance_cache
+        self._distances = OrderedDict()  # (목표, 맵 버전, 반지름) -> TrueDistance
+        
+        # 통계
+        self.expanded = 0  # 마지막 창 탐색에서 확장한 노드 수
+    
+    def true_distance(self, goal, nav):
+        """목표별 TrueDistance (맵 버전이 같으면 적들이 재사용)"""
+        if nav.map_version is None:
+            return TrueDistance(goal, nav)
+        
+        key = (goal, nav.map_version, nav.radius)
+        distance = self._distances.get(key)
+        if distance is None:
+            distance = TrueDistance(goal, nav)
+            self._distances[key] = distance
+            while len(self._distances) > self.distance_cache:
+                self._distances.popitem(last=False)
+        else:
+            self._distances.move_to_end(key)
+        return distance
+    
+    def plan(self, start, goal, nav, agent=None):
+        """
+        공통 인터페이스: 창 크기만큼의 스텝별 타일 경로 (start 포함, 목표에 닿으면 거기서 끝)
+        
+        Args:
+            agent: 주어지면 다른 적의 예약을 피하고 결과를 agent 이름으로 예약
+        """
+        if not nav.is_walkable(*start) or not nav.is_walkable(*goal):
+            return []
+        
+        heuristic = self.true_distance(goal, nav)
+        heuristic.budget = self.heuristic_expansions
+        if heuristic(*start) == math.inf:
+            return []
+        
+        table = self.reservations
+        step0 = table.step
+        width, height, free = nav.width, nav.height, nav.free
+        
+        def blocked(x, y, nx, ny, k):
+            """k -> k+1 스텝에 (x, y) -> (nx, ny) 이동이 다른 적의 예약과 겹치는지 (자리 바꾸기 포함)"""
+            if agent is None:
+                return False
+            other = table.owner(nx, ny, step0 + k + 1)
+            if other is not None and other is not agent:
+                return True
+            other = table.owner(nx, ny, step0 + k)
+            return (other is not None and other is not agent and
+                    table.owner(x, y, step0 + k + 1) is other)
+        
+        # 상태 (x, y, k): 스텝 k에 타일 (x, y), 힙 항목 (f, -k, g, 상태)
+        root = (start[0], start[1], 0)
+        open_heap = [(heuristic(*start), 0, 0.0, root)]
+        g_score = {root: 0.0}
+        parent = {root: None}
+        
+        # 예산을 다 쓰면 목표에 가장 가까이 간 상태까지의 경로
+        best, best_h = root, heuristic(*start)
+        self.expanded = 0
+        
+        while open_heap:
+            _, _, g, state = heappop(open_heap)
+            if g > g_score[state]:
+                continue
+            x, y, k = state
+            if (x, y) == goal or k == self.window:
+                best = state
+                break
+            
+            self.expanded += 1
+            if self.expanded > self.max_expansions:
+                break
+            
+            h = heuristic(x, y)
+            if h < best_h or (h == best_h and k > best[2]):
+                best, best_h = state, h
+            
+            for dx, dy, cost in MOVES:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height) or not free[ny * width + nx]:
+                    continue
+                if dx and dy and not (free[y * width + nx] and free[ny * width + x]):
+                    continue
+                if blocked(x, y, nx, ny, k):
+                    continue
+                child = (nx, ny, k + 1)
+                ng = g + cost
+                if ng < g_score.get(child, math.inf):
+                    g_score[child] = ng
+                    parent[child] = state
+                    heappush(open_heap, (ng + heuristic(nx, ny), -(k + 1), ng, child))
+        
+        path = []
+        state = best
+        while state is not None:
+            path.append(state[:2])
+            state = parent[state]
+        path.reverse()
+        
+        if agent is not None:
+            table.reserve(agent, path, step0)
+        return path
+    
+    def release(self, agent):
+        """agent의 예약 해제 (협력 경로를 그만 따라갈 때)"""
+        self.reservations.release(agent)
@@ -0,0 +1,134 @@
+"""
+백그라운드 경로 계획 실행기
+무거운 계획(PRM 로드맵 재구축, RRT 트리 확장)을 메인 루프 밖의 워커 풀에서 실행
+"""
+
+import copy
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from algos.planner import PlanTask
+from config import PLANNING_WORKERS
+
+
+def run_plan(planner, start, goal, nav):
+    """워커에서 실행하는 계획 작업 (프로세스 풀로 보낼 수 있도록 모듈 함수)
+    
+    목표에 닿지 못하면 (RRT 등) 분할 실행의 PlanTask처럼 partial_path의 부분 경로를 돌려준다.
+    
+    Returns:
+        (path, planner): 경로와 계획에 사용한 플래너 (트리/로드맵 시각화용)
+    """
+    return planner.plan(start, goal, nav) or planner.partial_path(goal), planner
+
+
+class PlanJob(PlanTask):
+    """워커에 제출한 계획 작업 (PlanTask와 같은 방식으로 완료/오래됨 확인)"""
+    
+    def __init__(self, future, planner, start, goal, nav):
+        super().__init__(None, planner, start, goal, nav)
+        self.future = future
+    
+    def advance(self, deadline):
+        return self.done()
+    
+    def done(self):
+        return self.future.done()
+    
+    def partial(self):
+        return self.future.result()[0] if self.done() else []
+    
+    def result(self):
+        return self.future.result()
+
+
+class PlanningExecutor:
+    """스레드 풀 + 프로세스 풀 계획 실행기 (각 풀은 처음 쓸 때 생성)
+    
+    planner.pool이 'thread'면 스레드 풀 (numpy/scipy는 GIL을 풀어 줌),
+    'process'면 프로세스 풀 (순수 파이썬 루프는 GIL 때문에 스레드로는 병렬화되지 않음)에서 실행한다.
+    작업에는 플래너 복사본과 읽기 전용 맵 스냅샷만 넘기므로 pygame과 게임 상태는 메인 스레드에만 있다.
+    """
+    
+    def __init__(self, workers=PLANNING_WORKERS):
+        self.workers = workers
+        self._threads = None
+        self._processes = None
+        
+        # 통계 (디버그 화면에 표시)
+        self.submitted = 0
+        self.completed = 0
+        self.discarded = 0
+        self._in_flight = set()
+    
+    def submit(self, planner, start, goal, nav):
+        """
+        계획 작업 제출
+        
+        Args:
+            planner: Planner (복사본을 넘김)
+            start, goal: (gx, gy)
+            nav: Level.get_snapshot()의 읽기 전용 NavGrid
+        
+        Returns:
+            PlanJob
+        """
+        if planner.pool == 'thread':
+            # 스레드 워커는 메모리를 공유하고 plan()이 내부 상태를 갱신할 수 있으므로 (sync 등) 깊은 복사
+            planner = copy.deepcopy(planner)
+        else:
+            planner = copy.copy(planner)  # 프로세스 풀로 보낼 때 어차피 피클로 복사됨
+        future = self._pool(planner.pool).submit(run_plan, planner, start, goal, nav)
+        self.submitted += 1
+        self._in_flight.add(future)
+        return PlanJob(future, planner, start, goal, nav)
+    
+    def collect(self, job, map_version, goal):
+        """
+        완료된 작업의 결과 수거
+        
+        Returns:
+            (path, planner), 아직 안 끝났거나 오래된 결과면 None
+        """
+        if not job.done():
+            return None
+        self._in_flight.discard(job.future)
+        
+        if job.is_stale(map_version, goal):
+            self.discarded += 1
+            return None
+        
+        self.completed += 1
+        return job.result()
+    
+    def shutdown(self):
+        """풀 종료 (대기 중인 작업은 취소)"""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._processes = None
+        self._in_flight.clear()
+    
+    def stats(self):
+        """실행기 통계 딕셔너리"""
+        self._in_flight = {f for f in self._in_flight if not f.done()}
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'discarded': self.discarded,
+            'in_flight': len(self._in_flight)
+        }
+    
+    def _pool(self, kind):
+        if kind == 'thread':
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.workers)
+            return self._threads
+        
+        if self._processes is None:
+            # fork는 pygame/SDL 상태까지 복제하므로 spawn으로 깨끗한 워커 시작
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._processes
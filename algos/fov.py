@@ -0,0 +1,203 @@
+"""
+시야(FOV) 서비스 (재귀 섀도캐스팅)
+타일마다 보이는 타일 마스크를 계산해 (타일, 맵 버전) LRU로 캐시
+"""
+
+import weakref
+from collections import OrderedDict
+import numpy as np
+from game.grid import walkable_mask, line_of_sight
+from config import FOV_CACHE_BYTES
+
+
+# 8개 옥탄트 변환 계수 (xx, xy, yx, yy)
+OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)
+]
+
+
+def compute_fov(walkable, origin, radius):
+    """
+    origin에서 보이는 타일 마스크 계산 (재귀 섀도캐스팅)
+    
+    Args:
+        walkable: walkable_mask() 결과 (bool 배열)
+        origin: (gx, gy) 시작 타일
+        radius: 시야 반경 (타일)
+    
+    Returns:
+        (H, W) bool 배열 (시야를 막는 벽 타일 자체도 보이는 것으로 표시)
+    """
+    height, width = walkable.shape
+    visible = np.zeros((height, width), dtype=bool)
+    ox, oy = origin
+    if not (0 <= ox < width and 0 <= oy < height):
+        return visible
+    
+    visible[oy, ox] = True
+    for xx, xy, yx, yy in OCTANTS:
+        _cast_light(walkable, visible, ox, oy, 1, 1.0, 0.0, radius, xx, xy, yx, yy)
+    return visible
+
+
+def _cast_light(walkable, visible, ox, oy, row, start, end, radius, xx, xy, yx, yy):
+    """한 옥탄트를 row부터 훑으며 [start, end] 기울기 구간을 밝힘"""
+    if start < end:
+        return
+    
+    height, width = walkable.shape
+    radius_sq = radius * radius
+    new_start = start
+    
+    for j in range(row, radius + 1):
+        dx, dy = -j - 1, -j
+        blocked = False
+        
+        while dx <= 0:
+            dx += 1
+            x = ox + dx * xx + dy * xy
+            y = oy + dx * yx + dy * yy
+            left_slope = (dx - 0.5) / (dy + 0.5)
+            right_slope = (dx + 0.5) / (dy - 0.5)
+            
+            if start < right_slope:
+                continue
+            if end > left_slope:
+                break
+            
+            # 맵 밖은 벽으로 취급
+            inside = 0 <= x < width and 0 <= y < height
+            if inside and dx * dx + dy * dy <= radius_sq:
+                visible[y, x] = True
+            opaque = not inside or not walkable[y, x]
+            
+            if blocked:
+                if opaque:
+                    new_start = right_slope
+                else:
+                    blocked = False
+                    start = new_start
+            elif opaque and j < radius:
+                # 벽에 막힘: 벽 앞쪽 구간을 다음 행부터 재귀로 처리
+                blocked = True
+                _cast_light(walkable, visible, ox, oy, j + 1, start, left_slope,
+                            radius, xx, xy, yx, yy)
+                new_start = right_slope
+        
+        if blocked:
+            break
+
+
+class FieldOfView:
+    """한 맵에 대한 FOV 캐시 (타일, 맵 버전) -> 보이는 타일 마스크
+    
+    맵 버전이 바뀌면 바뀐 타일을 시야에 포함하던 항목만 버리고 나머지는 새 버전으로 옮긴다.
+    (보이지 않던 타일이 바뀌어도 그 타일은 이미 그림자 속이므로 시야가 달라지지 않음)
+    마스크는 보이는 타일 전체가 필요한 질의(visible_mask)에만 계산하고,
+    타일 한 쌍의 시야(can_see)는 직선 시야 검사로 답한다.
+    """
+    
+    def __init__(self, grid_map, radius=None, cache_bytes=FOV_CACHE_BYTES):
+        """
+        Args:
+            grid_map: 맵
+            radius: 시야 반경 (타일, None이면 맵 전체, 호출자의 센서 범위)
+            cache_bytes: 캐시할 마스크의 총 바이트 (마스크 하나가 맵 타일 수 바이트라 큰 맵일수록 적게 보관)
+        """
+        self._grid_ref = weakref.ref(grid_map)  # 캐시가 맵 수명을 늘리지 않도록 약한 참조
+        height, width = grid_map.shape
+        self.radius = radius if radius is not None else height + width
+        self.cache_size = max(1, cache_bytes // (height * width))
+        
+        self.walkable = walkable_mask(grid_map)
+        self.map_version = None
+        self._cache = OrderedDict()
+        
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+    
+    def visible_mask(self, origin, map_version=None):
+        """
+        origin 타일에서 보이는 타일 마스크
+        
+        Args:
+            origin: (gx, gy) 타일
+            map_version: Level.map_version (None이면 캐시 없이 현재 맵으로 계산)
+        """
+        if map_version is None:
+            return compute_fov(walkable_mask(self._grid_ref()), origin, self.radius)
+        
+        if map_version != self.map_version:
+            self._sync(map_version)
+        
+        key = (origin, map_version)
+        mask = self._cache.get(key)
+        if mask is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return mask
+        
+        self.misses += 1
+        mask = compute_fov(self.walkable, origin, self.radius)
+        self._cache[key] = mask
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return mask
+    
+    def can_see(self, origin, target):
+        """origin에서 target 타일이 보이는지 (시야 반경 안에서 직선 시야 검사, 마스크를 만들지 않음)"""
+        tx, ty = target
+        height, width = self.walkable.shape
+        if not (0 <= tx < width and 0 <= ty < height):
+            return False
+        dx, dy = tx - origin[0], ty - origin[1]
+        if dx * dx + dy * dy > self.radius * self.radius:
+            return False
+        return line_of_sight(self._grid_ref(), origin, target)
+    
+    def _sync(self, map_version):
+        """새 맵 버전으로 전환: 바뀐 타일이 영향을 줄 수 있는 항목만 무효화"""
+        walkable = walkable_mask(self._grid_ref())
+        changed = np.nonzero(walkable != self.walkable)
+        
+        cache = OrderedDict()
+        for (origin, _), mask in self._cache.items():
+            if mask[changed].any():
+                self.invalidated += 1
+            else:
+                cache[(origin, map_version)] = mask
+        
+        self._cache = cache
+        self.walkable = walkable
+        self.map_version = map_version
+
+
+# (grid_map, 시야 반경)별 FOV 서비스: (id, 반경) -> (약한 참조, FieldOfView)
+_fov_cache = {}
+
+
+def get_field_of_view(grid_map, radius=None):
+    """
+    grid_map에 대한 공유 FieldOfView 반환 (같은 맵, 같은 반경을 쓰는 모든 적이 캐시를 공유)
+    
+    Args:
+        radius: 시야 반경 (타일, 호출자의 센서 범위, None이면 맵 전체)
+    """
+    key = (id(grid_map), radius)
+    entry = _fov_cache.get(key)
+    if entry is not None:
+        ref, fov = entry
+        if ref() is grid_map:
+            return fov
+    
+    fov = FieldOfView(grid_map, radius)
+    
+    # 사라진 맵의 항목 정리
+    for stale in [k for k, (ref, _) in _fov_cache.items() if ref() is None]:
+        del _fov_cache[stale]
+    
+    _fov_cache[key] = (weakref.ref(grid_map), fov)
+    return fov
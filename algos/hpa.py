@@ -0,0 +1,346 @@
+"""
+계층적 경로 탐색 (HPA*)
+맵을 클러스터로 나누고 클러스터 경계의 입구 노드 사이 거리를 미리 계산해 두고,
+추상 그래프에서 먼저 탐색한 뒤 클러스터 안에서 타일 경로로 세분화
+"""
+
+import math
+import weakref
+from heapq import heappush, heappop
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from algos.planner import Planner
+from algos.astar import NEIGHBORS_8, octile
+from config import HPA_CLUSTER_SIZE, HPA_ENTRANCE_SPLIT
+
+
+class Cluster:
+    """클러스터 하나의 로컬 그래프와 입구 노드 사이 거리"""
+    
+    def __init__(self, key, bounds):
+        self.key = key
+        self.bounds = bounds  # (x0, y0, x1, y1), x1/y1은 미포함
+        self.graph = None  # 클러스터 내부 타일 그래프 (CSR)
+        self.nodes = []  # 입구 노드 타일 목록
+        self.node_index = {}  # 타일 -> nodes 인덱스
+        self.dist = None  # (len(nodes), 타일 수) 거리 행렬
+        self.pred = None  # (len(nodes), 타일 수) 선행 노드 행렬
+        self.edges = {}  # 입구 노드 -> [(같은 클러스터의 다른 입구, 거리), ...]
+    
+    def local(self, tile):
+        """타일 -> 클러스터 로컬 인덱스"""
+        x0, y0, x1, _ = self.bounds
+        return (tile[1] - y0) * (x1 - x0) + (tile[0] - x0)
+    
+    def tile(self, index):
+        """클러스터 로컬 인덱스 -> 타일"""
+        x0, y0, x1, _ = self.bounds
+        width = x1 - x0
+        return (x0 + index % width, y0 + index // width)
+    
+    def trace(self, pred_row, target):
+        """선행 노드 행을 따라 출발점에서 target까지의 타일 경로"""
+        path = []
+        index = self.local(target)
+        while index >= 0:
+            path.append(self.tile(index))
+            index = pred_row[index]
+        path.reverse()
+        return path
+
+
+class HPAPlanner(Planner):
+    """HPA* 플래너 (맵 변경 시 바뀐 타일이 속한 클러스터만 다시 계산)"""
+    
+    pool = 'thread'  # 클러스터 재계산은 scipy/numpy 커널 위주
+    
+    def __init__(self, cluster_size=HPA_CLUSTER_SIZE, entrance_split=HPA_ENTRANCE_SPLIT):
+        """
+        Args:
+            cluster_size: 클러스터 한 변의 타일 수
+            entrance_split: 경계의 열린 구간이 이 길이 이상이면 양 끝 두 곳에 입구 배치
+        """
+        self.cluster_size = cluster_size
+        self.entrance_split = entrance_split
+        
+        self.walkable = None
+        self.map_version = None
+        self.radius = 0  # 분해한 NavGrid의 팽창 반지름 (같은 맵 버전의 팽창/원본 레이어 구분)
+        self.clusters = {}  # (cx, cy) -> Cluster
+        self.borders = {}  # 경계 키 -> [(안쪽 타일, 바깥 타일), ...]
+        self.inter = {}  # 타일 -> [클러스터 경계 건너편 타일, ...]
+        
+        # 통계
+        self.clusters_rebuilt = 0  # 마지막 동기화에서 다시 계산한 클러스터 수
+        self.expanded = 0  # 마지막 추상 탐색에서 확장한 노드 수
+    
+    def sync(self, nav):
+        """nav의 맵 버전에 맞춰 추상 그래프 갱신 (바뀐 클러스터만)"""
+        if self.walkable is not None and self.walkable.shape == nav.walkable.shape:
+            if (nav.map_version is not None and nav.map_version == self.map_version and
+                    nav.radius == self.radius):
+                return
+            changed = np.nonzero(nav.walkable != self.walkable)
+            dirty = {(int(x) // self.cluster_size, int(y) // self.cluster_size)
+                     for y, x in zip(*changed)}
+        else:
+            self._init_clusters(nav.walkable.shape)
+            dirty = set(self.clusters)
+        
+        self.walkable = nav.walkable.copy()
+        self.map_version = nav.map_version
+        self.radius = nav.radius
+        if dirty:
+            self._rebuild(dirty)
+        self.clusters_rebuilt = len(dirty)
+    
+    def _init_clusters(self, shape):
+        height, width = shape
+        size = self.cluster_size
+        self.clusters = {}
+        self.borders = {}
+        self.inter = {}
+        for cy in range((height + size - 1) // size):
+            for cx in range((width + size - 1) // size):
+                bounds = (cx * size, cy * size,
+                          min((cx + 1) * size, width), min((cy + 1) * size, height))
+                self.clusters[(cx, cy)] = Cluster((cx, cy), bounds)
+    
+    def _rebuild(self, dirty):
+        """dirty 클러스터의 그래프와 경계 입구, 영향받는 클러스터의 입구 거리 재계산"""
+        affected = set(dirty)
+        borders = set()
+        for cx, cy in dirty:
+            for key, neighbor in (((cx, cy, 'v'), (cx + 1, cy)), ((cx - 1, cy, 'v'), (cx - 1, cy)),
+                                  ((cx, cy, 'h'), (cx, cy + 1)), ((cx, cy - 1, 'h'), (cx, cy - 1))):
+                if neighbor in self.clusters:
+                    borders.add(key)
+                    affected.add(neighbor)
+        
+        for key in borders:
+            self._find_entrances(key)
+        
+        for c in dirty:
+            self.clusters[c].graph = self._cluster_graph(self.clusters[c])
+        for c in affected:
+            self._connect_nodes(self.clusters[c])
+    
+    def _find_entrances(self, key):
+        """경계 하나의 입구 쌍을 다시 계산해 inter 간선 갱신"""
+        for a, b in self.borders.pop(key, []):
+            self.inter[a].remove(b)
+            self.inter[b].remove(a)
+        
+        cx, cy, axis = key
+        x0, y0, x1, y1 = self.clusters[(cx, cy)].bounds
+        if axis == 'v':
+            # (cx, cy)의 오른쪽 열과 (cx + 1, cy)의 왼쪽 열
+            open_run = self.walkable[y0:y1, x1 - 1] & self.walkable[y0:y1, x1]
+            pair = lambda i: ((x1 - 1, y0 + i), (x1, y0 + i))
+        else:
+            # (cx, cy)의 아래쪽 행과 (cx, cy + 1)의 위쪽 행
+            open_run = self.walkable[y1 - 1, x0:x1] & self.walkable[y1, x0:x1]
+            pair = lambda i: ((x0 + i, y1 - 1), (x0 + i, y1))
+        
+        pairs = []
+        for start, end in _runs(open_run):
+            if end - start + 1 >= self.entrance_split:
+                pairs.append(pair(start))
+                pairs.append(pair(end))
+            else:
+                pairs.append(pair((start + end) // 2))
+        
+        self.borders[key] = pairs
+        for a, b in pairs:
+            self.inter.setdefault(a, []).append(b)
+            self.inter.setdefault(b, []).append(a)
+    
+    def _cluster_graph(self, cluster):
+        """클러스터 내부 8방향 (모서리 통과 금지) 타일 그래프"""
+        x0, y0, x1, y1 = cluster.bounds
+        sub = self.walkable[y0:y1, x0:x1]
+        h, w = sub.shape
+        index = np.arange(h * w).reshape(h, w)
+        
+        rows, cols, weights = [], [], []
+        for dx, dy, cost in NEIGHBORS_8:
+            src = (slice(max(0, -dy), h - max(0, dy)), slice(max(0, -dx), w - max(0, dx)))
+            dst = (slice(max(0, dy), h + min(0, dy)), slice(max(0, dx), w + min(0, dx)))
+            ok = sub[src] & sub[dst]
+            if dx and dy:
+                # 대각선은 양쪽 직교 타일이 모두 비어 있어야 함
+                ok &= sub[src[0], dst[1]] & sub[dst[0], src[1]]
+            rows.append(index[src][ok])
+            cols.append(index[dst][ok])
+            weights.append(np.full(int(ok.sum()), cost))
+        
+        n = h * w
+        return csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(n, n))
+    
+    def _connect_nodes(self, cluster):
+        """클러스터 입구 노드 목록과 노드 사이 거리/선행 노드 재계산"""
+        cx, cy = cluster.key
+        nodes = []
+        for key, side in (((cx, cy, 'v'), 0), ((cx - 1, cy, 'v'), 1),
+                          ((cx, cy, 'h'), 0), ((cx, cy - 1, 'h'), 1)):
+            for pair in self.borders.get(key, []):
+                if pair[side] not in nodes:
+                    nodes.append(pair[side])
+        
+        cluster.nodes = nodes
+        cluster.node_index = {tile: i for i, tile in enumerate(nodes)}
+        cluster.edges = {}
+        if not nodes:
+            cluster.dist = cluster.pred = None
+            return
+        
+        local = [cluster.local(t) for t in nodes]
+        cluster.dist, cluster.pred = dijkstra(cluster.graph, indices=local,
+                                              return_predecessors=True)
+        
+        # 추상 탐색용 간선 목록 (클러스터 안에서 닿을 수 있는 입구끼리)
+        between = cluster.dist[:, local]
+        for i, tile in enumerate(nodes):
+            cluster.edges[tile] = [(nodes[j], float(between[i, j]))
+                                   for j in np.nonzero(np.isfinite(between[i]))[0] if j != i]
+    
+    def cluster_of(self, tile):
+        return (tile[0] // self.cluster_size, tile[1] // self.cluster_size)
+    
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 추상 그래프 탐색 후 클러스터별로 세분화한 타일 경로"""
+        if not nav.is_walkable(*start) or not nav.is_walkable(*goal):
+            return []
+        if start == goal:
+            return [start]
+        
+        self.sync(nav)
+        start_cluster = self.clusters[self.cluster_of(start)]
+        goal_cluster = self.clusters[self.cluster_of(goal)]
+        
+        # 시작/목표를 임시 노드로 연결 (각자 클러스터 안에서 한 번씩 Dijkstra)
+        start_dist, start_pred = dijkstra(start_cluster.graph, indices=start_cluster.local(start),
+                                          return_predecessors=True)
+        goal_dist, goal_pred = dijkstra(goal_cluster.graph, indices=goal_cluster.local(goal),
+                                        return_predecessors=True)
+        
+        abstract = self._search_abstract(start, goal, start_cluster, goal_cluster,
+                                         start_dist, goal_dist)
+        if not abstract:
+            return []
+        
+        return self._refine(abstract, start, goal, start_pred, goal_pred)
+    
+    def _search_abstract(self, start, goal, start_cluster, goal_cluster, start_dist, goal_dist):
+        """입구 노드 그래프에서 A* (시작/목표 임시 간선 포함)"""
+        g = {start: 0.0}
+        parent = {start: None}
+        open_heap = [(octile(goal[0] - start[0], goal[1] - start[1]), 0.0, start)]
+        closed = set()
+        self.expanded = 0
+        
+        while open_heap:
+            _, _, node = heappop(open_heap)
+            if node in closed:
+                continue
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                path.reverse()
+                return path
+            
+            closed.add(node)
+            self.expanded += 1
+            
+            for other, cost in self._abstract_edges(node, start, goal, start_cluster,
+                                                    goal_cluster, start_dist, goal_dist):
+                if other in closed:
+                    continue
+                ng = g[node] + cost
+                if ng < g.get(other, math.inf):
+                    g[other] = ng
+                    parent[other] = node
+                    heappush(open_heap, (ng + octile(goal[0] - other[0], goal[1] - other[1]),
+                                         -ng, other))
+        
+        return []
+    
+    def _abstract_edges(self, node, start, goal, start_cluster, goal_cluster,
+                        start_dist, goal_dist):
+        """추상 그래프 이웃 (타일, 비용)"""
+        if node == start:
+            # 시작점 -> 자기 클러스터 입구들 (같은 클러스터면 목표로 직행 포함)
+            for tile in start_cluster.nodes:
+                d = start_dist[start_cluster.local(tile)]
+                if tile != start and np.isfinite(d):
+                    yield tile, d
+            if start_cluster is goal_cluster:
+                d = start_dist[goal_cluster.local(goal)]
+                if np.isfinite(d):
+                    yield goal, d
+        else:
+            cluster = self.clusters[self.cluster_of(node)]
+            yield from cluster.edges[node]
+            if cluster is goal_cluster:
+                d = goal_dist[goal_cluster.local(node)]
+                if np.isfinite(d):
+                    yield goal, d
+        
+        for other in self.inter.get(node, ()):
+            yield other, 1.0
+    
+    def _refine(self, abstract, start, goal, start_pred, goal_pred):
+        """추상 경로의 각 구간을 클러스터 안의 타일 경로로 채움"""
+        path = [start]
+        for a, b in zip(abstract, abstract[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                # 클러스터 경계를 건너는 입구 간선 (인접 타일)
+                path.append(b)
+                continue
+            
+            cluster = self.clusters[self.cluster_of(a)]
+            if a == start:
+                segment = cluster.trace(start_pred, b)
+            elif b == goal:
+                # 목표에서 출발한 선행 노드이므로 a -> 목표 순서로 바로 나옴
+                segment = cluster.trace(goal_pred, a)[::-1]
+            else:
+                segment = cluster.trace(cluster.pred[cluster.node_index[a]], b)
+            path.extend(segment[1:])
+        
+        return path
+
+
+def _runs(mask):
+    """1차원 bool 배열에서 True 구간 (시작, 끝) 목록 (끝 포함)"""
+    padded = np.concatenate([[False], mask, [False]]).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.nonzero(edges == 1)[0]
+    ends = np.nonzero(edges == -1)[0] - 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+# grid_map별 공유 HPA 플래너: id -> (약한 참조, HPAPlanner)
+_hpa_cache = {}
+
+
+def get_hpa_planner(grid_map):
+    """grid_map에 대한 공유 HPAPlanner 반환 (같은 맵의 모든 적이 추상 그래프를 공유)"""
+    entry = _hpa_cache.get(id(grid_map))
+    if entry is not None:
+        ref, planner = entry
+        if ref() is grid_map:
+            return planner
+    
+    planner = HPAPlanner()
+    
+    # 사라진 맵의 항목 정리
+    for key in [k for k, (ref, _) in _hpa_cache.items() if ref() is None]:
+        del _hpa_cache[key]
+    
+    _hpa_cache[id(grid_map)] = (weakref.ref(grid_map), planner)
+    return planner
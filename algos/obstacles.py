@@ -0,0 +1,273 @@
+"""
+장애물 인덱스 (연결 요소 라벨링, 경계 윤곽, 볼록 모서리)
+맵 버전마다 한 번만 계산해 Bug 계열 플래너들이 공유
+"""
+
+import weakref
+import numpy as np
+from scipy import ndimage
+from game.grid import walkable_mask
+
+
+# 4방향 (y축이 아래를 향하므로 인덱스가 증가하면 시계 방향 회전)
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+
+class Contour:
+    """벽을 한쪽 손으로 짚고 도는 경계 윤곽 (순서가 있는 타일 목록)
+    
+    states[i] = (gx, gy, heading). 마지막 상태 다음은 loop_start로 돌아간다.
+    """
+    
+    def __init__(self, states, loop_start, hand):
+        self.states = states
+        self.loop_start = loop_start
+        self.hand = hand
+        self.tiles = np.array([(x, y) for x, y, _ in states], dtype=int).reshape(-1, 2)
+    
+    def __len__(self):
+        return len(self.states)
+    
+    def next_index(self, i):
+        """윤곽을 따라 다음 인덱스"""
+        return i + 1 if i + 1 < len(self.states) else self.loop_start
+    
+    def route_from(self, i):
+        """i에서 출발해 한 바퀴 도는 인덱스 배열 (출발점이 루프 밖이면 루프에 닿을 때까지의 꼬리 + 루프 한 바퀴)"""
+        n = len(self.states)
+        if i >= self.loop_start:
+            return np.concatenate([np.arange(i, n), np.arange(self.loop_start, i)])
+        return np.arange(i, n)
+    
+    def route_loop_start(self, route):
+        """route_from 배열에서 루프가 시작하는 위치 (출발점이 루프 위면 0)"""
+        return max(self.loop_start - int(route[0]), 0)
+    
+    def route_step(self, route, pos, step=1):
+        """
+        route_from 배열 안에서 윤곽을 따라 step(+1/-1)만큼 이동한 위치
+        
+        마지막 상태 다음은 next_index처럼 루프 시작으로 이어지고 (route[0]으로 감지 않음),
+        루프 밖 꼬리는 루프 쪽으로만 지나간다.
+        """
+        first = self.route_loop_start(route)
+        if pos < first:
+            return min(max(pos + step, 0), first)
+        return first + (pos - first + step) % (len(route) - first)
+
+
+class ObstacleMap:
+    """맵 한 버전에 대한 장애물 연결 요소 인덱스"""
+    
+    CORNER_BUCKET_SIZE = 8  # 볼록 모서리 공간 버킷 크기 (타일)
+    
+    def __init__(self, grid_map):
+        self.walkable = walkable_mask(grid_map)
+        self.height, self.width = self.walkable.shape
+        
+        # 맵 경계는 장애물로 취급하지 않음
+        obstacles = ~self.walkable
+        obstacles[0, :] = False
+        obstacles[-1, :] = False
+        obstacles[:, 0] = False
+        obstacles[:, -1] = False
+        
+        # 4방향 연결 요소 라벨 (0 = 장애물 아님)
+        self.labels, self.num_labels = ndimage.label(obstacles)
+        self._slices = ndimage.find_objects(self.labels)
+        
+        # 라벨별 "인접한 이동 가능 타일" 마스크 (필요할 때 계산)
+        self._adjacent = {}
+        
+        # 손 방향별 윤곽 인덱스: (gx, gy, heading) -> (Contour, index)
+        self._contours = {'right': {}, 'left': {}}
+        
+        # 볼록 모서리 인덱스 (필요할 때 계산)
+        self._corners = None
+        self._corner_buckets = None
+    
+    def label_at(self, gx, gy):
+        """해당 타일의 장애물 라벨 (맵 밖/경계/빈 공간이면 0)"""
+        if 0 <= gx < self.width and 0 <= gy < self.height:
+            return int(self.labels[gy, gx])
+        return 0
+    
+    def adjacent_mask(self, label):
+        """장애물 라벨에 8방향으로 인접한 이동 가능 타일 마스크"""
+        mask = self._adjacent.get(label)
+        if mask is not None:
+            return mask
+        
+        mask = np.zeros_like(self.walkable)
+        if 1 <= label <= self.num_labels and self._slices[label - 1] is not None:
+            # 라벨의 경계 상자를 한 칸 넓혀서 그 안에서만 팽창 연산
+            ys, xs = self._slices[label - 1]
+            y0, y1 = max(ys.start - 1, 0), min(ys.stop + 1, self.height)
+            x0, x1 = max(xs.start - 1, 0), min(xs.stop + 1, self.width)
+            
+            component = self.labels[y0:y1, x0:x1] == label
+            grown = ndimage.binary_dilation(component, structure=np.ones((3, 3), dtype=bool))
+            mask[y0:y1, x0:x1] = grown & self.walkable[y0:y1, x0:x1]
+        
+        self._adjacent[label] = mask
+        return mask
+    
+    def is_adjacent(self, label, gx, gy):
+        """해당 타일이 장애물 라벨에 인접한 이동 가능 타일인지"""
+        if 0 <= gx < self.width and 0 <= gy < self.height:
+            return bool(self.adjacent_mask(label)[gy, gx])
+        return False
+    
+    @property
+    def convex_corners(self):
+        """장애물 볼록 모서리 바깥의 이동 가능 타일 (N, 2) 배열 - Tangent 후보
+        
+        대각선 방향 타일이 벽이고, 그 대각선을 이루는 두 직교 이웃은 비어 있는 타일.
+        """
+        if self._corners is None:
+            self._build_corner_index()
+        return self._corners
+    
+    def corners_within(self, pos, radius):
+        """pos에서 radius(타일) 안에 있는 볼록 모서리 (N, 2) 배열"""
+        if self._corners is None:
+            self._build_corner_index()
+        
+        gx, gy = pos
+        size = self.CORNER_BUCKET_SIZE
+        bx0, bx1 = int((gx - radius) // size), int((gx + radius) // size)
+        by0, by1 = int((gy - radius) // size), int((gy + radius) // size)
+        
+        chunks = [self._corner_buckets[key]
+                  for key in ((bx, by) for by in range(by0, by1 + 1) for bx in range(bx0, bx1 + 1))
+                  if key in self._corner_buckets]
+        if not chunks:
+            return np.zeros((0, 2), dtype=int)
+        
+        candidates = self._corners[np.concatenate(chunks)]
+        d2 = (candidates[:, 0] - gx) ** 2 + (candidates[:, 1] - gy) ** 2
+        return candidates[d2 <= radius * radius]
+    
+    def _build_corner_index(self):
+        """볼록 모서리를 벡터화로 찾고 공간 버킷에 등록"""
+        free = self.walkable
+        
+        # 맵 밖은 막힌 것으로 취급하도록 한 칸 패딩
+        padded = np.zeros((self.height + 2, self.width + 2), dtype=bool)
+        padded[1:-1, 1:-1] = free
+        
+        def shifted(dx, dy):
+            return padded[1 + dy:1 + dy + self.height, 1 + dx:1 + dx + self.width]
+        
+        corner = np.zeros_like(free)
+        for dx in (-1, 1):
+            for dy in (-1, 1):
+                corner |= ~shifted(dx, dy) & shifted(dx, 0) & shifted(0, dy)
+        corner &= free
+        
+        ys, xs = np.nonzero(corner)
+        self._corners = np.stack([xs, ys], axis=1).astype(int)
+        
+        size = self.CORNER_BUCKET_SIZE
+        self._corner_buckets = {}
+        for i, (bx, by) in enumerate(zip(xs // size, ys // size)):
+            self._corner_buckets.setdefault((int(bx), int(by)), []).append(i)
+        for key, indices in self._corner_buckets.items():
+            self._corner_buckets[key] = np.array(indices, dtype=int)
+    
+    def contour_from(self, pos, wall_dir, hand='right'):
+        """
+        pos에서 wall_dir 방향의 벽을 한쪽 손으로 짚고 도는 윤곽 반환
+        
+        같은 맵 버전에서 이미 추적한 윤곽 위의 상태면 추적 없이 재사용한다.
+        
+        Args:
+            pos: (gx, gy) 이동 가능한 시작 타일
+            wall_dir: (dx, dy) pos에서 벽 쪽 4방향
+            hand: 'right' (시계 방향으로 돎) 또는 'left' (반시계 방향)
+        
+        Returns:
+            (Contour, index): 윤곽과 시작 상태의 인덱스
+        """
+        d = DIRECTIONS.index(wall_dir)
+        heading = (d + 3) % 4 if hand == 'right' else (d + 1) % 4
+        start = (pos[0], pos[1], heading)
+        
+        index = self._contours[hand]
+        found = index.get(start)
+        if found is not None:
+            return found
+        
+        contour = self._trace_contour(start, hand)
+        for i, state in enumerate(contour.states):
+            index.setdefault(state, (contour, i))
+        
+        # 시작 상태가 루프 밖이면 같은 타일을 지나는 루프 위 상태로 대체 (한 바퀴 후 복귀 보장)
+        if index[start][1] < contour.loop_start:
+            loop = contour.tiles[contour.loop_start:]
+            same = np.flatnonzero((loop[:, 0] == pos[0]) & (loop[:, 1] == pos[1]))
+            if len(same):
+                index[start] = (contour, contour.loop_start + int(same[0]))
+        return index[start]
+    
+    def _trace_contour(self, start, hand):
+        """벽 따라가기(wall follower)로 상태가 반복될 때까지 윤곽 추적"""
+        # 오른손: 오른쪽 → 직진 → 왼쪽 → 뒤 순서로 시도 (왼손은 반대)
+        if hand == 'right':
+            turns = (1, 0, 3, 2)
+        else:
+            turns = (3, 0, 1, 2)
+        
+        walkable = self.walkable
+        states = []
+        seen = {}
+        state = start
+        max_steps = 4 * self.width * self.height
+        
+        while state not in seen and len(states) < max_steps:
+            seen[state] = len(states)
+            states.append(state)
+            
+            x, y, heading = state
+            for turn in turns:
+                direction = (heading + turn) % 4
+                dx, dy = DIRECTIONS[direction]
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.width and 0 <= ny < self.height and walkable[ny, nx]:
+                    state = (nx, ny, direction)
+                    break
+            else:
+                break  # 사방이 막힘
+        
+        return Contour(states, seen.get(state, 0), hand)
+
+
+# grid_map별 최신 ObstacleMap 캐시: id -> (약한 참조, 맵 버전, ObstacleMap)
+_obstacle_cache = {}
+
+
+def get_obstacle_map(grid_map, map_version=None):
+    """
+    맵 버전에 해당하는 ObstacleMap 반환 (같은 버전이면 캐시 재사용)
+    
+    Args:
+        grid_map: 2D numpy array
+        map_version: Level.map_version (None이면 캐시 없이 새로 계산)
+    """
+    if map_version is None:
+        return ObstacleMap(grid_map)
+    
+    entry = _obstacle_cache.get(id(grid_map))
+    if entry is not None:
+        ref, version, obstacle_map = entry
+        if ref() is grid_map and version == map_version:
+            return obstacle_map
+    
+    obstacle_map = ObstacleMap(grid_map)
+    
+    # 사라진 맵의 항목 정리
+    for key in [k for k, (ref, _, _) in _obstacle_cache.items() if ref() is None]:
+        del _obstacle_cache[key]
+    
+    _obstacle_cache[id(grid_map)] = (weakref.ref(grid_map), map_version, obstacle_map)
+    return obstacle_map
@@ -0,0 +1,192 @@
+"""
+경로 질의 캐시
+같은 종류의 적들이 묻는 "내 타일 -> 플레이어 타일" 경로를 맵 버전 단위로 공유
+"""
+
+from collections import OrderedDict
+from game.grid import path_blocked_by
+from config import PATH_CACHE_SIZE
+
+
+class PathCache:
+    """(플래너 키, 시작, 목표, 맵 버전) -> 경로 LRU 캐시
+    
+    정확히 같은 질의가 없으면 다음을 재사용한다.
+    - 시작점이 같은 목표로 가는 캐시 경로 위에 있으면 그 뒤쪽 (적이 경로를 따라 전진한 경우)
+    - 목표가 한 칸 움직였으면 기존 경로를 잘라내거나 한 칸 이어 붙임 (플레이어가 이동한 경우)
+    맵 버전이 바뀌면 변경 기록(changes_since)을 보고, 벽만 추가됐으면 그 벽에 막힌 경로만 버린다.
+    (장애물이 늘기만 하면 막히지 않은 최단 경로는 여전히 최단) 벽이 사라졌거나
+    기록을 알 수 없으면 더 짧은 길이 생겼을 수 있으므로 모두 비운다.
+    재사용으로 만든 경로를 다시 재사용하는 것은 MAX_REUSE_DEPTH번까지만 허용한다.
+    (목표를 계속 따라 이어 붙이면 경로가 최단에서 점점 멀어짐)
+    """
+    
+    MAX_REUSE_DEPTH = 3
+    
+    def __init__(self, max_entries=PATH_CACHE_SIZE, changes_since=None):
+        """
+        Args:
+            max_entries: 최대 캐시 경로 수
+            changes_since: version -> (막힌 타일 set, 열린 타일 set) 또는 None (Level.changes_since)
+        """
+        self.max_entries = max_entries
+        self.changes_since = changes_since
+        self.map_version = None
+        self._entries = OrderedDict()  # (planner_key, start, goal) -> (path, 재사용 깊이)
+        self._by_start = {}  # (planner_key, start) -> {goal, ...}
+        self._by_goal = {}  # (planner_key, goal) -> {start, ...}
+        
+        # 통계 (디버그 화면에 표시)
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.invalidated = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def query(self, planner_key, start, goal, nav, compute):
+        """
+        캐시된 경로 반환, 없으면 compute()로 계산해 저장
+        
+        Args:
+            planner_key: 플래너 종류 (같은 키끼리 결과 공유)
+            start, goal: (gx, gy) 타일
+            nav: NavGrid (map_version이 None이면 캐시하지 않음)
+            compute: 캐시 미스 시 경로를 계산하는 함수 () -> path
+        
+        Returns:
+            경로 리스트 (호출자가 수정해도 되는 복사본)
+        """
+        path = self.get(planner_key, start, goal, nav)
+        if path is not None:
+            return path
+        
+        path = compute()
+        self.put(planner_key, start, goal, nav, path)
+        return list(path)
+    
+    def get(self, planner_key, start, goal, nav):
+        """캐시 조회만 수행 (정확히 일치하거나 재사용 가능한 경로의 복사본, 없으면 None)"""
+        if nav.map_version is None:
+            return None
+        self._sync(nav)
+        
+        key = (planner_key, start, goal)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0])
+        
+        reused = self._reuse(planner_key, start, goal, nav)
+        if reused is None:
+            self.misses += 1
+            return None
+        
+        self.partial_hits += 1
+        path, depth = reused
+        self._store(key, path, depth)
+        return list(path)
+    
+    def put(self, planner_key, start, goal, nav, path):
+        """계산한 경로 저장 (get()으로 조회한 뒤 호출)"""
+        # 실패는 저장하지 않음 (RRT처럼 무작위 플래너는 재시도하면 찾을 수 있음)
+        if nav.map_version is None or not path:
+            return
+        # 이미 지난 맵 버전의 결과
+        if nav.map_version != self.map_version:
+            return
+        self._store((planner_key, start, goal), list(path), 0)
+    
+    def clear(self):
+        self._entries.clear()
+        self._by_start.clear()
+        self._by_goal.clear()
+    
+    def stats(self):
+        """캐시 통계 딕셔너리"""
+        total = self.hits + self.partial_hits + self.misses
+        return {
+            'hits': self.hits,
+            'partial_hits': self.partial_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.partial_hits) / total if total else 0.0,
+            'entries': len(self._entries),
+            'invalidated': self.invalidated,
+            'max_entries': self.max_entries
+        }
+    
+    def _sync(self, nav):
+        """맵 버전이 바뀌면 새 벽에 막힌 항목 무효화 (알 수 없으면 전부)"""
+        if nav.map_version == self.map_version:
+            return
+        
+        changes = None
+        if self.changes_since is not None and self.map_version is not None:
+            changes = self.changes_since(self.map_version)
+        self.map_version = nav.map_version
+        
+        if changes is None or changes[1]:
+            self.invalidated += len(self._entries)
+            self.clear()
+            return
+        
+        blocked = changes[0]
+        if not blocked:
+            return
+        
+        entries = [(key, entry) for key, entry in self._entries.items()
+                   if not path_blocked_by(nav.grid_map, entry[0], blocked)]
+        self.invalidated += len(self._entries) - len(entries)
+        self.clear()
+        for key, (path, depth) in entries:
+            self._store(key, path, depth)
+    
+    def _reuse(self, planner_key, start, goal, nav):
+        """가까운 캐시 경로에서 새 경로 유도 -> (path, 재사용 깊이), 불가능하면 None"""
+        # 목표가 한 칸 움직임: 같은 시작점의 경로를 자르거나 이어 붙임
+        for old_goal in self._by_start.get((planner_key, start), ()):
+            if max(abs(old_goal[0] - goal[0]), abs(old_goal[1] - goal[1])) != 1:
+                continue
+            path, depth = self._entries[(planner_key, start, old_goal)]
+            if not path or path[-1] != old_goal or depth >= self.MAX_REUSE_DEPTH:
+                continue
+            if goal in path:
+                return path[:path.index(goal) + 1], depth + 1
+            if self._can_step(nav, old_goal, goal):
+                return path + [goal], depth + 1
+        
+        # 시작점이 같은 목표로 가는 경로 위에 있음: 뒤쪽만 사용 (최단 경로의 일부는 최단)
+        for old_start in self._by_goal.get((planner_key, goal), ()):
+            path, depth = self._entries[(planner_key, old_start, goal)]
+            if start in path:
+                return path[path.index(start):], depth
+        
+        return None
+    
+    def _can_step(self, nav, a, b):
+        """인접 타일 a -> b 이동 가능 여부 (대각선은 모서리 통과 금지)"""
+        if not nav.is_walkable(*b):
+            return False
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        if dx and dy:
+            return nav.is_walkable(a[0] + dx, a[1]) and nav.is_walkable(a[0], a[1] + dy)
+        return True
+    
+    def _store(self, key, path, depth):
+        planner_key, start, goal = key
+        self._entries[key] = (path, depth)
+        self._by_start.setdefault((planner_key, start), set()).add(goal)
+        self._by_goal.setdefault((planner_key, goal), set()).add(start)
+        
+        while len(self._entries) > self.max_entries:
+            (old_key, old_start, old_goal), _ = self._entries.popitem(last=False)
+            goals = self._by_start[(old_key, old_start)]
+            goals.discard(old_goal)
+            if not goals:
+                del self._by_start[(old_key, old_start)]
+            starts = self._by_goal[(old_key, old_goal)]
+            starts.discard(old_start)
+            if not starts:
+                del self._by_goal[(old_key, old_goal)]
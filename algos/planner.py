@@ -0,0 +1,297 @@
+"""
+공통 플래너 인터페이스
+모든 경로 계획 알고리즘을 plan(start, goal, nav) -> path 형태로 비교/교체할 수 있게 함
+"""
+
+import time
+import numpy as np
+from heapq import heappush, heappop
+from scipy import ndimage
+from game.grid import walkable_mask, distance_grid
+from config import PLANNING_STALE_TILES, TILE_SIZE, TILE_WALL
+
+
+class NavGrid:
+    """플래너가 공유하는 탐색 맵 (맵 + 버전 + 이동 가능 마스크)"""
+    
+    def __init__(self, grid_map, map_version=None):
+        """
+        Args:
+            grid_map: 2D numpy array
+            map_version: Level.map_version (None이면 버전 없음)
+        """
+        self.grid_map = grid_map
+        self.map_version = map_version
+        self.walkable = walkable_mask(grid_map)
+        self.height, self.width = self.walkable.shape
+        
+        # 탐색 루프용 1차원 리스트 (numpy 스칼라 인덱싱보다 빠름)
+        self.free = self.walkable.ravel().tolist()
+        
+        # 구성 공간 반지름 (픽셀, inflated()로 만든 NavGrid만 0이 아님)
+        self.radius = 0
+        self._clearance = None
+        self._inflated = {}
+    
+    @classmethod
+    def patched(cls, previous, grid_map, map_version, windows):
+        """
+        previous에서 windows 영역만 다시 계산한 NavGrid (나머지는 복사)
+        
+        Args:
+            previous: 같은 크기 맵의 이전 NavGrid (수정하지 않음)
+            windows: 바뀐 영역들 [(x0, y0, x1, y1), ...] (x1/y1 미포함)
+        """
+        nav = cls.__new__(cls)
+        nav.grid_map = grid_map
+        nav.map_version = map_version
+        nav.walkable = previous.walkable.copy()
+        nav.height, nav.width = previous.height, previous.width
+        nav.free = previous.free.copy()
+        nav.radius = 0
+        nav._clearance = None
+        nav._inflated = {}
+        
+        for x0, y0, x1, y1 in windows:
+            window = walkable_mask(grid_map[y0:y1, x0:x1])
+            nav.walkable[y0:y1, x0:x1] = window
+            for row, y in enumerate(range(y0, y1)):
+                nav.free[y * nav.width + x0:y * nav.width + x1] = window[row].tolist()
+        return nav
+    
+    def is_walkable(self, gx, gy):
+        """이동 가능한 타일인지 (맵 밖은 False)"""
+        return 0 <= gx < self.width and 0 <= gy < self.height and bool(self.walkable[gy, gx])
+    
+    @property
+    def clearance(self):
+        """타일 중심에서 가장 가까운 막힌 타일(맵 밖 포함) 경계까지의 거리장 (픽셀, 처음 접근할 때 계산)"""
+        if self._clearance is None:
+            self._clearance = clearance_field(self.walkable)
+        return self._clearance
+    
+    def inflated(self, radius):
+        """
+        반지름 radius(픽셀)인 원형 에이전트의 구성 공간 NavGrid
+        
+        중심의 여유 거리가 radius보다 작은 타일을 벽으로 바꾼 맵이라 grid_map을 받는 플래너도
+        그대로 계획할 수 있다. NavGrid는 맵 버전마다 새로 만들어지므로 반지름별로 여기에 캐시하면
+        (반지름, 맵 버전)마다 한 번만 계산된다. 부풀릴 타일이 없으면 자기 자신을 반환.
+        """
+        if radius <= TILE_SIZE / 2:
+            # 빈 타일 중심의 여유 거리는 항상 TILE_SIZE / 2 이상이라 거리장 없이도 막히는 타일이 없음
+            return self
+        
+        nav = self._inflated.get(radius)
+        if nav is None:
+            blocked = self.walkable & (self.clearance < radius)
+            nav = self
+            if blocked.any():
+                grid_map = np.array(self.grid_map)
+                grid_map[blocked] = TILE_WALL
+                grid_map.setflags(write=False)
+                nav = NavGrid(grid_map, self.map_version)
+                nav.radius = radius
+            self._inflated[radius] = nav
+        return nav
+
+
+def clearance_field(walkable):
+    """
+    이동 가능한 타일마다 중심에서 가장 가까운 막힌 타일 경계까지의 거리 (픽셀, 막힌 타일은 0)
+    
+    유클리드 거리 변환으로 중심 간 거리가 가장 가까운 막힌 타일을 찾은 뒤, 그 타일 사각형까지의
+    거리로 바꾼다. 맵 밖은 막힌 것으로 본다.
+    """
+    padded = np.pad(walkable, 1, constant_values=False)
+    if padded.all():
+        return np.full(walkable.shape, np.inf, dtype=np.float32)
+    
+    _, (iy, ix) = ndimage.distance_transform_edt(padded, return_indices=True)
+    ys, xs = np.indices(padded.shape)
+    dx = np.maximum(np.abs(ix - xs) - 0.5, 0)
+    dy = np.maximum(np.abs(iy - ys) - 0.5, 0)
+    field = np.hypot(dx, dy) * TILE_SIZE
+    field[~padded] = 0
+    return field[1:-1, 1:-1].astype(np.float32)
+
+
+class Planner:
+    """경로 플래너 공통 인터페이스
+    
+    plan(start, goal, nav)은 start부터 goal까지의 그리드 좌표 리스트를 반환한다.
+    (start 포함, 경로를 못 찾으면 빈 리스트)
+    그리드 탐색/Bug/APF는 인접 타일 경로, PRM/RRT는 시야가 확보된 경유점 경로를 반환한다.
+    """
+    
+    # 백그라운드 실행 시 사용할 풀 ('thread': numpy 위주, 'process': 순수 파이썬 루프 위주)
+    pool = 'process'
+    
+    def plan(self, start, goal, nav):
+        raise NotImplementedError
+    
+    def plan_steps(self, start, goal, nav):
+        """plan()을 조금씩 실행하는 제너레이터 (작업 단위마다 yield, 끝나면 경로 return)
+        
+        나눠 실행할 수 없는 플래너는 한 번에 plan()을 실행한다.
+        """
+        return self.plan(start, goal, nav)
+        yield
+    
+    def partial_path(self, goal):
+        """plan_steps를 중간에 멈췄을 때의 가장 좋은 부분 경로 (지원하지 않으면 [])"""
+        return []
+
+
+def graph_a_star(nodes, graph, start_idx, goal_idx, edge_ok=None):
+    """
+    노드 그래프 A* (PRM 로드맵, 사분 트리 셀 그래프 등 공용)
+    
+    Args:
+        nodes: 노드 인덱스 -> (gx, gy) 좌표 (거리/휴리스틱 계산용)
+        graph: 노드 인덱스 -> 이웃 인덱스 리스트
+        edge_ok: (a, b) -> bool, 주어지면 False인 엣지는 건너뜀
+    
+    Returns:
+        시작부터 목표까지 노드 인덱스 리스트 (경로 없으면 [])
+    """
+    goal = nodes[goal_idx]
+    
+    # 오픈/클로즈드 리스트
+    open_set = [(distance_grid(nodes[start_idx], goal), start_idx)]
+    came_from = {}
+    g_score = {start_idx: 0}
+    
+    while open_set:
+        _, current = heappop(open_set)
+        
+        if current == goal_idx:
+            # 경로 재구성
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            path.reverse()
+            return path
+        
+        for neighbor in graph[current]:
+            if edge_ok is not None and not edge_ok(current, neighbor):
+                continue
+            
+            tentative_g = g_score[current] + distance_grid(nodes[current], nodes[neighbor])
+            
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                heappush(open_set, (tentative_g + distance_grid(nodes[neighbor], goal), neighbor))
+    
+    return []  # 경로 없음
+
+
+def run_steps(steps):
+    """제너레이터 플래너를 끝까지 실행해 반환값(경로)을 얻음"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class PlanTask:
+    """여러 프레임에 나눠 실행하는 계획 작업
+    
+    steps는 일정량의 작업마다 yield하는 제너레이터로, 트리/오픈셋은 그 안에 유지된다.
+    advance(deadline)로 시간만큼 진행하고, 끝나기 전에도 partial()로 부분 경로를 얻을 수 있다.
+    """
+    
+    def __init__(self, steps, planner, start, goal, nav, partial=None):
+        """
+        Args:
+            steps: 계획 제너레이터
+            planner: 계획 중인 플래너 (결과와 함께 반환, 시각화용)
+            start, goal: (gx, gy) 계획 당시의 시작/목표
+            nav: 계획에 사용하는 NavGrid (맵 버전 확인용)
+            partial: 중간 결과를 돌려주는 함수 () -> path (None이면 빈 경로)
+        """
+        self.steps = steps
+        self.planner = planner
+        self.start = start
+        self.goal = goal
+        self.nav = nav
+        self.partial_fn = partial
+        self.path = None
+        self.slices = 0  # 실행된 프레임 수
+    
+    def advance(self, deadline):
+        """
+        deadline(time.perf_counter 기준)까지 진행 (최소 한 단위는 실행)
+        
+        Returns:
+            bool: 계획이 끝났는지
+        """
+        if self.path is not None:
+            return True
+        
+        self.slices += 1
+        try:
+            next(self.steps)
+            while time.perf_counter() < deadline:
+                next(self.steps)
+        except StopIteration as stop:
+            self.path = stop.value
+        return self.path is not None
+    
+    def done(self):
+        return self.path is not None
+    
+    def partial(self):
+        """지금까지의 가장 좋은 경로 (끝났으면 최종 경로)"""
+        if self.path is not None:
+            return self.path
+        return self.partial_fn() if self.partial_fn is not None else []
+    
+    def result(self):
+        """(path, planner) - PlanJob과 같은 형식"""
+        return self.partial(), self.planner
+    
+    def is_stale(self, map_version, goal, max_drift=PLANNING_STALE_TILES):
+        """맵이 바뀌었거나 목표가 너무 멀리 움직였으면 오래된 결과"""
+        if self.nav.map_version != map_version:
+            return True
+        return max(abs(self.goal[0] - goal[0]), abs(self.goal[1] - goal[1])) > max_drift
+
+
+def roll_out(step, start, goal, max_steps=500, max_stall=10):
+    """
+    한 스텝씩 계획하는 플래너를 목표까지 반복 실행해 전체 경로로 변환
+    
+    Args:
+        step: (current, goal) -> 다음 그리드 위치
+        start: (gx, gy) 시작
+        goal: (gx, gy) 목표
+        max_steps: 최대 스텝 수
+        max_stall: 제자리 스텝이 이만큼 연속되면 포기
+    
+    Returns:
+        [(gx, gy), ...] 목표에 도달하면 경로, 아니면 빈 리스트
+    """
+    path = [start]
+    current = start
+    stalled = 0
+    
+    for _ in range(max_steps):
+        if current == goal:
+            return path
+        
+        next_pos = step(current, goal)
+        if next_pos != current:
+            path.append(next_pos)
+            current = next_pos
+            stalled = 0
+        else:
+            # 상태만 바꾸는 스텝은 허용하되, 계속 제자리면 실패로 간주
+            stalled += 1
+            if stalled > max_stall:
+                break
+    
+    return path if current == goal else []
@@ -7,11 +7,18 @@ import numpy as np
 import random
 import math
 from collections import defaultdict
-from game.grid import is_valid_grid, is_walkable, line_of_sight, distance_grid
+from game.grid import (
+    is_valid_grid, is_walkable, segment_clear, distance_grid, walkable_mask, path_blocked_by
+)
+from algos.planner import Planner, run_steps, graph_a_star
 
 
-class PRMPlanner:
-    """Probabilistic Roadmap 플래너"""
+class PRMPlanner(Planner):
+    """Probabilistic Roadmap 플래너
+    
+    로드맵은 고정 벽 레이어(Level.static_map)로 한 번 만들고, 경로 질의 때 받은 맵에서
+    새로 막힌 타일(임시 장벽)에 걸리는 노드/엣지만 건너뛴다. 맵이 바뀌어도 재구축하지 않음.
+    """
     
     def __init__(self, num_samples=150, connection_radius=8.0, max_neighbors=8):
         self.num_samples = num_samples
@@ -22,11 +29,18 @@ class PRMPlanner:
         self.nodes = []  # 샘플링된 노드들 (gx, gy)
         self.graph = defaultdict(list)  # 인접 리스트
         self.is_built = False
+        self.walkable = None  # 로드맵을 만든 맵의 이동 가능 마스크 (오버레이 비교용)
     
     def build_roadmap(self, grid_map):
         """로드맵 구축 (맵 로딩 시 한 번만)"""
+        run_steps(self.build_roadmap_steps(grid_map))
+    
+    def build_roadmap_steps(self, grid_map):
+        """로드맵 구축 제너레이터 (노드 하나를 연결할 때마다 yield)"""
         self.nodes = []
         self.graph = defaultdict(list)
+        self.is_built = False
+        self.walkable = walkable_mask(grid_map)
         
         height, width = grid_map.shape
         
@@ -45,6 +59,8 @@ class PRMPlanner:
         
         # 2. 노드 연결 (k-nearest neighbors)
         for i, node in enumerate(self.nodes):
+            yield
+            
             # 거리 계산
             distances = []
             for j, other in enumerate(self.nodes):
@@ -60,87 +76,88 @@ class PRMPlanner:
             for dist, j in distances[:self.max_neighbors]:
                 other = self.nodes[j]
                 
-                # 장애물 충돌 검사
-                if line_of_sight(grid_map, node, other):
+                # 장애물 충돌 검사 (적이 그대로 따라갈 수 있는 구간만)
+                if segment_clear(grid_map, node, other):
                     self.graph[i].append(j)
                     self.graph[j].append(i)  # 양방향
         
         self.is_built = True
     
-    def find_nearest_node(self, pos):
-        """주어진 위치에 가장 가까운 노드 찾기"""
-        if not self.nodes:
-            return None
-        
-        min_dist = float('inf')
-        nearest = None
-        nearest_idx = None
-        
-        for i, node in enumerate(self.nodes):
-            dist = distance_grid(pos, node)
-            if dist < min_dist:
-                min_dist = dist
-                nearest = node
-                nearest_idx = i
-        
-        return nearest_idx, nearest
+    def blocked_tiles(self, grid_map):
+        """로드맵을 만들 때는 이동 가능했지만 grid_map에서는 막힌 타일들 (동적 오버레이)"""
+        walkable = walkable_mask(grid_map)
+        if self.walkable is None or walkable.shape != self.walkable.shape:
+            return set()
+        ys, xs = np.nonzero(self.walkable & ~walkable)
+        return set(zip(xs.tolist(), ys.tolist()))
     
-    def a_star(self, start_idx, goal_idx):
-        """A* 알고리즘으로 그래프에서 경로 찾기"""
+    def find_nearest_node(self, pos, blocked=(), grid_map=None):
+        """
+        주어진 위치에 가장 가까운 노드 찾기 (blocked 타일 위의 노드 제외)
+        
+        grid_map을 주면 가까운 max_neighbors개 중 pos에서 직선으로 갈 수 있는 노드를 우선
+        (없으면 가장 가까운 노드)
+        """
+        candidates = sorted((distance_grid(pos, node), i) for i, node in enumerate(self.nodes)
+                            if node not in blocked)
+        if not candidates:
+            return None, None
+        
+        if grid_map is not None:
+            for _, i in candidates[:self.max_neighbors]:
+                if segment_clear(grid_map, pos, self.nodes[i]):
+                    return i, self.nodes[i]
+        
+        nearest_idx = candidates[0][1]
+        return nearest_idx, self.nodes[nearest_idx]
+    
+    def a_star(self, start_idx, goal_idx, grid_map=None, blocked=()):
+        """
+        A* 알고리즘으로 그래프에서 경로 찾기
+        
+        Args:
+            grid_map, blocked: 주어지면 blocked 타일 근처를 지나는 엣지는 grid_map에서 시야를 다시 확인
+        """
         if start_idx is None or goal_idx is None:
             return []
         
-        from heapq import heappush, heappop
+        edge_ok = None
+        if blocked:
+            edge_ok = lambda a, b: not path_blocked_by(grid_map, [self.nodes[a], self.nodes[b]],
+                                                       blocked)
         
-        # 오픈/클로즈드 리스트
-        open_set = []
-        heappush(open_set, (0, start_idx))
-        
-        came_from = {}
-        g_score = {start_idx: 0}
-        f_score = {start_idx: distance_grid(self.nodes[start_idx], self.nodes[goal_idx])}
-        
-        while open_set:
-            _, current = heappop(open_set)
-            
-            if current == goal_idx:
-                # 경로 재구성
-                path = []
-                while current in came_from:
-                    path.append(self.nodes[current])
-                    current = came_from[current]
-                path.append(self.nodes[start_idx])
-                return list(reversed(path))
-            
-            for neighbor in self.graph[current]:
-                tentative_g = g_score[current] + distance_grid(
-                    self.nodes[current], self.nodes[neighbor]
-                )
-                
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + distance_grid(
-                        self.nodes[neighbor], self.nodes[goal_idx]
-                    )
-                    heappush(open_set, (f_score[neighbor], neighbor))
-        
-        return []  # 경로 없음
+        indices = graph_a_star(self.nodes, self.graph, start_idx, goal_idx, edge_ok)
+        return [self.nodes[i] for i in indices]
+    
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 경유점 경로 반환 (로드맵이 없으면 nav의 맵으로 구축)"""
+        return run_steps(self.plan_steps(start, goal, nav))
+    
+    def plan_steps(self, start, goal, nav):
+        """plan()의 제너레이터 형태 (로드맵 구축을 나눠 실행)"""
+        return (yield from self.plan_path_steps(start, goal, nav.grid_map))
     
     def plan_path(self, start_pos, goal_pos, grid_map):
         """전체 경로 계획"""
+        return run_steps(self.plan_path_steps(start_pos, goal_pos, grid_map))
+    
+    def plan_path_steps(self, start_pos, goal_pos, grid_map):
+        """경로 계획 제너레이터 (로드맵이 없으면 먼저 나눠서 구축)"""
         if not self.is_built:
-            self.build_roadmap(grid_map)
+            yield from self.build_roadmap_steps(grid_map)
+        
+        # 로드맵 이후 새로 막힌 타일 (임시 장벽)
+        blocked = self.blocked_tiles(grid_map)
         
         # 가장 가까운 노드 찾기
-        start_idx, _ = self.find_nearest_node(start_pos)
-        goal_idx, _ = self.find_nearest_node(goal_pos)
+        start_idx, _ = self.find_nearest_node(start_pos, blocked, grid_map)
+        goal_idx, _ = self.find_nearest_node(goal_pos, blocked, grid_map)
         
         if start_idx is None or goal_idx is None:
             return []
         
         # A* 실행
-        path = self.a_star(start_idx, goal_idx)
+        path = self.a_star(start_idx, goal_idx, grid_map, blocked)
         
         # 시작/끝 위치 추가
         if path:
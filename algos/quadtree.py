@@ -0,0 +1,234 @@
+"""
+사분 트리 자유 공간 분해
+맵을 고정 크기 블록으로 나누고 블록마다 사분 트리로 "완전히 빈 사각형" 셀을 만든 뒤,
+변을 맞댄 셀끼리 이은 셀 그래프에서 탐색 (넓은 빈 공간은 셀 하나로 줄어듦)
+"""
+
+import numpy as np
+from collections import defaultdict
+from algos.planner import Planner, NavGrid, graph_a_star
+from config import QUADTREE_BLOCK_SIZE
+
+
+class QuadtreePlanner(Planner):
+    """사분 트리 셀 그래프 플래너 (맵 변경 시 바뀐 타일이 속한 블록만 다시 분해)
+    
+    셀 그래프는 PRMPlanner와 같은 형태(nodes: 셀 대표 타일, graph: 인접 리스트)라
+    graph_a_star 같은 그래프 탐색에 그대로 넘길 수 있다.
+    셀은 모두 빈 볼록 사각형이므로 셀 안의 두 타일은 항상 직선으로 이어진다.
+    """
+    
+    pool = 'thread'  # 블록 분해는 numpy 누적합 위주
+    
+    def __init__(self, block_size=QUADTREE_BLOCK_SIZE):
+        """
+        Args:
+            block_size: 최상위 블록 한 변의 타일 수 (셀 최대 크기, 2의 거듭제곱)
+        """
+        self.block_size = block_size
+        
+        self.walkable = None
+        self.map_version = None
+        self.radius = 0  # 분해한 NavGrid의 팽창 반지름 (같은 맵 버전의 팽창/원본 레이어 구분)
+        self.cell_at = None  # 타일 -> 셀 id (-1은 막힌 타일)
+        self.nodes = []  # 셀 id -> 대표 타일 (셀 중앙, 지운 셀은 None)
+        self.cells = []  # 셀 id -> (x0, y0, x1, y1), x1/y1은 미포함
+        self.graph = defaultdict(list)  # 셀 id -> 변을 맞댄 셀 id들
+        self.blocks = {}  # (bx, by) -> [셀 id, ...]
+        self._free_ids = []
+        
+        # 통계
+        self.free_tiles = 0
+        self.blocks_rebuilt = 0  # 마지막 동기화에서 다시 분해한 블록 수
+    
+    @property
+    def num_cells(self):
+        return len(self.cells) - len(self._free_ids)
+    
+    @property
+    def compression(self):
+        """빈 타일 수 / 셀 수 (탐색 노드가 타일 탐색 대비 몇 분의 일인지)"""
+        return self.free_tiles / max(1, self.num_cells)
+    
+    def sync(self, nav):
+        """nav의 맵 버전에 맞춰 셀 그래프 갱신 (바뀐 블록만)"""
+        size = self.block_size
+        if self.walkable is not None and self.walkable.shape == nav.walkable.shape:
+            if (nav.map_version is not None and nav.map_version == self.map_version and
+                    nav.radius == self.radius):
+                return
+            changed = np.nonzero(nav.walkable != self.walkable)
+            dirty = {(int(x) // size, int(y) // size) for y, x in zip(*changed)}
+        else:
+            height, width = nav.walkable.shape
+            self.cell_at = np.full((height, width), -1, dtype=np.int32)
+            self.nodes = []
+            self.cells = []
+            self.graph = defaultdict(list)
+            self.blocks = {}
+            self._free_ids = []
+            dirty = {(bx, by) for by in range(-(-height // size)) for bx in range(-(-width // size))}
+        
+        self.walkable = nav.walkable.copy()
+        self.map_version = nav.map_version
+        self.radius = nav.radius
+        self.free_tiles = int(np.count_nonzero(self.walkable))
+        if dirty:
+            self._rebuild(dirty)
+        self.blocks_rebuilt = len(dirty)
+    
+    def _rebuild(self, dirty):
+        """dirty 블록의 셀을 지우고 다시 분해한 뒤, 새 셀을 주변 셀과 연결"""
+        for key in dirty:
+            for cid in self.blocks.pop(key, []):
+                self._remove_cell(cid)
+        
+        added = []
+        for key in dirty:
+            cells = self._decompose(key)
+            self.blocks[key] = cells
+            added.extend(cells)
+        
+        for cid in added:
+            self._connect(cid)
+    
+    def _decompose(self, key):
+        """블록 하나를 사분 트리로 나눠 완전히 빈 사각형 셀 생성"""
+        size = self.block_size
+        height, width = self.walkable.shape
+        bx0, by0 = key[0] * size, key[1] * size
+        bx1, by1 = min(bx0 + size, width), min(by0 + size, height)
+        
+        # 막힌 타일 누적합 (영역 안 막힌 타일 수를 O(1)로)
+        blocked = np.zeros((by1 - by0 + 1, bx1 - bx0 + 1), dtype=np.int32)
+        blocked[1:, 1:] = (~self.walkable[by0:by1, bx0:bx1]).cumsum(0).cumsum(1)
+        
+        cells = []
+        stack = [(bx0, by0, size)]
+        while stack:
+            x0, y0, span = stack.pop()
+            x1, y1 = min(x0 + span, bx1), min(y0 + span, by1)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            
+            lx0, ly0, lx1, ly1 = x0 - bx0, y0 - by0, x1 - bx0, y1 - by0
+            count = blocked[ly1, lx1] - blocked[ly0, lx1] - blocked[ly1, lx0] + blocked[ly0, lx0]
+            if count == 0:
+                cells.append(self._add_cell((x0, y0, x1, y1)))
+            elif count < (x1 - x0) * (y1 - y0):
+                half = span // 2
+                stack.extend([(x0, y0, half), (x0 + half, y0, half),
+                              (x0, y0 + half, half), (x0 + half, y0 + half, half)])
+        return cells
+    
+    def _add_cell(self, rect):
+        x0, y0, x1, y1 = rect
+        if self._free_ids:
+            cid = self._free_ids.pop()
+            self.cells[cid] = rect
+            self.nodes[cid] = ((x0 + x1 - 1) // 2, (y0 + y1 - 1) // 2)
+        else:
+            cid = len(self.cells)
+            self.cells.append(rect)
+            self.nodes.append(((x0 + x1 - 1) // 2, (y0 + y1 - 1) // 2))
+        self.cell_at[y0:y1, x0:x1] = cid
+        return cid
+    
+    def _remove_cell(self, cid):
+        x0, y0, x1, y1 = self.cells[cid]
+        self.cell_at[y0:y1, x0:x1] = -1
+        for other in self.graph.pop(cid, []):
+            neighbors = self.graph.get(other)
+            if neighbors is not None and cid in neighbors:
+                neighbors.remove(cid)
+        self.cells[cid] = None
+        self.nodes[cid] = None
+        self._free_ids.append(cid)
+    
+    def _connect(self, cid):
+        """셀의 네 변 바로 바깥 타일들이 속한 셀과 양방향 연결"""
+        x0, y0, x1, y1 = self.cells[cid]
+        height, width = self.cell_at.shape
+        outside = []
+        if x0 > 0:
+            outside.append(self.cell_at[y0:y1, x0 - 1])
+        if x1 < width:
+            outside.append(self.cell_at[y0:y1, x1])
+        if y0 > 0:
+            outside.append(self.cell_at[y0 - 1, x0:x1])
+        if y1 < height:
+            outside.append(self.cell_at[y1, x0:x1])
+        if not outside:
+            return
+        
+        neighbors = self.graph[cid]
+        for other in np.unique(np.concatenate(outside)).tolist():
+            if other >= 0 and other not in neighbors:
+                neighbors.append(other)
+                self.graph[other].append(cid)
+    
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 셀 그래프 탐색 후 셀 사이 경계를 지나는 경유점 경로"""
+        if not nav.is_walkable(*start) or not nav.is_walkable(*goal):
+            return []
+        if start == goal:
+            return [start]
+        
+        self.sync(nav)
+        start_cell = int(self.cell_at[start[1], start[0]])
+        goal_cell = int(self.cell_at[goal[1], goal[0]])
+        if start_cell == goal_cell:
+            return [start, goal]
+        
+        cells = graph_a_star(self.nodes, self.graph, start_cell, goal_cell)
+        if not cells:
+            return []
+        return self._refine(cells, start, goal)
+    
+    def _refine(self, cells, start, goal):
+        """셀 경로 -> 경유점 경로 (이웃 셀마다 경계를 건너는 인접 타일 두 개, 셀 안은 직선)"""
+        path = [start]
+        point = start
+        for a, b in zip(cells, cells[1:]):
+            exit_tile, entry_tile = _portal(self.cells[a], self.cells[b], point)
+            if exit_tile != path[-1]:
+                path.append(exit_tile)
+            path.append(entry_tile)
+            point = entry_tile
+        if goal != path[-1]:
+            path.append(goal)
+        return path
+    
+    def get_graph_for_visualization(self):
+        """시각화용 그래프 데이터 (PRMPlanner와 같은 형식)"""
+        nodes = [node for node in self.nodes if node is not None]
+        edges = [(self.nodes[a], self.nodes[b])
+                 for a, neighbors in self.graph.items() for b in neighbors if a < b]
+        return nodes, edges
+
+
+def _portal(a, b, point):
+    """
+    변을 맞댄 셀 a -> b로 건너는 타일 쌍 (a 쪽 타일, b 쪽 타일)
+    
+    공유 변 위에서 point와 가장 가까운 위치를 고르므로 직진 방향이면 꺾이지 않음
+    """
+    ax0, ay0, ax1, ay1 = a
+    bx0, by0, bx1, by1 = b
+    if bx0 == ax1 or bx1 == ax0:
+        y = min(max(point[1], max(ay0, by0)), min(ay1, by1) - 1)
+        if bx0 == ax1:
+            return (ax1 - 1, y), (bx0, y)
+        return (ax0, y), (bx1 - 1, y)
+    x = min(max(point[0], max(ax0, bx0)), min(ax1, bx1) - 1)
+    if by0 == ay1:
+        return (x, ay1 - 1), (x, by0)
+    return (x, ay0), (x, by1 - 1)
+
+
+def build_quadtree(static_map):
+    """고정 벽 레이어로 분해한 QuadtreePlanner (Level.static_data로 스테이지에서 공유,
+    임시 장벽은 질의 때 sync로 해당 블록만 반영)"""
+    planner = QuadtreePlanner()
+    planner.sync(NavGrid(static_map))
+    return planner
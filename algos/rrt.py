@@ -6,10 +6,11 @@ RRT (Rapidly-exploring Random Tree) 알고리즘
 import numpy as np
 import random
 import math
-from game.grid import is_valid_grid, is_walkable, line_of_sight, distance_grid
+from game.grid import is_valid_grid, is_walkable, segment_clear, distance_grid
+from algos.planner import Planner, run_steps
 
 
-class RRTPlanner:
+class RRTPlanner(Planner):
     """RRT 플래너"""
     
     def __init__(self, max_iterations=500, step_size=2.0, goal_sample_rate=0.15):
@@ -23,8 +24,27 @@ class RRTPlanner:
         self.start_idx = None
         self.goal_idx = None
     
+    def plan(self, start, goal, nav):
+        """공통 인터페이스: 목표까지 연결된 경유점 경로 (목표에 못 닿으면 [])"""
+        return run_steps(self.plan_steps(start, goal, nav))
+    
+    def plan_steps(self, start, goal, nav):
+        """plan()의 제너레이터 형태 (반복마다 yield)"""
+        path = yield from self.plan_path_steps(start, goal, nav.grid_map)
+        if path and path[-1] == goal:
+            return path
+        return []
+    
     def plan_path(self, start_pos, goal_pos, grid_map):
         """RRT 경로 계획"""
+        return run_steps(self.plan_path_steps(start_pos, goal_pos, grid_map))
+    
+    def plan_path_steps(self, start_pos, goal_pos, grid_map):
+        """
+        RRT 경로 계획 제너레이터 (반복 한 번마다 yield, 트리는 self.nodes에 유지)
+        
+        중간에 멈춰도 partial_path(goal_pos)로 목표에 가장 가까운 노드까지의 경로를 얻을 수 있다.
+        """
         # 트리 초기화
         self.nodes = [start_pos]
         self.parents = [-1]  # 루트는 부모 없음
@@ -35,6 +55,8 @@ class RRTPlanner:
         
         # RRT 메인 루프
         for i in range(self.max_iterations):
+            yield
+            
             # 1. 랜덤 샘플링 (goal-biased)
             if random.random() < self.goal_sample_rate:
                 random_point = goal_pos
@@ -55,7 +77,7 @@ class RRTPlanner:
             if not is_walkable(grid_map, new_node[0], new_node[1]):
                 continue
             
-            if not line_of_sight(grid_map, nearest_node, new_node):
+            if not segment_clear(grid_map, nearest_node, new_node):
                 continue
             
             # 5. 트리에 추가
@@ -66,7 +88,7 @@ class RRTPlanner:
             # 6. 목표 도달 체크
             if distance_grid(new_node, goal_pos) < self.step_size * 2:
                 # 목표까지 직접 연결 시도
-                if line_of_sight(grid_map, new_node, goal_pos):
+                if segment_clear(grid_map, new_node, goal_pos):
                     goal_idx = len(self.nodes)
                     self.nodes.append(goal_pos)
                     self.parents.append(new_idx)
@@ -78,6 +100,12 @@ class RRTPlanner:
             return self._extract_path()
         
         # 목표에 도달하지 못했다면, 가장 가까운 노드까지의 경로
+        return self.partial_path(goal_pos)
+    
+    def partial_path(self, goal_pos):
+        """지금까지의 트리에서 목표에 가장 가까운 노드까지의 경로"""
+        if self.goal_idx is not None:
+            return self._extract_path()
         closest_idx = self._find_nearest(goal_pos)
         return self._extract_path_to(closest_idx)
     
@@ -0,0 +1,190 @@
+"""
+거리 센서 시뮬레이션 (벡터화 레이 캐스팅)
+타일 중심에서 K개의 광선을 한 번의 DDA 패스로 쏘아 벽까지의 거리를 측정
+"""
+
+import math
+from collections import OrderedDict
+import numpy as np
+from game.grid import walkable_mask
+
+
+class Scan:
+    """한 위치에서의 거리 스캔 결과
+    
+    distances[i]: i번째 광선이 벽에 닿은 거리 (타일 단위, 닿지 않으면 max_range)
+    hit_tiles[i]: 닿은 벽 타일 (gx, gy), 닿지 않았으면 (-1, -1)
+    """
+    
+    def __init__(self, origin, angles, distances, hit_tiles, max_range):
+        self.origin = origin
+        self.angles = angles
+        self.distances = distances
+        self.hit_tiles = hit_tiles
+        self.max_range = max_range
+        self.dir_x = np.cos(angles)
+        self.dir_y = np.sin(angles)
+    
+    def __len__(self):
+        return len(self.angles)
+    
+    def points_at(self, indices, distances):
+        """광선 indices를 따라 distances만큼 간 지점의 타일 (N, 2) 배열"""
+        ox = self.origin[0] + 0.5
+        oy = self.origin[1] + 0.5
+        xs = np.floor(ox + self.dir_x[indices] * distances).astype(int)
+        ys = np.floor(oy + self.dir_y[indices] * distances).astype(int)
+        return np.stack([xs, ys], axis=1)
+    
+    def discontinuities(self, threshold=1.5):
+        """이웃 광선 사이 거리가 급변하는 지점 (장애물 모서리 바로 바깥의 빈 타일)
+        
+        먼 쪽 광선을 따라 가까운 쪽 거리보다 반 칸 더 간 지점을 반환한다.
+        """
+        d = self.distances
+        d_next = np.roll(d, -1)
+        idx = np.nonzero(np.abs(d - d_next) > threshold)[0]
+        if len(idx) == 0:
+            return np.zeros((0, 2), dtype=int)
+        
+        nxt = (idx + 1) % len(d)
+        near_d = np.minimum(d[idx], d[nxt])
+        far = np.where(d[idx] > d[nxt], idx, nxt)
+        
+        # 먼 광선은 모서리를 스쳐 지나가므로 그 위의 점은 비어 있음
+        reach = np.minimum(near_d + 0.5, self.distances[far] - 0.5)
+        points = self.points_at(far, reach)
+        origin = np.array(self.origin)
+        points = points[np.any(points != origin, axis=1)]
+        if len(points) == 0:
+            return points
+        return np.unique(points, axis=0)
+    
+    def can_see(self, target):
+        """target 타일이 스캔에서 보이는지 (가장 가까운 광선 기준)"""
+        dx = target[0] - self.origin[0]
+        dy = target[1] - self.origin[1]
+        if dx == 0 and dy == 0:
+            return True
+        
+        dist = math.hypot(dx, dy)
+        if dist > self.max_range:
+            return False
+        
+        angle = math.atan2(dy, dx) % (2 * math.pi)
+        i = int(round(angle / (2 * math.pi) * len(self.angles))) % len(self.angles)
+        # 타일 가장자리까지 닿으면 보이는 것으로 취급
+        return self.distances[i] >= dist - 0.5
+
+
+class RangeSensor:
+    """K개의 광선을 쏘는 거리 센서 (타일 위치 + 맵 버전별 스캔 캐시)"""
+    
+    def __init__(self, num_rays=180, max_range=10, cache_size=256):
+        """
+        Args:
+            num_rays: 광선 개수 (각도 해상도)
+            max_range: 최대 감지 거리 (타일)
+            cache_size: 캐시할 스캔 개수
+        """
+        self.num_rays = num_rays
+        self.max_range = max_range
+        self.cache_size = cache_size
+        self.angles = np.arange(num_rays) * (2 * math.pi / num_rays)
+        
+        self._cache = OrderedDict()
+        self._cache_map = None  # 캐시가 속한 맵 (맵이 바뀌면 비움)
+        
+        # 통계 (비용 측정용)
+        self.scans_cast = 0
+        self.cache_hits = 0
+    
+    def scan(self, grid_map, pos, map_version=None, walkable=None):
+        """
+        pos 타일 중심에서 스캔
+        
+        Args:
+            grid_map: 맵
+            pos: (gx, gy) 타일
+            map_version: 맵 버전 (None이면 캐시하지 않음)
+            walkable: 미리 계산된 walkable_mask (없으면 grid_map에서 계산)
+        
+        Returns:
+            Scan
+        """
+        if map_version is not None:
+            if self._cache_map is not grid_map:
+                self._cache.clear()
+                self._cache_map = grid_map
+            
+            key = (pos, map_version)
+            scan = self._cache.get(key)
+            if scan is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return scan
+        
+        if walkable is None:
+            walkable = walkable_mask(grid_map)
+        scan = self._cast(walkable, pos)
+        self.scans_cast += 1
+        
+        if map_version is not None:
+            self._cache[(pos, map_version)] = scan
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return scan
+    
+    def _cast(self, walkable, pos):
+        """모든 광선을 동시에 진행시키는 DDA (Amanatides-Woo)"""
+        height, width = walkable.shape
+        gx, gy = pos
+        k = self.num_rays
+        
+        dir_x = np.cos(self.angles)
+        dir_y = np.sin(self.angles)
+        step_x = np.where(dir_x >= 0, 1, -1)
+        step_y = np.where(dir_y >= 0, 1, -1)
+        
+        with np.errstate(divide='ignore'):
+            delta_x = np.abs(1.0 / dir_x)
+            delta_y = np.abs(1.0 / dir_y)
+        
+        # 타일 중심에서 출발하므로 첫 경계까지는 반 칸
+        t_max_x = 0.5 * delta_x
+        t_max_y = 0.5 * delta_y
+        
+        cell_x = np.full(k, gx, dtype=int)
+        cell_y = np.full(k, gy, dtype=int)
+        distances = np.full(k, float(self.max_range))
+        hit_tiles = np.full((k, 2), -1, dtype=int)
+        active = np.ones(k, dtype=bool)
+        
+        # 한 스텝에 x 또는 y 경계를 하나 넘으므로 최대 2 * max_range + 2 스텝
+        for _ in range(2 * int(math.ceil(self.max_range)) + 2):
+            move_x = t_max_x < t_max_y
+            t = np.where(move_x, t_max_x, t_max_y)
+            
+            # 최대 거리를 넘어가면 종료 (감지 없음)
+            active &= t <= self.max_range
+            if not active.any():
+                break
+            
+            cell_x = np.where(active & move_x, cell_x + step_x, cell_x)
+            cell_y = np.where(active & ~move_x, cell_y + step_y, cell_y)
+            t_max_x = np.where(active & move_x, t_max_x + delta_x, t_max_x)
+            t_max_y = np.where(active & ~move_x, t_max_y + delta_y, t_max_y)
+            
+            # 맵 밖은 벽으로 취급
+            inside = (cell_x >= 0) & (cell_x < width) & (cell_y >= 0) & (cell_y < height)
+            blocked = ~inside
+            blocked[inside] = ~walkable[cell_y[inside], cell_x[inside]]
+            hit = active & blocked
+            
+            distances[hit] = t[hit]
+            hit_tiles[hit, 0] = cell_x[hit]
+            hit_tiles[hit, 1] = cell_y[hit]
+            active &= ~hit
+        
+        return Scan(pos, self.angles, distances, hit_tiles, self.max_range)
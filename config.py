@@ -8,9 +8,13 @@ SCREEN_HEIGHT = 720
 FPS = 60
 TILE_SIZE = 32
 
-# 그리드 설정
-GRID_WIDTH = SCREEN_WIDTH // TILE_SIZE  # 40
-GRID_HEIGHT = SCREEN_HEIGHT // TILE_SIZE  # 22
+# 그리드 설정 (맵 크기는 화면과 무관, 화면보다 크면 카메라가 스크롤)
+GRID_WIDTH = 40  # 기본 맵 크기 (스테이지 1~6)
+GRID_HEIGHT = 22
+RANDOM_MAP_WIDTH = 80  # 스테이지 7+ 절차적 맵 크기
+RANDOM_MAP_HEIGHT = 44
+RENDER_CHUNK_TILES = 16  # 고정 벽을 미리 그려 두는 청크 한 변의 타일 수
+TILE_CHUNK_SIZE = 32  # 동적 타일 저장소 청크 한 변의 타일 수 (청크 단위로 할당/버전 관리)
 
 # 색상 정의
 COLOR_BLACK = (0, 0, 0)
@@ -59,6 +63,9 @@ ENEMY_PRM_SPEED = 110  # +10
 ENEMY_RRT_SPEED = 105  # +10
 ENEMY_EST_SPEED = 95  # +10
 ENEMY_BELIEF_SPEED = 100  # +10
+ENEMY_MIN_SPEED = min(ENEMY_BUG1_SPEED, ENEMY_BUG2_SPEED, ENEMY_TANGENT_SPEED, ENEMY_APF_SPEED,
+                      ENEMY_PRM_SPEED, ENEMY_RRT_SPEED, ENEMY_EST_SPEED, ENEMY_BELIEF_SPEED)
+ENEMY_FALLBACK_DURATION = 2.0  # 갇힌 적이 JPS 대체 경로를 따라가는 최대 시간 (초)
 
 # 적 색상 (알고리즘별 구분)
 COLOR_BUG1 = (200, 100, 100)  # 연한 빨강
@@ -70,6 +77,49 @@ COLOR_RRT = (100, 200, 255)  # 하늘색
 COLOR_EST = (100, 255, 200)  # 청록
 COLOR_BELIEF = (140, 120, 180)  # 부드러운 청보라
 
+# Tangent Bug 파라미터
+TANGENT_SENSOR_RANGE = 12  # 센서 범위 (타일, 볼록 모서리 인덱스 덕분에 10에서 상향)
+TANGENT_SENSOR_RAYS = 0  # > 0이면 거리 센서 스캔의 불연속점을 접선 후보로 사용 (0 = 볼록 모서리 인덱스)
+
+# 시야(FOV) 캐시
+FOV_CACHE_BYTES = 4 * 1024 * 1024  # 맵/반경마다 캐시하는 시야 마스크의 총 크기 (마스크 하나 = 맵 타일 수 바이트)
+
+# HPA* 파라미터 (큰 맵용 계층적 경로 탐색)
+HPA_CLUSTER_SIZE = 16  # 클러스터 한 변의 타일 수
+HPA_ENTRANCE_SPLIT = 6  # 경계의 열린 구간이 이 길이 이상이면 입구 2개
+HPA_MIN_MAP_TILES = 4096  # 맵 타일 수가 이 이상이면 대체 경로에 HPA* 사용 (64x64)
+
+# 사분 트리 자유 공간 분해 (넓은 빈 공간이 많은 맵의 대체 경로)
+QUADTREE_BLOCK_SIZE = 16  # 최상위 블록(셀 최대 크기) 한 변의 타일 수 (2의 거듭제곱)
+QUADTREE_MIN_COMPRESSION = 8.0  # 빈 타일 수 / 셀 수가 이 이상인 열린 맵이면 대체 경로에 사용
+
+# 경로 질의 캐시 (적들이 공유)
+PATH_CACHE_SIZE = 256  # 최대 캐시 경로 수 (메모리 상한)
+MAP_JOURNAL_SIZE = 512  # 보관하는 맵 변경 기록 수 (더 오래된 버전 이후 변경은 알 수 없음)
+
+# 재계획 스케줄러 (여러 적의 재계획이 한 프레임에 몰리지 않게 분산)
+REPLAN_BUDGET_MS = 4.0  # 프레임당 재계획에 쓸 시간 예산 (ms)
+REPLAN_AGING = 2.0  # 미뤄진 프레임마다 더하는 우선순위 (공정한 순환)
+REPLAN_DISTANCE_CAP = 20  # 우선순위에서 빼는 플레이어 거리(타일) 상한
+REPLAN_STALE_TIME = 3.0  # 이벤트가 없어도 이 시간(초)이 지나면 재계획 (놓친 변화 대비)
+PLAYER_MOVE_EVENT_TILES = 2  # 플레이어가 이 타일 수만큼 움직일 때마다 'moved' 이벤트
+REPLAN_GOAL_DRIFT = 0.25  # 경로 끝과 플레이어가 (적-플레이어 거리 * 이 비율) 이상 벌어지면 재계획
+
+# 협력 경로 탐색 (WHCA*, 적들이 시공간 예약표를 공유해 같은 타일에 겹치지 않게)
+COOPERATIVE_PATHFINDING = False  # True면 대체 경로를 예약표를 피하는 짧은 창 단위로 계획
+WHCA_WINDOW = 8  # 적마다 예약/탐색하는 스텝 수 (창 크기, 적 수가 늘어도 적당 비용 고정)
+WHCA_STEP_MARGIN = 1.25  # 가장 느린 적이 대각선 한 칸을 가는 시간에 곱하는 여유 (타일 중심에서 벗어난 출발 등)
+# 한 스텝(타일 하나 이동 또는 대기)의 시간 (초, 가장 느린 적도 대각선 한 칸을 갈 수 있게)
+WHCA_STEP_TIME = WHCA_STEP_MARGIN * TILE_SIZE * 2 ** 0.5 / ENEMY_MIN_SPEED
+WHCA_MAX_EXPANSIONS = 300  # 적 하나의 창 탐색에서 확장하는 최대 노드 수
+WHCA_DISTANCE_CACHE = 8  # 보관하는 목표별 실제 거리 탐색 수 (휴리스틱, 적들이 공유)
+WHCA_HEURISTIC_EXPANSIONS = 400  # 계획 한 번에 실제 거리 탐색을 이어 가는 최대 타일 수 (나머지는 옥타일 거리)
+
+# 백그라운드 경로 계획 (PRM/RRT 계획을 메인 스레드 밖에서 실행)
+PLANNING_BACKGROUND = False  # True면 결과가 올 때까지 기존 경로를 따라가며 워커에서 계획
+PLANNING_WORKERS = 2  # 풀마다 워커 수
+PLANNING_STALE_TILES = 3  # 결과 도착 시 목표가 이 타일 수보다 많이 움직였으면 버림
+
 # APF 파라미터 (더 공격적)
 APF_ATTRACT_GAIN = 1.2  # 증가
 APF_REPULSE_GAIN = 90.0  # 감소 (장애물 회피력 약화)
@@ -89,13 +139,25 @@ RRT_GOAL_SAMPLE_RATE = 0.1
 BELIEF_GRID_RESOLUTION = 4  # 그리드를 n배로 축소
 BELIEF_SENSOR_RANGE = 300.0
 BELIEF_SENSOR_NOISE = 40.0
+BELIEF_SENSOR_RAYS = 180  # 시야 판정용 거리 센서 광선 개수
 BELIEF_MOTION_NOISE = 20.0
+BELIEF_TRACKER = 'grid'  # 'grid' (히스토그램), 'particle' (파티클), 'kalman' (칼만 + Belief 대체)
+BELIEF_NUM_PARTICLES = 400  # 파티클 필터 사용 시 파티클 개수 (비용 조절)
+BELIEF_KALMAN_FALLBACK = 'grid'  # 칼만 모드에서 시야 상실/노이즈 시 사용할 Belief ('grid' 또는 'particle')
+BELIEF_KALMAN_PROCESS_NOISE = 300.0  # 칼만 가속도 노이즈 (pixels/s^2)
+BELIEF_SHARED_TEAM = True  # 여러 Belief 적이 하나의 Belief를 공유 (예측 1회 + 측정 융합)
 
 # 게임플레이 설정
 STAGE_TIME_LIMIT = 150  # 초 (감소)
 KEYS_REQUIRED = 3
 COMBO_TIME_WINDOW = 2.0  # 콤보 인정 시간
 
+# 레벨 생성 설정
+LEVEL_SEED = None  # 정수면 (스테이지, 시드)마다 같은 맵 (None이면 매번 다름)
+KEY_MIN_SPAWN_DIST = 10  # 열쇠와 스폰 사이 최소 맨해튼 거리
+KEY_MIN_SPACING = 6  # 열쇠끼리 최소 맨해튼 거리
+LEVEL_DIR = 'levels'  # stage<N>.lvl 파일이 있으면 코드 생성 대신 사용 (python -m game.levelfile로 내보내기)
+
 # UI 설정
 HUD_MARGIN = 10
 HUD_FONT_SIZE = 24
@@ -0,0 +1,102 @@
+"""
+스크롤 카메라
+플레이어를 따라가며 맵 경계에서 멈추고, 화면에 보이는 영역만 그리도록 판정을 제공
+"""
+
+import pygame
+from config import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, RENDER_CHUNK_TILES, COLOR_DARK_GRAY, DEBUG_SHOW_GRID
+)
+
+
+class Camera:
+    """월드 좌표 (x, y)가 화면 왼쪽 위에 오는 카메라"""
+    
+    def __init__(self, view_width=SCREEN_WIDTH, view_height=SCREEN_HEIGHT):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.x = 0
+        self.y = 0
+    
+    @property
+    def offset(self):
+        """draw(surface, camera_offset)에 넘기는 오프셋"""
+        return (self.x, self.y)
+    
+    def follow(self, target_x, target_y, world_width, world_height):
+        """
+        대상을 화면 중앙에 두되 맵 밖이 보이지 않도록 제한
+        
+        맵이 화면보다 작은 축은 맵을 화면 가운데에 둔다.
+        """
+        self.x = self._clamp(target_x - self.view_width // 2, world_width, self.view_width)
+        self.y = self._clamp(target_y - self.view_height // 2, world_height, self.view_height)
+    
+    def _clamp(self, value, world_size, view_size):
+        if world_size <= view_size:
+            return (world_size - view_size) // 2
+        return max(0, min(value, world_size - view_size))
+    
+    def is_visible(self, x, y, margin=0):
+        """월드 좌표 (x, y)가 화면(+ margin) 안에 있는지"""
+        return (self.x - margin <= x <= self.x + self.view_width + margin and
+                self.y - margin <= y <= self.y + self.view_height + margin)
+    
+    def visible_tiles(self, width, height):
+        """
+        화면에 걸치는 타일 범위 (맵 크기로 잘림)
+        
+        Returns:
+            (gx0, gy0, gx1, gy1), gx1/gy1은 포함하지 않음
+        """
+        gx0 = max(0, int(self.x // TILE_SIZE))
+        gy0 = max(0, int(self.y // TILE_SIZE))
+        gx1 = min(width, int((self.x + self.view_width) // TILE_SIZE) + 1)
+        gy1 = min(height, int((self.y + self.view_height) // TILE_SIZE) + 1)
+        return gx0, gy0, gx1, gy1
+
+
+class StaticTileRenderer:
+    """고정 벽 레이어를 청크 단위 서페이스로 캐시해서 보이는 청크만 blit
+    
+    고정 벽은 스테이지 동안 바뀌지 않으므로 청크는 처음 보일 때 한 번만 그린다.
+    """
+    
+    def __init__(self, static_map, chunk_tiles=RENDER_CHUNK_TILES, color=COLOR_DARK_GRAY):
+        self.static_map = static_map
+        self.chunk_tiles = chunk_tiles
+        self.color = color
+        self._chunks = {}  # (cx, cy) -> Surface
+        
+        # 통계 (마지막 프레임에 그린 청크 수)
+        self.chunks_drawn = 0
+    
+    def draw(self, surface, camera):
+        height, width = self.static_map.shape
+        gx0, gy0, gx1, gy1 = camera.visible_tiles(width, height)
+        size = self.chunk_tiles
+        
+        self.chunks_drawn = 0
+        for cy in range(gy0 // size, (gy1 - 1) // size + 1):
+            for cx in range(gx0 // size, (gx1 - 1) // size + 1):
+                chunk = self._chunks.get((cx, cy))
+                if chunk is None:
+                    chunk = self._render_chunk(cx, cy)
+                    self._chunks[(cx, cy)] = chunk
+                surface.blit(chunk, (cx * size * TILE_SIZE - camera.x,
+                                     cy * size * TILE_SIZE - camera.y))
+                self.chunks_drawn += 1
+    
+    def _render_chunk(self, cx, cy):
+        """청크 하나의 벽 타일을 투명 서페이스에 그림"""
+        size = self.chunk_tiles
+        tiles = self.static_map[cy * size:(cy + 1) * size, cx * size:(cx + 1) * size]
+        chunk = pygame.Surface((size * TILE_SIZE, size * TILE_SIZE), pygame.SRCALPHA)
+        
+        for ty, tx in zip(*tiles.nonzero()):
+            rect = (int(tx) * TILE_SIZE, int(ty) * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            chunk.fill(self.color, rect)
+            # 그리드 선 (디버그)
+            if DEBUG_SHOW_GRID:
+                pygame.draw.rect(chunk, (80, 80, 80), rect, 1)
+        return chunk
@@ -0,0 +1,138 @@
+"""
+청크 단위 타일 저장소
+맵을 고정 크기 청크로 나눠 필요한 청크만 할당하고, 청크마다 버전을 붙여 바뀐 영역만 갱신할 수 있게 함
+"""
+
+import numpy as np
+from config import TILE_CHUNK_SIZE, TILE_EMPTY
+
+
+class ChunkedTileMap:
+    """지연 할당 청크 타일맵
+    
+    - 한 번도 쓰지 않았거나 모두 빈 칸인 청크는 할당하지 않고 공유 빈 청크를 읽는다
+      (메모리는 실제로 뭔가 있는 영역에 비례).
+    - 청크마다 마지막으로 바뀐 시점의 버전을 기록하므로 changed_chunks(since)로
+      그 이후 바뀐 청크만 골라 파생 데이터를 갱신할 수 있다.
+    """
+    
+    def __init__(self, width, height, chunk_size=TILE_CHUNK_SIZE, empty=TILE_EMPTY, dtype=np.uint8):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.empty = empty
+        self.dtype = np.dtype(dtype)
+        
+        # 할당되지 않은 청크가 대신 돌려주는 읽기 전용 빈 청크
+        self._empty_chunk = np.full((chunk_size, chunk_size), empty, dtype=self.dtype)
+        self._empty_chunk.setflags(write=False)
+        
+        self._chunks = {}  # (cx, cy) -> 배열
+        self._versions = {}  # (cx, cy) -> 마지막으로 바뀐 버전
+        
+        # 쓰기마다 증가
+        self.version = 0
+    
+    @classmethod
+    def from_dense(cls, array, chunk_size=TILE_CHUNK_SIZE, empty=TILE_EMPTY, dtype=np.uint8):
+        """2D 배열에서 만들기 (모두 빈 칸인 청크는 할당하지 않음)"""
+        height, width = array.shape
+        tiles = cls(width, height, chunk_size, empty, dtype)
+        occupied = np.asarray(array) != empty
+        for cy in range(tiles.chunks_y):
+            for cx in range(tiles.chunks_x):
+                x0, y0, x1, y1 = tiles.chunk_bounds(cx, cy)
+                if occupied[y0:y1, x0:x1].any():
+                    chunk = np.full((chunk_size, chunk_size), empty, dtype=tiles.dtype)
+                    chunk[:y1 - y0, :x1 - x0] = array[y0:y1, x0:x1]
+                    tiles._chunks[(cx, cy)] = chunk
+        return tiles
+    
+    @property
+    def chunks_x(self):
+        return -(-self.width // self.chunk_size)
+    
+    @property
+    def chunks_y(self):
+        return -(-self.height // self.chunk_size)
+    
+    @property
+    def nbytes(self):
+        """할당된 청크가 차지하는 바이트 (공유 빈 청크 제외)"""
+        return sum(chunk.nbytes for chunk in self._chunks.values())
+    
+    @property
+    def allocated_chunks(self):
+        return len(self._chunks)
+    
+    def chunk_bounds(self, cx, cy):
+        """청크가 덮는 타일 범위 (x0, y0, x1, y1), x1/y1은 포함하지 않음 (맵 크기로 잘림)"""
+        size = self.chunk_size
+        return (cx * size, cy * size,
+                min((cx + 1) * size, self.width), min((cy + 1) * size, self.height))
+    
+    def get(self, x, y):
+        """(x, y) 타일 값 (맵 밖이면 empty)"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return self.empty
+        size = self.chunk_size
+        chunk = self._chunks.get((x // size, y // size), self._empty_chunk)
+        return chunk[y % size, x % size]
+    
+    def set(self, x, y, value):
+        """
+        (x, y) 타일 값 쓰기
+        
+        Returns:
+            bool: 값이 실제로 바뀌었는지
+        """
+        size = self.chunk_size
+        key = (x // size, y // size)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            if value == self.empty:
+                return False
+            chunk = self._empty_chunk.copy()
+            self._chunks[key] = chunk
+        elif chunk[y % size, x % size] == value:
+            return False
+        
+        chunk[y % size, x % size] = value
+        self.version += 1
+        self._versions[key] = self.version
+        
+        # 모두 비었으면 해제 (공유 빈 청크로 되돌림)
+        if value == self.empty and not (chunk != self.empty).any():
+            del self._chunks[key]
+        return True
+    
+    def window(self, x0, y0, x1, y1):
+        """
+        [y0:y1, x0:x1] 영역의 연속 배열 (복사본, 맵 밖 부분은 empty)
+        
+        연속 메모리가 필요한 플래너/렌더러용 밀집 뷰
+        """
+        out = np.full((max(0, y1 - y0), max(0, x1 - x0)), self.empty, dtype=self.dtype)
+        size = self.chunk_size
+        for (cx, cy), chunk in self._chunks.items():
+            cx0, cy0 = cx * size, cy * size
+            ix0, iy0 = max(x0, cx0), max(y0, cy0)
+            ix1, iy1 = min(x1, cx0 + size), min(y1, cy0 + size)
+            if ix0 < ix1 and iy0 < iy1:
+                out[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0] = chunk[iy0 - cy0:iy1 - cy0, ix0 - cx0:ix1 - cx0]
+        return out
+    
+    def to_dense(self):
+        """맵 전체의 2D 배열"""
+        return self.window(0, 0, self.width, self.height)
+    
+    def chunk_version(self, cx, cy):
+        """청크가 마지막으로 바뀐 버전 (바뀐 적 없으면 0)"""
+        return self._versions.get((cx, cy), 0)
+    
+    def changed_chunks(self, since):
+        """since 버전 이후 바뀐 청크 좌표들 (해제된 청크 포함)"""
+        if since >= self.version:
+            return []
+        return [key for key, version in self._versions.items() if version > since]
+
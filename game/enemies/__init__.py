@@ -4,13 +4,51 @@
 
 import pygame
 import math
-from config import TILE_SIZE
-from game.grid import world_to_grid, distance_world
+from config import (
+    TILE_SIZE, ENEMY_FALLBACK_DURATION, HPA_MIN_MAP_TILES, QUADTREE_MIN_COMPRESSION,
+    REPLAN_STALE_TIME, REPLAN_GOAL_DRIFT, PLAYER_MOVE_EVENT_TILES
+)
+from game.grid import world_to_grid, distance_world, path_blocked_by
+from algos.astar import JPSPlanner
+from algos.hpa import get_hpa_planner
+from algos.quadtree import build_quadtree
+from algos.planner import PlanTask
+
+
+# 재계획 사유별 기본 우선순위 (스케줄러도 사용)
+REPLAN_PRIORITY = {
+    'periodic': 0,
+    'goal_moved': 5,
+    'blocked': 20,
+    'path_invalidated': 25,
+    'map_changed': 30
+}
+
+
+def visible_tile_bounds(surface, camera_offset, margin=1):
+    """화면에 걸치는 타일 범위 (gx0, gy0, gx1, gy1, 양 끝 포함, 디버그 오버레이 컬링용)"""
+    ox, oy = camera_offset
+    width, height = surface.get_size()
+    return (int(ox // TILE_SIZE) - margin, int(oy // TILE_SIZE) - margin,
+            int((ox + width) // TILE_SIZE) + margin, int((oy + height) // TILE_SIZE) + margin)
+
+
+def segment_in_bounds(p1, p2, bounds):
+    """두 그리드 좌표를 잇는 선분의 바운딩 박스가 bounds와 겹치는지"""
+    gx0, gy0, gx1, gy1 = bounds
+    return (min(p1[0], p2[0]) <= gx1 and max(p1[0], p2[0]) >= gx0 and
+            min(p1[1], p2[1]) <= gy1 and max(p1[1], p2[1]) >= gy0)
 
 
 class EnemyBase:
     """모든 적의 기반 클래스"""
     
+    # True면 주기 대신 레벨/플레이어 이벤트로 재계획 (listen으로 구독)
+    event_driven = False
+    
+    # 이름/상태 표시용 폰트 (모든 적이 공유, 처음 그릴 때 생성)
+    _font = None
+    
     def __init__(self, x, y, speed, color, name="Enemy"):
         self.x = x
         self.y = y
@@ -31,6 +69,25 @@ class EnemyBase:
         self.stuck_threshold = 2.0
         self.last_pos = (x, y)
         
+        # 갇혔을 때 사용하는 공통 대체 플래너 (JPS)
+        self.fallback_planner = JPSPlanner()
+        self.fallback_timer = 0
+        
+        # 재계획 스케줄러 (Game이 설정, None이면 요청 즉시 재계획)
+        self.scheduler = None
+        
+        # 백그라운드 계획 실행기 (Game이 설정, None이면 동기 계획)
+        self.executor = None
+        self.plan_job = None
+        self.plan_key = None
+        
+        # 협력 경로 플래너 (Game이 설정, 있으면 대체 경로를 예약표를 피하는 창 단위로 계획)
+        self.cooperative = None
+        self.path_step = 0  # 협력 경로 path[0]에 해당하는 예약표 스텝
+        
+        # 이벤트로 표시된 재계획 사유 (update에서 요청, 처음에는 경로가 없으므로 'blocked')
+        self.replan_reason = 'blocked'
+        
         # 통계
         self.distance_traveled = 0
     
@@ -38,6 +95,267 @@ class EnemyBase:
         """적 업데이트 (자식 클래스에서 구현)"""
         raise NotImplementedError
     
+    def request_replan(self, player, level, reason='periodic'):
+        """
+        경로 재계획 요청
+        
+        Args:
+            reason: REPLAN_PRIORITY의 키 ('periodic', 'goal_moved', 'blocked',
+                    'path_invalidated', 'map_changed')
+        """
+        if self.scheduler is None:
+            self.replan(player, level)
+        else:
+            self.scheduler.request(self, reason)
+    
+    def replan(self, player, level):
+        """경로 재계획 (주기적으로 재계획하는 적에서 구현)"""
+        raise NotImplementedError
+    
+    def listen(self, level, player):
+        """레벨/플레이어 이벤트 구독 (event_driven 적만, Game이 스폰 후 호출)"""
+        if not self.event_driven:
+            return
+        level.subscribe('tile_changed', self.on_tile_changed)
+        player.subscribe('moved', self.on_player_moved)
+    
+    def mark_replan(self, reason):
+        """다음 update에서 재계획 요청 (이미 표시돼 있으면 더 급한 사유로만 갱신)"""
+        if self.replan_reason is None or REPLAN_PRIORITY[reason] > REPLAN_PRIORITY[self.replan_reason]:
+            self.replan_reason = reason
+    
+    def on_tile_changed(self, level, tiles, blocked):
+        """타일 변경 이벤트: 새 벽이 남은 경로를 가로막을 때만 재계획"""
+        if blocked and self.path_blocked(level.grid_map, tiles):
+            self.mark_replan('path_invalidated')
+    
+    def on_player_moved(self, player, tile):
+        """플레이어 이동 이벤트: 경로 끝에서 충분히 멀어졌을 때만 재계획
+        
+        허용 거리는 적-플레이어 거리에 비례 (멀리 있는 적은 목표가 조금 움직여도 경로가 거의 같음)
+        """
+        if self.path_index >= len(self.path):
+            # 경로를 다 따라왔거나 없음 - 직접 추적 중이므로 새 경로 필요
+            self.mark_replan('goal_moved')
+            return
+        end = self.path[-1]
+        me = world_to_grid(self.x, self.y)
+        drift = max(abs(end[0] - tile[0]), abs(end[1] - tile[1]))
+        dist = max(abs(me[0] - tile[0]), abs(me[1] - tile[1]))
+        if drift >= max(PLAYER_MOVE_EVENT_TILES, dist * REPLAN_GOAL_DRIFT):
+            self.mark_replan('goal_moved')
+    
+    def path_blocked(self, grid_map, tiles):
+        """남은 경로 구간(현재 위치부터) 중 tiles 근처를 지나는 구간이 막혔는지 확인"""
+        if not self.path or self.path_index >= len(self.path):
+            return False
+        points = [world_to_grid(self.x, self.y)] + self.path[self.path_index:]
+        return path_blocked_by(grid_map, points, tiles)
+    
+    def update_replan(self, player, level):
+        """표시된 재계획 사유 처리 (이벤트가 없어도 REPLAN_STALE_TIME이 지나면 재계획)"""
+        reason = self.replan_reason
+        if reason is None and self.path_update_timer >= REPLAN_STALE_TIME:
+            reason = 'periodic'
+        if reason is not None:
+            self.replan_reason = None
+            self.request_replan(player, level, reason)
+    
+    def plan_nav(self, nav, start, goal):
+        """
+        반지름만큼 벽을 부풀린 구성 공간 NavGrid (여기서 계획한 경로는 벽에 걸리지 않고 따라갈 수 있음)
+        
+        시작이나 목표가 부푼 영역 안이면 (벽에 붙은 플레이어 등) 원래 nav
+        """
+        inflated = nav.inflated(self.radius)
+        if inflated.is_walkable(*start) and inflated.is_walkable(*goal):
+            return inflated
+        return nav
+    
+    def query_path(self, planner_key, planner, player, level):
+        """
+        현재 위치 -> 플레이어 경로 (적들이 공유하는 경로 캐시 사용, 구성 공간에서 계획)
+        
+        캐시 미스 시 executor가 있으면 백그라운드 작업, 스케줄러만 있으면 프레임마다
+        나눠 실행하는 PlanTask로 계획하고 None 반환
+        (결과는 poll_plan으로 받음, 그동안 기존 경로를 계속 따라감)
+        
+        Args:
+            planner_key: 경로 캐시 키 ('PRM', 'RRT', ...)
+            planner: plan_path(start, goal, grid_map) / plan_path_steps를 가진 플래너
+        """
+        start = world_to_grid(self.x, self.y)
+        goal = world_to_grid(player.x, player.y)
+        nav = self.plan_nav(level.get_nav(), start, goal)
+        cache_key = (planner_key, nav.radius)
+        
+        if self.executor is None and self.scheduler is None:
+            return level.path_cache.query(cache_key, start, goal, nav,
+                                          lambda: planner.plan_path(start, goal, nav.grid_map))
+        
+        # 이미 계산 중이면 결과를 기다림
+        if self.plan_job is not None:
+            return None
+        
+        path = level.path_cache.get(cache_key, start, goal, nav)
+        if path is None:
+            nav = level.get_snapshot()
+            if cache_key[1]:
+                nav = nav.inflated(self.radius)
+            if self.executor is not None:
+                self.plan_job = self.executor.submit(planner, start, goal, nav)
+            else:
+                self.plan_job = PlanTask(planner.plan_path_steps(start, goal, nav.grid_map),
+                                         planner, start, goal, nav,
+                                         lambda: planner.partial_path(goal))
+                self.scheduler.start_task(self, self.plan_job)
+            self.plan_key = cache_key
+        return path
+    
+    def poll_plan(self, player, level):
+        """
+        끝난 백그라운드/분할 계획 결과 수거 (경로 캐시에도 저장)
+        
+        Returns:
+            (path, planner), 아직 계산 중이거나 오래된 결과를 버렸으면 None
+        """
+        job = self.plan_job
+        if job is None or not job.done():
+            return None
+        self.plan_job = None
+        
+        goal = world_to_grid(player.x, player.y)
+        if self.executor is not None:
+            result = self.executor.collect(job, level.map_version, goal)
+        else:
+            result = None if job.is_stale(level.map_version, goal) else job.result()
+        
+        if result is None:
+            # 맵이 바뀌었거나 목표가 멀리 움직였음 - 현재 상태로 다시 계획
+            reason = 'map_changed' if job.nav.map_version != level.map_version else 'periodic'
+            self.request_replan(player, level, reason)
+            return None
+        
+        level.path_cache.put(self.plan_key, job.start, job.goal, job.nav, result[0])
+        return result
+    
+    def update_with_fallback(self, dt, player, level):
+        """고유 알고리즘으로 업데이트하되, 오래 갇혀 있으면 잠시 JPS 경로를 따라감"""
+        if self.fallback_timer > 0:
+            self.fallback_timer -= dt
+            if self.cooperative is not None:
+                following = self.follow_cooperative(dt, player, level)
+            else:
+                self.move_along_path(dt, level)
+                following = self.path_index < len(self.path)
+            
+            # 시간이 끝나거나 경로를 다 따라가면 고유 알고리즘으로 복귀
+            if self.fallback_timer <= 0 or not following:
+                self.fallback_timer = 0
+                self.path = []
+                self.path_index = 0
+                if self.cooperative is not None:
+                    self.cooperative.release(self)
+                self.mark_replan('blocked')
+            self.last_pos = (self.x, self.y)
+            return
+        
+        self.update(dt, player, level)
+        
+        if self.check_stuck(dt):
+            self.stuck_timer = 0
+            if self.cooperative is not None:
+                found = self.plan_cooperative(player, level)
+            else:
+                found = self.plan_fallback(player, level)
+            
+            if found:
+                self.fallback_timer = ENEMY_FALLBACK_DURATION
+                
+                # 대기/진행 중인 재계획이 대체 경로를 덮어쓰지 않도록 취소
+                if self.scheduler is not None:
+                    self.scheduler.cancel(self)
+                self.plan_job = None
+    
+    def plan_fallback(self, player, level):
+        """대체 경로 계획 (같은 질의는 경로 캐시로 다른 적과 공유), 찾았으면 True"""
+        goal_x, goal_y = self.fallback_goal(player)
+        start = world_to_grid(self.x, self.y)
+        goal = world_to_grid(goal_x, goal_y)
+        nav = self.plan_nav(level.get_nav(), start, goal)
+        
+        # 빈 공간이 넓은 맵은 스테이지에서 공유하는 사분 트리 셀 그래프,
+        # 그 밖의 큰 맵은 맵마다 공유하는 HPA* 추상 그래프 사용
+        quadtree = level.static_data('quadtree', build_quadtree)
+        quadtree.sync(nav)
+        planner, planner_key = self.fallback_planner, 'JPS'
+        if quadtree.compression >= QUADTREE_MIN_COMPRESSION:
+            planner, planner_key = quadtree, 'QT'
+        elif nav.width * nav.height >= HPA_MIN_MAP_TILES:
+            planner, planner_key = get_hpa_planner(level.grid_map), 'HPA'
+        
+        path = level.path_cache.query((planner_key, nav.radius), start, goal, nav,
+                                      lambda: planner.plan(start, goal, nav))
+        if len(path) > 1:
+            self.path = path[1:]  # 현재 위치 제외
+            self.path_index = 0
+            return True
+        return False
+    
+    def plan_cooperative(self, player, level):
+        """
+        대체 목표까지 창 단위 협력 경로 계획 (다른 적의 예약을 피하고 결과를 예약), 찾았으면 True
+        
+        경로를 캐시로 공유하지 않으므로 여러 적이 같은 최단 경로에 겹치지 않는다.
+        path[0]은 현재 타일 (스텝 path_step), 이후 스텝마다 타일 하나, path_index는 다음에 도착할 타일
+        """
+        goal_x, goal_y = self.fallback_goal(player)
+        start = world_to_grid(self.x, self.y)
+        goal = world_to_grid(goal_x, goal_y)
+        nav = self.plan_nav(level.get_nav(), start, goal)
+        
+        self.path = self.cooperative.plan(start, goal, nav, agent=self)
+        self.path_index = 1
+        self.path_step = self.cooperative.reservations.step
+        if len(self.path) > 1:
+            return True
+        self.cooperative.release(self)
+        return False
+    
+    def follow_cooperative(self, dt, player, level):
+        """
+        협력 경로를 예약한 스텝에 맞춰 따라감 (대기 스텝에는 그 타일에서 기다림)
+        
+        스텝 k 동안에는 path[k + 1]까지만 들어가고, path[k]에 실제로 도착해야 다음 타일로 넘어간다.
+        창의 절반을 지났거나, 경로 끝에 닿았거나, 예약보다 한 스텝 넘게 늦어지면
+        현재 위치에서 다음 창을 계획한다.
+        
+        Returns:
+            bool: 계속 따라갈 경로가 있는지
+        """
+        k = self.cooperative.reservations.step - self.path_step
+        if (k >= max(1, self.cooperative.window // 2) or k >= len(self.path) - 1 or
+                self.path_index < k):
+            if not self.plan_cooperative(player, level):
+                return False
+            k = 0
+        
+        target_gx, target_gy = self.path[self.path_index]
+        target_x = target_gx * TILE_SIZE + TILE_SIZE / 2
+        target_y = target_gy * TILE_SIZE + TILE_SIZE / 2
+        if self.path_index <= k and math.hypot(target_x - self.x, target_y - self.y) < 5:
+            self.path_index += 1
+            target_gx, target_gy = self.path[self.path_index]
+            target_x = target_gx * TILE_SIZE + TILE_SIZE / 2
+            target_y = target_gy * TILE_SIZE + TILE_SIZE / 2
+        
+        self.move_towards(target_x, target_y, dt, level)
+        return True
+    
+    def fallback_goal(self, player):
+        """대체 경로의 목표 (월드 좌표, 기본은 플레이어 위치)"""
+        return (player.x, player.y)
+    
     def move_along_path(self, dt, level):
         """경로를 따라 이동"""
         if not self.path or self.path_index >= len(self.path):
@@ -79,6 +397,7 @@ class EnemyBase:
             # 벽에 막히면 경로 재계획
             self.path = []
             self.path_index = 0
+            self.mark_replan('blocked')
         
         return True
     
@@ -139,6 +458,12 @@ class EnemyBase:
         screen_x = int(self.x - ox)
         screen_y = int(self.y - oy)
         
+        # 화면 밖이면 스킵 (이름표가 원 위로 튀어나오는 만큼 여유)
+        width, height = surface.get_size()
+        margin = self.radius + 40
+        if not (-margin <= screen_x <= width + margin and -margin <= screen_y <= height + margin):
+            return
+        
         # 적 원
         pygame.draw.circle(surface, self.color, (screen_x, screen_y), self.radius)
         
@@ -146,7 +471,9 @@ class EnemyBase:
         pygame.draw.circle(surface, (255, 255, 255), (screen_x, screen_y), self.radius, 1)
         
         # 이름과 상태 표시 (디버그용)
-        font = pygame.font.Font(None, 16)
+        if EnemyBase._font is None:
+            EnemyBase._font = pygame.font.Font(None, 16)
+        font = EnemyBase._font
         
         # 이름 표시
         text = font.render(self.name, True, (255, 255, 255))
@@ -165,8 +492,13 @@ class EnemyBase:
             return
         
         ox, oy = camera_offset
+        bounds = visible_tile_bounds(surface, camera_offset)
         
         for i in range(len(self.path) - 1):
+            # 화면에 걸치지 않는 구간은 스킵
+            if not segment_in_bounds(self.path[i], self.path[i + 1], bounds):
+                continue
+            
             gx1, gy1 = self.path[i]
             gx2, gy2 = self.path[i + 1]
             
@@ -2,41 +2,94 @@
 Belief 기반 추적 적
 """
 
+import math
 import random
 import numpy as np
 from game.enemies import EnemyBase
-from algos.belief import BeliefPlanner
-from game.grid import world_to_grid
+from algos.belief import BeliefPlanner, ParticleBeliefPlanner, KalmanTracker
+from algos.sensor import RangeSensor
+from game.grid import world_to_grid, distance_world
 from config import (
-    ENEMY_BELIEF_SPEED, COLOR_BELIEF,
+    ENEMY_BELIEF_SPEED, COLOR_BELIEF, TILE_SIZE,
     BELIEF_GRID_RESOLUTION, BELIEF_SENSOR_RANGE,
-    BELIEF_SENSOR_NOISE, BELIEF_MOTION_NOISE
+    BELIEF_SENSOR_NOISE, BELIEF_MOTION_NOISE,
+    BELIEF_TRACKER, BELIEF_NUM_PARTICLES,
+    BELIEF_KALMAN_FALLBACK, BELIEF_KALMAN_PROCESS_NOISE,
+    BELIEF_SENSOR_RAYS
 )
 
 
 class BeliefEnemy(EnemyBase):
     """Probabilistic Localization 기반 적"""
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, tracker=BELIEF_TRACKER):
+        """
+        Args:
+            tracker: 'grid' (히스토그램 필터), 'particle' (파티클 필터),
+                     'kalman' (시야 확보 시 칼만 필터, 그 외에는 BELIEF_KALMAN_FALLBACK)
+        """
         super().__init__(x, y, ENEMY_BELIEF_SPEED, COLOR_BELIEF, "Belief")
-        self.planner = BeliefPlanner(
-            grid_resolution=BELIEF_GRID_RESOLUTION,
-            sensor_range=BELIEF_SENSOR_RANGE,
-            sensor_noise=BELIEF_SENSOR_NOISE,
-            motion_noise=BELIEF_MOTION_NOISE
+        self.tracker = tracker
+        
+        # 칼만 모드: 평소엔 칼만, 시야 상실/노이즈 시에만 Belief 사용
+        self.kalman = None
+        belief_type = tracker
+        if tracker == 'kalman':
+            self.kalman = KalmanTracker(
+                sensor_noise=BELIEF_SENSOR_NOISE,
+                process_noise=BELIEF_KALMAN_PROCESS_NOISE
+            )
+            belief_type = BELIEF_KALMAN_FALLBACK
+        
+        if belief_type == 'particle':
+            self.planner = ParticleBeliefPlanner(
+                num_particles=BELIEF_NUM_PARTICLES,
+                grid_resolution=BELIEF_GRID_RESOLUTION,
+                sensor_range=BELIEF_SENSOR_RANGE,
+                sensor_noise=BELIEF_SENSOR_NOISE,
+                motion_noise=BELIEF_MOTION_NOISE
+            )
+        else:
+            self.planner = BeliefPlanner(
+                grid_resolution=BELIEF_GRID_RESOLUTION,
+                sensor_range=BELIEF_SENSOR_RANGE,
+                sensor_noise=BELIEF_SENSOR_NOISE,
+                motion_noise=BELIEF_MOTION_NOISE
+            )
+        
+        # 센서 범위 (팀 Belief 융합 시 적마다 다를 수 있음)
+        self.sensor_range = BELIEF_SENSOR_RANGE
+        
+        # 시야 판정용 거리 센서 (타일 위치 + 맵 버전별로 스캔 캐시)
+        self.range_sensor = RangeSensor(
+            num_rays=BELIEF_SENSOR_RAYS,
+            max_range=math.ceil(self.sensor_range / TILE_SIZE) + 1
         )
         
+        # 공유 팀 Belief (join_team으로 설정)
+        self.team = None
+        
         # 측정 주기
         self.measurement_timer = 0
         self.measurement_interval = 0.5  # 0.5초마다 센서 측정
         self.state = 'estimating'  # 상태 표시용
         
+        # 칼만 추적 중인지 (False면 Belief로 추정)
+        self.kalman_active = False
+        
         # 노이즈 효과
         self.is_noised = False
         self.noise_duration = 0
         
         # 시각화
         self.show_belief = True
+        
+        # 히트맵 캐시 (Belief 버전이 바뀔 때만 다시 생성)
+        self._heatmap_base = None
+        self._heatmap_scaled = None
+        self._heatmap_key = None
+        self._heatmap_view = None
+        self._heatmap_ready = False
     
     def update(self, dt, player, level):
         """업데이트"""
@@ -50,48 +103,127 @@ class BeliefEnemy(EnemyBase):
         
         # 주기적으로 센서 측정 및 belief 업데이트
         if self.measurement_timer >= self.measurement_interval:
-            self.measurement_timer = 0
-            
-            # Motion model (이전 이동 방향 예측)
-            prev_grid = world_to_grid(self.x, self.y)
-            
-            # Prediction step
-            motion = (0, 0)  # 간단하게 제자리로 가정
-            self.planner.predict(motion)
-            
-            # Measurement (노이즈 추가)
-            true_pos = (player.x, player.y)
-            
-            if self.is_noised:
-                # 노이즈 폭탄 영향: 큰 오차
-                noise_x = random.gauss(0, BELIEF_SENSOR_NOISE * 3)
-                noise_y = random.gauss(0, BELIEF_SENSOR_NOISE * 3)
-            else:
-                # 일반 센서 노이즈
-                noise_x = random.gauss(0, BELIEF_SENSOR_NOISE)
-                noise_y = random.gauss(0, BELIEF_SENSOR_NOISE)
-            
-            noisy_measurement = (true_pos[0] + noise_x, true_pos[1] + noise_y)
-            
-            # Update step
-            self.planner.update(noisy_measurement, level.grid_map, (self.x, self.y))
+            self.request_replan(player, level)
         
-        # Belief 기반 목표 위치
-        estimated_pos = self.planner.get_mean_position()
+        # 목표 위치 (칼만 추적 중이면 속도로 외삽, 아니면 Belief 평균)
+        if self.kalman_active:
+            estimated_pos = self.kalman.get_position(self.measurement_timer)
+        else:
+            estimated_pos = self.planner.get_mean_position()
         
         # 목표를 향해 이동
         self.move_towards(estimated_pos[0], estimated_pos[1], dt, level)
         
         # 간혹 랜덤 탐색 (belief 불확실성 높을 때)
-        max_belief = np.max(self.planner.belief)
-        if max_belief < 0.05:  # 매우 불확실
+        if not self.kalman_active and np.max(self.planner.belief) < 0.05:  # 매우 불확실
             # 랜덤 워크
-            angle = random.uniform(0, 2 * 3.14159)
-            import math
+            angle = random.uniform(0, 2 * math.pi)
             rand_x = self.x + math.cos(angle) * 50
             rand_y = self.y + math.sin(angle) * 50
             self.move_towards(rand_x, rand_y, dt * 0.5, level)
     
+    def replan(self, player, level):
+        """센서 측정 (노이즈 포함) 후 칼만/Belief 업데이트"""
+        elapsed = self.measurement_timer  # 지난 측정 이후 실제 경과 시간 (주기보다 길 수 있음)
+        self.measurement_timer = 0
+        self.planner.fit_map(level.grid_map)
+        
+        # Measurement (노이즈 추가)
+        true_pos = (player.x, player.y)
+        
+        if self.is_noised:
+            # 노이즈 폭탄 영향: 큰 오차
+            noise_x = random.gauss(0, BELIEF_SENSOR_NOISE * 3)
+            noise_y = random.gauss(0, BELIEF_SENSOR_NOISE * 3)
+        else:
+            # 일반 센서 노이즈
+            noise_x = random.gauss(0, BELIEF_SENSOR_NOISE)
+            noise_y = random.gauss(0, BELIEF_SENSOR_NOISE)
+        
+        noisy_measurement = (true_pos[0] + noise_x, true_pos[1] + noise_y)
+        
+        if self.kalman is not None:
+            self._kalman_step(noisy_measurement, true_pos, elapsed, level)
+        else:
+            self._belief_step(noisy_measurement, (0, 0), level)
+    
+    def _belief_step(self, measurement, motion, level):
+        """Belief 예측 + 측정 업데이트 (팀 Belief면 틱당 한 번만 공유 예측)"""
+        if self.team is not None:
+            self.team.predict(level.elapsed_time, motion, level.grid_map, level.map_version)
+        else:
+            self.planner.predict(motion, level.grid_map, level.map_version)
+        
+        # Update step (자신의 위치/시야/센서 범위로 측정)
+        self.planner.update(measurement, level.grid_map, (self.x, self.y),
+                            self.sensor_range, self._can_see(measurement, level))
+    
+    def _kalman_step(self, measurement, true_pos, elapsed, level):
+        """칼만 추적, 시야 상실/노이즈 시에만 Belief로 전환 (elapsed: 지난 측정 이후 경과 시간)"""
+        if self._can_track_directly(true_pos, level):
+            if self.kalman_active:
+                self.kalman.predict(elapsed)
+            else:
+                # 놓쳤던 동안의 오래된 상태/속도 대신 새 측정에서 다시 시작
+                self.kalman.reset()
+            self.kalman.update(measurement)
+            self.kalman_active = True
+            self.state = 'tracking'
+            return
+        
+        motion = (0, 0)
+        if self.kalman_active:
+            # 추적을 놓친 순간: 마지막 속도로 한 번만 예측해 그 주변에서 Belief 시작 (공유 Belief는 유지)
+            # 이후에는 오래된 속도를 계속 외삽하지 않고 Belief의 모션 노이즈만으로 퍼짐
+            self.kalman.predict(elapsed)
+            if self.team is None:
+                self.planner.seed(self.kalman.get_position(),
+                                  min(self.kalman.get_position_std(), self.sensor_range),
+                                  level.grid_map, level.map_version)
+            else:
+                motion = self._kalman_motion(elapsed)
+            self.kalman_active = False
+        
+        self.state = 'estimating'
+        self._belief_step(measurement, motion, level)
+    
+    def _can_track_directly(self, target_pos, level):
+        """센서 범위 안, 시야 확보, 노이즈 없음 → 칼만으로 직접 추적 가능"""
+        if self.is_noised:
+            return False
+        if distance_world((self.x, self.y), target_pos) > self.sensor_range:
+            return False
+        return self._can_see(target_pos, level)
+    
+    def _can_see(self, target_pos, level):
+        """거리 센서 스캔으로 target_pos(월드 좌표)가 보이는지 확인"""
+        scan = self.range_sensor.scan(level.grid_map, world_to_grid(self.x, self.y),
+                                      level.map_version)
+        return scan.can_see(world_to_grid(*target_pos))
+    
+    def _kalman_motion(self, elapsed):
+        """칼만 속도 추정을 elapsed초 동안의 Belief 그리드 단위 이동량으로 변환"""
+        if not self.kalman.initialized:
+            return (0, 0)
+        
+        vx, vy = self.kalman.get_velocity()
+        cell = self.planner.resolution * TILE_SIZE
+        return (int(round(vx * elapsed / cell)),
+                int(round(vy * elapsed / cell)))
+    
+    def fallback_goal(self, player):
+        """대체 경로도 실제 위치 대신 현재 추정 위치를 향함"""
+        if self.kalman_active:
+            return self.kalman.get_position()
+        return self.planner.get_mean_position()
+    
+    def join_team(self, team):
+        """공유 팀 Belief에 합류 (개별 플래너 대신 팀 플래너 사용)"""
+        self.team = team
+        self.planner = team.planner
+        # 같은 분포를 여러 번 그리지 않도록 첫 멤버만 히트맵 표시
+        self.show_belief = team.join(self)
+    
     def apply_noise_effect(self, duration=3.0):
         """노이즈 폭탄 효과 적용"""
         self.is_noised = True
@@ -99,8 +231,14 @@ class BeliefEnemy(EnemyBase):
     
     def draw(self, surface, camera_offset=(0, 0)):
         """Belief 분포 포함 그리기"""
-        # Belief 히트맵 먼저 그리기
-        if self.show_belief:
+        # Belief 히트맵 먼저 그리기 (칼만 추적 중이면 추정 위치만 표시)
+        if self.kalman_active:
+            import pygame
+            ox, oy = camera_offset
+            kx, ky = self.kalman.get_position()
+            pygame.draw.circle(surface, self.color, (int(kx - ox), int(ky - oy)),
+                               max(4, int(self.kalman.get_position_std())), 1)
+        elif self.show_belief:
             self.draw_belief_heatmap(surface, camera_offset)
         
         # 적 그리기
@@ -119,41 +257,71 @@ class BeliefEnemy(EnemyBase):
                                  self.radius + 5, 2)
     
     def draw_belief_heatmap(self, surface, camera_offset=(0, 0)):
-        """Belief 히트맵 시각화"""
+        """
+        Belief 히트맵 시각화 (Belief가 바뀔 때만 다시 래스터화)
+        
+        화면에 걸치는 셀만 확대하므로 맵이 커져도 확대 비용은 화면 크기에 비례한다.
+        """
         import pygame
-        from config import TILE_SIZE
         
+        key = (id(self.planner), self.planner.version)
+        if key != self._heatmap_key:
+            self._heatmap_key = key
+            self._heatmap_view = None
+            self._heatmap_ready = self._render_belief_heatmap()
+        
+        if not self._heatmap_ready:
+            return
+        
+        # 화면에 보이는 셀 범위
         ox, oy = camera_offset
+        cell = self.planner.resolution * TILE_SIZE
+        width, height = self._heatmap_base.get_size()
+        screen_w, screen_h = surface.get_size()
+        cx0 = max(0, int(ox // cell))
+        cy0 = max(0, int(oy // cell))
+        cx1 = min(width, int((ox + screen_w) // cell) + 1)
+        cy1 = min(height, int((oy + screen_h) // cell) + 1)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+        
+        # 보이는 셀 범위가 바뀔 때만 다시 확대 (같은 크기면 서페이스 재사용)
+        view = (cx0, cy0, cx1, cy1)
+        if view != self._heatmap_view:
+            self._heatmap_view = view
+            size = ((cx1 - cx0) * cell, (cy1 - cy0) * cell)
+            if self._heatmap_scaled is None or self._heatmap_scaled.get_size() != size:
+                self._heatmap_scaled = pygame.Surface(size, pygame.SRCALPHA)
+            visible = self._heatmap_base.subsurface((cx0, cy0, cx1 - cx0, cy1 - cy0))
+            pygame.transform.scale(visible, size, self._heatmap_scaled)
+        
+        surface.blit(self._heatmap_scaled, (cx0 * cell - ox, cy0 * cell - oy))
+    
+    def _render_belief_heatmap(self):
+        """Belief 배열 → 알파 채널 (작은 서페이스 재사용, 확대는 그릴 때 보이는 부분만)"""
+        import pygame
+        
         belief = self.planner.get_belief_heatmap()
         
         # 최대값 정규화
         max_belief = np.max(belief)
         if max_belief < 1e-6:
-            return
+            return False
         
         belief_normalized = belief / max_belief
         
-        # 히트맵 그리기
-        for y in range(belief.shape[0]):
-            for x in range(belief.shape[1]):
-                prob = belief_normalized[y, x]
-                
-                if prob < 0.1:  # 낮은 확률은 스킵
-                    continue
-                
-                # Belief 그리드 → 월드 좌표
-                world_x = (x * self.planner.resolution + self.planner.resolution / 2) * TILE_SIZE
-                world_y = (y * self.planner.resolution + self.planner.resolution / 2) * TILE_SIZE
-                
-                screen_x = world_x - ox
-                screen_y = world_y - oy
-                
-                # 색상 (부드러운 보라 계열, 낮은 투명도)
-                alpha = int(prob * 50)  # 투명도 대폭 감소
-                color = (*self.color, alpha)
-                
-                # 반투명 사각형
-                size = self.planner.resolution * TILE_SIZE
-                temp_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-                temp_surface.fill(color)
-                surface.blit(temp_surface, (screen_x - size/2, screen_y - size/2))
+        # 낮은 확률은 투명, 나머지는 투명도 대폭 감소 (부드러운 보라 계열)
+        alpha = (belief_normalized * 50).astype(np.uint8)
+        alpha[belief_normalized < 0.1] = 0
+        
+        height, width = belief.shape
+        
+        if self._heatmap_base is None or self._heatmap_base.get_size() != (width, height):
+            self._heatmap_base = pygame.Surface((width, height), pygame.SRCALPHA)
+            self._heatmap_base.fill((*self.color, 0))
+        
+        # surfarray는 (x, y) 순서이므로 전치해서 기록
+        pixels = pygame.surfarray.pixels_alpha(self._heatmap_base)
+        pixels[...] = alpha.T
+        del pixels  # 서페이스 잠금 해제
+        return True
@@ -4,10 +4,12 @@ Bug 알고리즘 기반 적들
 
 from game.enemies import EnemyBase
 from algos.bug import Bug1Planner, Bug2Planner, TangentBugPlanner
+from algos.sensor import RangeSensor
 from game.grid import world_to_grid
 from config import (
     ENEMY_BUG1_SPEED, ENEMY_BUG2_SPEED, ENEMY_TANGENT_SPEED,
-    COLOR_BUG1, COLOR_BUG2, COLOR_TANGENT
+    COLOR_BUG1, COLOR_BUG2, COLOR_TANGENT,
+    TANGENT_SENSOR_RANGE, TANGENT_SENSOR_RAYS
 )
 
 
@@ -32,7 +34,8 @@ class Bug1Enemy(EnemyBase):
             goal_grid = world_to_grid(player.x, player.y)
             
             # Bug1 한 스텝 - 상태를 유지하며 다음 그리드 계산
-            next_grid = self.planner.plan_step(current_grid, goal_grid, level.grid_map)
+            next_grid = self.planner.plan_step(current_grid, goal_grid, level.grid_map,
+                                               map_version=level.map_version)
             
             # 다음 목표 설정
             if next_grid != current_grid:
@@ -101,7 +104,8 @@ class Bug2Enemy(EnemyBase):
             
             # Bug2 한 스텝 - M-line 상태 유지
             next_grid = self.planner.plan_step(
-                current_grid, goal_grid, level.grid_map, self.start_grid
+                current_grid, goal_grid, level.grid_map, self.start_grid,
+                map_version=level.map_version
             )
             
             if next_grid != current_grid:
@@ -144,7 +148,10 @@ class TangentBugEnemy(EnemyBase):
     
     def __init__(self, x, y):
         super().__init__(x, y, ENEMY_TANGENT_SPEED, COLOR_TANGENT, "Tangent")
-        self.planner = TangentBugPlanner()
+        sensor = None
+        if TANGENT_SENSOR_RAYS > 0:
+            sensor = RangeSensor(num_rays=TANGENT_SENSOR_RAYS, max_range=TANGENT_SENSOR_RANGE)
+        self.planner = TangentBugPlanner(TANGENT_SENSOR_RANGE, sensor)
         self.last_grid = None
     
     def update(self, dt, player, level):
@@ -159,7 +166,8 @@ class TangentBugEnemy(EnemyBase):
             goal_grid = world_to_grid(player.x, player.y)
             
             # Tangent Bug 한 스텝 - 센서 기반 접선 탐색
-            next_grid = self.planner.plan_step(current_grid, goal_grid, level.grid_map)
+            next_grid = self.planner.plan_step(current_grid, goal_grid, level.grid_map,
+                                               map_version=level.map_version)
             
             if next_grid != current_grid:
                 self.path = [next_grid]
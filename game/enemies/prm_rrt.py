@@ -2,74 +2,69 @@
 PRM, RRT 알고리즘 기반 적들
 """
 
-from game.enemies import EnemyBase
+from game.enemies import EnemyBase, visible_tile_bounds, segment_in_bounds
 from algos.prm import PRMPlanner
 from algos.rrt import RRTPlanner
-from game.grid import world_to_grid
 from config import (
     ENEMY_PRM_SPEED, ENEMY_RRT_SPEED,
     COLOR_PRM, COLOR_RRT
 )
 
 
+def build_prm_roadmap(static_map):
+    """고정 벽 레이어로 PRM 로드맵 구축 (Level.static_data로 스테이지의 PRM 적들이 공유)"""
+    planner = PRMPlanner(num_samples=120, connection_radius=10.0, max_neighbors=6)
+    planner.build_roadmap(static_map)
+    return planner
+
+
 class PRMEnemy(EnemyBase):
     """PRM (Probabilistic Roadmap) 적"""
     
-    def __init__(self, x, y, grid_map):
+    event_driven = True
+    
+    def __init__(self, x, y, level):
         super().__init__(x, y, ENEMY_PRM_SPEED, COLOR_PRM, "PRM")
-        self.planner = PRMPlanner(num_samples=120, connection_radius=10.0, max_neighbors=6)
         
-        # 로드맵 사전 구축
-        self.planner.build_roadmap(grid_map)
-        
-        # 경로 재계산 간격 (PRM은 덜 자주)
-        self.path_update_interval = 1.5
+        # 고정 벽 로드맵은 스테이지에서 한 번만 구축 (임시 장벽은 질의 때 반영)
+        self.planner = level.static_data('PRM', build_prm_roadmap)
         
         # 시각화 데이터
         self.show_graph = True
         self.state = 'planning'  # 상태 표시용
-        
-        # 맵 변경 감지용
-        self.last_temp_wall_count = 0
     
     def update(self, dt, player, level):
         """업데이트"""
         self.path_update_timer += dt
         
-        # 맵이 변경되면 (임시 벽 추가 등) 로드맵 재구축
-        if not self.planner.is_built or self.check_map_changed(level):
-            self.planner.build_roadmap(level.grid_map)
-            self.path = []
-        
-        # 주기적으로 경로 재계산
-        if self.path_update_timer >= self.path_update_interval or not self.path:
-            self.path_update_timer = 0
-            
-            current_grid = world_to_grid(self.x, self.y)
-            goal_grid = world_to_grid(player.x, player.y)
-            
-            # PRM 경로 계획
-            full_path = self.planner.plan_path(current_grid, goal_grid, level.grid_map)
-            
-            if full_path and len(full_path) > 1:
+        # 백그라운드 계획 결과 반영 (로드맵은 바뀌지 않으므로 공유 플래너 유지)
+        result = self.poll_plan(player, level)
+        if result is not None:
+            full_path, _ = result
+            if len(full_path) > 1:
                 self.path = full_path[1:]  # 현재 위치 제외
                 self.path_index = 0
         
-        # 경로 따라 이동
-        if self.path:
+        # 이벤트가 있을 때만 경로 재계산
+        self.update_replan(player, level)
+        
+        # 경로 따라 이동 (다 따라왔으면 플레이어를 직접 추적)
+        if self.path_index < len(self.path):
             self.move_along_path(dt, level)
         else:
             # 경로 없으면 직접 이동
             self.move_towards(player.x, player.y, dt, level)
     
-    def check_map_changed(self, level):
-        """맵 변경 감지"""
-        # 임시 벽 개수가 변경되면 재구축
-        current_count = len(level.temp_walls)
-        if current_count != self.last_temp_wall_count:
-            self.last_temp_wall_count = current_count
-            return True
-        return False
+    def replan(self, player, level):
+        """PRM 경로 계획 (임시 장벽에 막힌 엣지는 건너뜀)"""
+        self.path_update_timer = 0
+        
+        # PRM 경로 계획 (같은 질의는 다른 PRM 적과 캐시 공유)
+        full_path = self.query_path('PRM', self.planner, player, level)
+        
+        if full_path and len(full_path) > 1:
+            self.path = full_path[1:]  # 현재 위치 제외
+            self.path_index = 0
     
     def draw(self, surface, camera_offset=(0, 0)):
         """PRM 그래프 포함 그리기"""
@@ -87,9 +82,12 @@ class PRMEnemy(EnemyBase):
         
         ox, oy = camera_offset
         nodes, edges = self.planner.get_graph_for_visualization()
+        bounds = visible_tile_bounds(surface, camera_offset)
         
-        # 엣지 그리기 (어두운 회색, 낮은 투명도)
+        # 엣지 그리기 (어두운 회색, 낮은 투명도, 화면에 걸치는 것만)
         for node1, node2 in edges:
+            if not segment_in_bounds(node1, node2, bounds):
+                continue
             x1 = node1[0] * TILE_SIZE + TILE_SIZE / 2 - ox
             y1 = node1[1] * TILE_SIZE + TILE_SIZE / 2 - oy
             x2 = node2[0] * TILE_SIZE + TILE_SIZE / 2 - ox
@@ -99,6 +97,8 @@ class PRMEnemy(EnemyBase):
         
         # 노드 그리기 (작고 어둡게)
         for node in nodes:
+            if not segment_in_bounds(node, node, bounds):
+                continue
             x = node[0] * TILE_SIZE + TILE_SIZE / 2 - ox
             y = node[1] * TILE_SIZE + TILE_SIZE / 2 - oy
             pygame.draw.circle(surface, (100, 100, 100, 60), (int(x), int(y)), 1)
@@ -107,50 +107,48 @@ class PRMEnemy(EnemyBase):
 class RRTEnemy(EnemyBase):
     """RRT (Rapidly-exploring Random Tree) 적"""
     
+    event_driven = True
+    
     def __init__(self, x, y):
         super().__init__(x, y, ENEMY_RRT_SPEED, COLOR_RRT, "RRT")
         self.planner = RRTPlanner(max_iterations=300, step_size=2.5, goal_sample_rate=0.2)
         
-        # 경로 재계산 간격 (RRT는 자주 재계산)
-        self.path_update_interval = 0.8
-        
         # 시각화 데이터
         self.show_tree = True
-        
-        # 맵 변경 감지용
-        self.last_temp_wall_count = 0
     
     def update(self, dt, player, level):
         """업데이트"""
         self.path_update_timer += dt
         
-        # 맵이 변경되면 즉시 재계획
-        current_count = len(level.temp_walls)
-        if current_count != self.last_temp_wall_count:
-            self.last_temp_wall_count = current_count
-            self.path_update_timer = self.path_update_interval  # 즉시 재계획
-        
-        # 자주 경로 재계산 (RRT는 매번 새로운 트리)
-        if self.path_update_timer >= self.path_update_interval:
-            self.path_update_timer = 0
-            
-            current_grid = world_to_grid(self.x, self.y)
-            goal_grid = world_to_grid(player.x, player.y)
-            
-            # RRT 경로 계획
-            full_path = self.planner.plan_path(current_grid, goal_grid, level.grid_map)
-            
-            if full_path and len(full_path) > 1:
+        # 백그라운드 계획 결과 반영 (시각화용 트리도 함께 받음)
+        result = self.poll_plan(player, level)
+        if result is not None:
+            full_path, self.planner = result
+            if len(full_path) > 1:
                 self.path = full_path[1:]  # 현재 위치 제외
                 self.path_index = 0
         
-        # 경로 따라 이동
-        if self.path:
+        # 경로가 막혔거나 플레이어가 멀어졌을 때만 새 트리로 재계산
+        self.update_replan(player, level)
+        
+        # 경로 따라 이동 (다 따라왔으면 플레이어를 직접 추적)
+        if self.path_index < len(self.path):
             self.move_along_path(dt, level)
         else:
             # 경로 없으면 직접 이동
             self.move_towards(player.x, player.y, dt, level)
     
+    def replan(self, player, level):
+        """새 RRT 트리로 경로 계획"""
+        self.path_update_timer = 0
+        
+        # RRT 경로 계획 (같은 질의는 다른 RRT 적과 캐시 공유)
+        full_path = self.query_path('RRT', self.planner, player, level)
+        
+        if full_path and len(full_path) > 1:
+            self.path = full_path[1:]  # 현재 위치 제외
+            self.path_index = 0
+    
     def draw(self, surface, camera_offset=(0, 0)):
         """RRT 트리 포함 그리기"""
         # 트리 먼저 그리기
@@ -167,9 +165,12 @@ class RRTEnemy(EnemyBase):
         
         ox, oy = camera_offset
         nodes, edges = self.planner.get_tree_for_visualization()
+        bounds = visible_tile_bounds(surface, camera_offset)
         
-        # 엣지 그리기 (어두운 회색, 낮은 투명도)
+        # 엣지 그리기 (어두운 회색, 낮은 투명도, 화면에 걸치는 것만)
         for node1, node2 in edges:
+            if not segment_in_bounds(node1, node2, bounds):
+                continue
             x1 = node1[0] * TILE_SIZE + TILE_SIZE / 2 - ox
             y1 = node1[1] * TILE_SIZE + TILE_SIZE / 2 - oy
             x2 = node2[0] * TILE_SIZE + TILE_SIZE / 2 - ox
@@ -179,6 +180,8 @@ class RRTEnemy(EnemyBase):
         
         # 노드 그리기 (작고 어둡게)
         for node in nodes:
+            if not segment_in_bounds(node, node, bounds):
+                continue
             x = node[0] * TILE_SIZE + TILE_SIZE / 2 - ox
             y = node[1] * TILE_SIZE + TILE_SIZE / 2 - oy
             pygame.draw.circle(surface, (90, 90, 90, 50), (int(x), int(y)), 1)
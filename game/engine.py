@@ -3,21 +3,32 @@
 """
 
 import pygame
+import time
+import numpy as np
 from config import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, COLOR_BLACK, COLOR_WHITE,
-    COLOR_DARK_GRAY, TILE_WALL, TILE_TEMP_WALL, TILE_KEY, TILE_EXIT,
-    STAGE_TIME_LIMIT, DEBUG_SHOW_GRID, DEBUG_SHOW_PATHS
+    GRID_WIDTH, GRID_HEIGHT, TILE_SIZE, COLOR_BLACK, COLOR_WHITE,
+    TILE_EMPTY, TILE_TEMP_WALL, TILE_KEY, TILE_EXIT,
+    STAGE_TIME_LIMIT, DEBUG_SHOW_GRID, DEBUG_SHOW_PATHS,
+    BELIEF_SHARED_TEAM, REPLAN_BUDGET_MS, REPLAN_AGING, REPLAN_DISTANCE_CAP,
+    PLANNING_BACKGROUND, COOPERATIVE_PATHFINDING
 )
 from game.level import Level
+from game.levelfile import find_level_file
+from game.mapgen import component_labels
+from game.camera import Camera, StaticTileRenderer
 from game.player import Player
 from game.ui import UI
 from game.particles import ParticleSystem
 from game.sound import SoundSystem
-from game.grid import grid_to_world, world_to_grid
+from game.grid import grid_to_world, world_to_grid, distance_world
+from game.enemies import REPLAN_PRIORITY
 from game.enemies.bug import Bug1Enemy, Bug2Enemy, TangentBugEnemy
 from game.enemies.apf import APFEnemy
 from game.enemies.prm_rrt import PRMEnemy, RRTEnemy
 from game.enemies.belief import BeliefEnemy
+from algos.belief import TeamBeliefTracker
+from algos.executor import PlanningExecutor
+from algos.cooperative import WHCAPlanner, ReservationTable
 from game.menu import MainMenu, HelpScreen
 
 
@@ -31,6 +42,114 @@ class GameState:
     STAGE_CLEAR = 5
 
 
+class ReplanScheduler:
+    """적들의 재계획 요청을 모아 프레임당 시간 예산 안에서 실행
+    
+    우선순위 = 사유 가중치 + 대기 프레임 * REPLAN_AGING - 플레이어까지 거리(타일)
+    예산을 넘길 것 같은 요청은 다음 프레임으로 미루고, 미뤄질수록 우선순위가 올라 차례가 돌아온다.
+    예산보다 비싼 계획도 굶지 않도록 프레임마다 최소 하나는 실행한다.
+    
+    PRM/RRT처럼 나눠 실행할 수 있는 계획은 PlanTask로 등록되어, 남은 예산 안에서
+    돌아가며 조금씩 진행된다 (예산 초과는 작업 단위 하나 이내).
+    """
+    
+    def __init__(self, budget_ms=REPLAN_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.pending = {}  # enemy -> [사유, 대기 프레임 수]
+        self.tasks = {}  # enemy -> PlanTask (진행 중인 분할 계획)
+        self._task_turn = 0  # 작업 실행 순서 회전용
+        self._cost_ms = {}  # 적 종류별 재계획 비용 추정 (지수 이동 평균)
+        
+        # 통계 (디버그 화면에 표시)
+        self.last_spent_ms = 0.0
+        self.last_task_ms = 0.0
+        self.last_executed = 0
+        self.total_executed = 0
+        self.max_wait = 0
+    
+    def request(self, enemy, reason='periodic'):
+        """재계획 요청 (이미 대기 중이면 더 급한 사유로만 갱신)"""
+        entry = self.pending.get(enemy)
+        if entry is None:
+            self.pending[enemy] = [reason, 0]
+        elif REPLAN_PRIORITY[reason] > REPLAN_PRIORITY[entry[0]]:
+            entry[0] = reason
+    
+    def start_task(self, enemy, task):
+        """여러 프레임에 나눠 실행할 계획 작업 등록 (적마다 하나)"""
+        self.tasks[enemy] = task
+    
+    def cancel(self, enemy):
+        """대기 중인 요청과 진행 중인 작업 취소"""
+        self.pending.pop(enemy, None)
+        self.tasks.pop(enemy, None)
+    
+    def clear(self):
+        self.pending.clear()
+        self.tasks.clear()
+        self.max_wait = 0
+    
+    def run(self, player, level):
+        """우선순위 순으로 예산 안에서 재계획 실행, 나머지는 대기 프레임 증가"""
+        start = time.perf_counter()
+        order = sorted(self.pending, key=lambda e: self._priority(e, player), reverse=True)
+        executed = 0
+        
+        for enemy in order:
+            spent = (time.perf_counter() - start) * 1000
+            if executed and spent + self._cost_ms.get(enemy.name, 0.0) > self.budget_ms:
+                continue
+            
+            del self.pending[enemy]
+            t0 = time.perf_counter()
+            enemy.replan(player, level)
+            cost = (time.perf_counter() - t0) * 1000
+            
+            prev = self._cost_ms.get(enemy.name)
+            self._cost_ms[enemy.name] = cost if prev is None else prev * 0.8 + cost * 0.2
+            executed += 1
+        
+        for entry in self.pending.values():
+            entry[1] += 1
+            self.max_wait = max(self.max_wait, entry[1])
+        
+        # 남은 예산으로 진행 중인 작업을 돌아가며 실행 (매 프레임 시작 순서를 바꿔 공정하게)
+        task_start = time.perf_counter()
+        if self.tasks:
+            deadline = start + self.budget_ms / 1000
+            order = list(self.tasks)
+            turn = self._task_turn % len(order)
+            self._task_turn += 1
+            for i, enemy in enumerate(order[turn:] + order[:turn]):
+                if i and time.perf_counter() >= deadline:
+                    break
+                if self.tasks[enemy].advance(deadline):
+                    del self.tasks[enemy]
+        
+        self.last_task_ms = (time.perf_counter() - task_start) * 1000
+        self.last_spent_ms = (time.perf_counter() - start) * 1000
+        self.last_executed = executed
+        self.total_executed += executed
+    
+    def stats(self):
+        """스케줄러 통계 딕셔너리"""
+        return {
+            'queue_depth': len(self.pending),
+            'tasks': len(self.tasks),
+            'spent_ms': self.last_spent_ms,
+            'task_ms': self.last_task_ms,
+            'budget_ms': self.budget_ms,
+            'executed': self.last_executed,
+            'total_executed': self.total_executed,
+            'max_wait': self.max_wait
+        }
+    
+    def _priority(self, enemy, player):
+        reason, waited = self.pending[enemy]
+        dist = distance_world((enemy.x, enemy.y), (player.x, player.y)) / TILE_SIZE
+        return REPLAN_PRIORITY[reason] + waited * REPLAN_AGING - min(dist, REPLAN_DISTANCE_CAP)
+
+
 class Game:
     """메인 게임 클래스"""
     
@@ -57,14 +176,29 @@ class Game:
         # 타이머
         self.time_left = STAGE_TIME_LIMIT
         
-        # 카메라
-        self.camera_x = 0
-        self.camera_y = 0
+        # 공유 팀 Belief (스테이지마다 생성)
+        self.team_belief = None
+        
+        # 적 재계획 스케줄러 (프레임당 시간 예산)
+        self.replan_scheduler = ReplanScheduler()
+        
+        # 백그라운드 계획 실행기 (선택, 없으면 모든 계획을 메인 루프에서 실행)
+        self.planning_executor = PlanningExecutor() if PLANNING_BACKGROUND else None
+        
+        # 협력 경로 플래너 (선택, 스테이지마다 적들이 공유하는 예약표와 함께 생성)
+        self.cooperative = None
+        
+        # 카메라 (맵이 화면보다 크면 플레이어를 따라 스크롤)
+        self.camera = Camera()
+        
+        # 고정 벽 청크 렌더러 (스테이지마다 생성)
+        self.tile_renderer = None
     
     def init_stage(self):
         """스테이지 초기화"""
         # 레벨 생성
-        self.level = Level(self.stage_num)
+        self.level = Level(self.stage_num, path=find_level_file(self.stage_num))
+        self.tile_renderer = StaticTileRenderer(self.level.static_map)
         
         # 플레이어 생성
         spawn_x, spawn_y = grid_to_world(
@@ -76,6 +210,18 @@ class Game:
         # 적 생성 (스테이지별 구성)
         self.enemies = []
         self._spawn_enemies()
+        self._setup_team_belief()
+        
+        # 협력 모드면 대체 경로를 레벨 공유 예약표 위에서 계획
+        self.cooperative = WHCAPlanner(ReservationTable()) if COOPERATIVE_PATHFINDING else None
+        
+        # 재계획은 모두 스케줄러를 거침 (PRM/RRT는 이벤트가 있을 때만 요청)
+        self.replan_scheduler.clear()
+        for enemy in self.enemies:
+            enemy.scheduler = self.replan_scheduler
+            enemy.executor = self.planning_executor
+            enemy.cooperative = self.cooperative
+            enemy.listen(self.level, self.player)
         
         # 파티클 클리어
         self.particles.clear()
@@ -111,7 +257,7 @@ class Game:
             # Stage 4: Sampling-based - 그래프/트리 경로
             self._safe_spawn(Bug2Enemy, 10, 6)
             self._safe_spawn(TangentBugEnemy, 12, 8)
-            self._safe_spawn_prm(20, 15)
+            self._safe_spawn(PRMEnemy, 20, 15, self.level)
             self._safe_spawn(RRTEnemy, 28, 12)
             self._safe_spawn(APFEnemy, 35, 10)
             self._safe_spawn(APFEnemy, 38, 18)
@@ -124,7 +270,7 @@ class Game:
             self._safe_spawn(BeliefEnemy, 25, 10)
             self._safe_spawn(RRTEnemy, 32, 12)
             self._safe_spawn(BeliefEnemy, 38, 16)
-            self._safe_spawn_prm(35, 8)
+            self._safe_spawn(PRMEnemy, 35, 8, self.level)
         
         elif self.stage_num == 6:
             # Stage 6: 보스전 - 모든 알고리즘 총동원!
@@ -133,39 +279,68 @@ class Game:
             self._safe_spawn(Bug2Enemy, 35, 6)
             self._safe_spawn(TangentBugEnemy, 10, 18)
             self._safe_spawn(APFEnemy, 35, 18)
-            self._safe_spawn_prm(15, 11)
+            self._safe_spawn(PRMEnemy, 15, 11, self.level)
             self._safe_spawn(RRTEnemy, 30, 11)
             self._safe_spawn(BeliefEnemy, 22, 8)
             self._safe_spawn(BeliefEnemy, 22, 16)
         
         else:
             # Stage 7+: 무한 난이도 상승
+            # 배치 패턴은 기본 맵 기준이므로 실제 맵 크기에 맞춰 늘림
             num_enemies = min(3 + self.stage_num, 12)
             for i in range(num_enemies):
                 enemy_type = i % 7
-                spawn_x = 10 + (i * 4) % 28
-                spawn_y = 6 + (i * 2) % 14
+                spawn_x = (10 + (i * 4) % 28) * self.level.width // GRID_WIDTH
+                spawn_y = (6 + (i * 2) % 14) * self.level.height // GRID_HEIGHT
                 
                 if enemy_type == 0:
-                    self.enemies.append(Bug1Enemy(*grid_to_world(spawn_x, spawn_y)))
+                    self._safe_spawn(Bug1Enemy, spawn_x, spawn_y)
                 elif enemy_type == 1:
-                    self.enemies.append(Bug2Enemy(*grid_to_world(spawn_x, spawn_y)))
+                    self._safe_spawn(Bug2Enemy, spawn_x, spawn_y)
                 elif enemy_type == 2:
-                    self.enemies.append(TangentBugEnemy(*grid_to_world(spawn_x, spawn_y)))
+                    self._safe_spawn(TangentBugEnemy, spawn_x, spawn_y)
                 elif enemy_type == 3:
-                    self.enemies.append(APFEnemy(*grid_to_world(spawn_x, spawn_y)))
+                    self._safe_spawn(APFEnemy, spawn_x, spawn_y)
                 elif enemy_type == 4:
-                    self.enemies.append(PRMEnemy(*grid_to_world(spawn_x, spawn_y), self.level.grid_map))
+                    self._safe_spawn(PRMEnemy, spawn_x, spawn_y, self.level)
                 elif enemy_type == 5:
-                    self.enemies.append(RRTEnemy(*grid_to_world(spawn_x, spawn_y)))
+                    self._safe_spawn(RRTEnemy, spawn_x, spawn_y)
                 else:
-                    self.enemies.append(BeliefEnemy(*grid_to_world(spawn_x, spawn_y)))
+                    self._safe_spawn(BeliefEnemy, spawn_x, spawn_y)
+    
+    def _setup_team_belief(self):
+        """Belief 적이 둘 이상이면 레벨 단위 공유 Belief로 묶기"""
+        self.team_belief = None
+        belief_enemies = [e for e in self.enemies if isinstance(e, BeliefEnemy)]
+        
+        if not BELIEF_SHARED_TEAM or len(belief_enemies) < 2:
+            return
+        
+        leader = belief_enemies[0]
+        self.team_belief = TeamBeliefTracker(leader.planner, leader.measurement_interval)
+        for enemy in belief_enemies:
+            enemy.join_team(self.team_belief)
     
-    def _safe_spawn(self, enemy_class, grid_x, grid_y):
-        """벽을 피해서 적을 안전하게 스폰"""
+    def _safe_spawn(self, enemy_class, grid_x, grid_y, *args):
+        """
+        벽을 피해서 적을 안전하게 스폰 (플레이어 스폰과 이어진 빈 칸만)
+        
+        Args:
+            args: 위치 뒤에 넘길 생성자 인자 (PRMEnemy의 level 등)
+        """
+        grid_map = self.level.grid_map
+        height, width = grid_map.shape
+        labels = self.level.static_data('components', component_labels)
+        reachable = labels[self.level.spawn_pos[1], self.level.spawn_pos[0]]
+        
+        def is_safe(gx, gy):
+            return grid_map[gy][gx] == TILE_EMPTY and labels[gy][gx] == reachable
+        
         # 먼저 지정된 위치가 안전한지 확인
-        if self.level.grid_map[grid_y][grid_x] == 0:
-            self.enemies.append(enemy_class(*grid_to_world(grid_x, grid_y)))
+        grid_x = min(max(grid_x, 0), width - 1)
+        grid_y = min(max(grid_y, 0), height - 1)
+        if is_safe(grid_x, grid_y):
+            self.enemies.append(enemy_class(*grid_to_world(grid_x, grid_y), *args))
             return
         
         # 안전하지 않으면 가까운 안전한 위치 찾기 (BFS)
@@ -183,14 +358,14 @@ class Game:
                 
                 if (nx, ny) in visited:
                     continue
-                if nx < 0 or nx >= 40 or ny < 0 or ny >= 22:
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
                     continue
-                    
+                
                 visited.add((nx, ny))
                 
                 # 안전한 위치 발견
-                if self.level.grid_map[ny][nx] == 0:
-                    self.enemies.append(enemy_class(*grid_to_world(nx, ny)))
+                if is_safe(nx, ny):
+                    self.enemies.append(enemy_class(*grid_to_world(nx, ny), *args))
                     return
                 
                 # 계속 탐색 (최대 5칸까지만)
@@ -199,42 +374,7 @@ class Game:
         
         # 안전한 위치를 찾지 못하면 원래 위치에 스폰 (플레이어 시작 위치로)
         px, py = world_to_grid(*self.player.pos)
-        self.enemies.append(enemy_class(*grid_to_world(px + 2, py)))
-    
-    def _safe_spawn_prm(self, grid_x, grid_y):
-        """PRM은 grid_map이 필요하므로 별도 메서드"""
-        if self.level.grid_map[grid_y][grid_x] == 0:
-            self.enemies.append(PRMEnemy(*grid_to_world(grid_x, grid_y), self.level.grid_map))
-            return
-        
-        # BFS로 안전한 위치 찾기
-        from collections import deque
-        visited = set()
-        queue = deque([(grid_x, grid_y, 0)])
-        visited.add((grid_x, grid_y))
-        
-        while queue:
-            cx, cy, dist = queue.popleft()
-            
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]:
-                nx, ny = cx + dx, cy + dy
-                
-                if (nx, ny) in visited:
-                    continue
-                if nx < 0 or nx >= 40 or ny < 0 or ny >= 22:
-                    continue
-                    
-                visited.add((nx, ny))
-                
-                if self.level.grid_map[ny][nx] == 0:
-                    self.enemies.append(PRMEnemy(*grid_to_world(nx, ny), self.level.grid_map))
-                    return
-                
-                if dist < 5:
-                    queue.append((nx, ny, dist + 1))
-        
-        px, py = world_to_grid(*self.player.pos)
-        self.enemies.append(PRMEnemy(*grid_to_world(px + 2, py), self.level.grid_map))
+        self.enemies.append(enemy_class(*grid_to_world(px + 2, py), *args))
     
     def handle_event(self, event):
         """이벤트 처리"""
@@ -267,6 +407,10 @@ class Game:
                 elif self.state == GameState.PAUSED:
                     self.state = GameState.PLAYING
             
+            # F3: 디버그 통계 표시
+            if event.key == pygame.K_F3:
+                self.ui.show_debug = not self.ui.show_debug
+            
             # 게임 오버/클리어 상태
             if self.state in [GameState.GAME_OVER, GameState.STAGE_CLEAR]:
                 if event.key == pygame.K_r:
@@ -355,9 +499,13 @@ class Game:
                 self.sound.play_sound('clear')
                 return
         
+        # 예약표 시간 진행 (지난 스텝의 예약 정리)
+        if self.cooperative is not None:
+            self.cooperative.reservations.advance(dt)
+        
         # 적 업데이트
         for enemy in self.enemies:
-            enemy.update(dt, self.player, self.level)
+            enemy.update_with_fallback(dt, self.player, self.level)
             
             # 충돌 체크
             if enemy.collides_with(self.player):
@@ -371,6 +519,9 @@ class Game:
                         self.sound.play_sound('game_over')
                         return
         
+        # 적들이 요청한 재계획을 프레임 예산 안에서 실행
+        self.replan_scheduler.run(self.player, self.level)
+        
         # 파티클 업데이트
         self.particles.update(dt)
         
@@ -378,13 +529,13 @@ class Game:
         if self.player.is_dashing:
             self.particles.emit_dash_trail(self.player.x, self.player.y, (0, 255, 255))
         
-        # 카메라 업데이트 (플레이어 중심)
-        self.camera_x = self.player.x - SCREEN_WIDTH // 2
-        self.camera_y = self.player.y - SCREEN_HEIGHT // 2
-        
-        # 카메라 경계 제한
-        self.camera_x = max(0, min(self.camera_x, SCREEN_WIDTH - SCREEN_WIDTH))
-        self.camera_y = max(0, min(self.camera_y, SCREEN_HEIGHT - SCREEN_HEIGHT))
+        # 카메라 업데이트 (플레이어 중심, 맵 경계에서 멈춤)
+        self.camera.follow(self.player.x, self.player.y, *self.level.pixel_size)
+    
+    def shutdown(self):
+        """종료 정리 (백그라운드 계획 워커 종료)"""
+        if self.planning_executor is not None:
+            self.planning_executor.shutdown()
     
     def draw(self):
         """게임 그리기"""
@@ -406,16 +557,16 @@ class Game:
             self._draw_level()
             
             # 파티클 그리기 (배경층)
-            self.particles.draw(self.screen, (self.camera_x, self.camera_y))
+            self.particles.draw(self.screen, self.camera.offset)
             
             # 플레이어 그리기
-            self.player.draw(self.screen, (self.camera_x, self.camera_y))
+            self.player.draw(self.screen, self.camera.offset)
             
             # 적 그리기
             for enemy in self.enemies:
-                enemy.draw(self.screen, (self.camera_x, self.camera_y))
+                enemy.draw(self.screen, self.camera.offset)
                 if DEBUG_SHOW_PATHS:
-                    enemy.draw_path(self.screen, (self.camera_x, self.camera_y))
+                    enemy.draw_path(self.screen, self.camera.offset)
             
             # UI 그리기
             self.ui.draw_hud(self.screen, self.player, self.level, self.time_left, self)
@@ -423,58 +574,54 @@ class Game:
         elif self.state == GameState.PAUSED:
             # 일시정지 화면
             self._draw_level()
-            self.player.draw(self.screen, (self.camera_x, self.camera_y))
+            self.player.draw(self.screen, self.camera.offset)
             for enemy in self.enemies:
-                enemy.draw(self.screen, (self.camera_x, self.camera_y))
+                enemy.draw(self.screen, self.camera.offset)
             self.ui.draw_pause(self.screen)
         
         elif self.state in [GameState.GAME_OVER, GameState.STAGE_CLEAR]:
             # 게임 오버/클리어 화면
             self._draw_level()
-            self.player.draw(self.screen, (self.camera_x, self.camera_y))
+            self.player.draw(self.screen, self.camera.offset)
             for enemy in self.enemies:
-                enemy.draw(self.screen, (self.camera_x, self.camera_y))
+                enemy.draw(self.screen, self.camera.offset)
             
             won = self.state == GameState.STAGE_CLEAR
             self.ui.draw_game_over(self.screen, won, self.player.stats, self.stage_num)
     
     def _draw_level(self):
-        """레벨 그리기"""
-        # 타일 그리기
-        for gy in range(self.level.grid_map.shape[0]):
-            for gx in range(self.level.grid_map.shape[1]):
-                tile = self.level.grid_map[gy][gx]
-                
-                if tile == 0:  # 빈 공간
-                    continue
-                
-                # 화면 좌표
-                screen_x = gx * TILE_SIZE - self.camera_x
-                screen_y = gy * TILE_SIZE - self.camera_y
-                
-                # 화면 밖이면 스킵
-                if screen_x + TILE_SIZE < 0 or screen_x > SCREEN_WIDTH:
-                    continue
-                if screen_y + TILE_SIZE < 0 or screen_y > SCREEN_HEIGHT:
-                    continue
-                
-                # 타일 색상
-                if tile == TILE_WALL:
-                    color = COLOR_DARK_GRAY
-                elif tile == TILE_TEMP_WALL:
-                    color = (100, 100, 200)  # 파란 장벽
-                elif tile == TILE_KEY:
-                    color = (255, 255, 0)  # 노랑 열쇠
-                elif tile == TILE_EXIT:
-                    color = (0, 255, 0) if self.level.can_exit() else (100, 100, 100)
-                else:
-                    color = COLOR_WHITE
-                
-                # 타일 그리기
-                pygame.draw.rect(self.screen, color, 
-                               (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
-                
-                # 그리드 선 (디버그)
-                if DEBUG_SHOW_GRID:
-                    pygame.draw.rect(self.screen, (80, 80, 80),
-                                   (screen_x, screen_y, TILE_SIZE, TILE_SIZE), 1)
+        """레벨 그리기 (고정 벽은 캐시된 청크, 동적 타일은 화면에 보이는 범위만)"""
+        self.tile_renderer.draw(self.screen, self.camera)
+        
+        # 동적 오버레이 (임시 장벽/열쇠/출구): 보이는 범위의 오버레이 청크만 펼침
+        gx0, gy0, gx1, gy1 = self.camera.visible_tiles(self.level.width, self.level.height)
+        visible = self.level.overlay.window(gx0, gy0, gx1, gy1)
+        ys, xs = np.nonzero(visible != TILE_EMPTY)
+        
+        for gy, gx in zip(ys, xs):
+            tile = visible[gy][gx]
+            gx += gx0
+            gy += gy0
+            
+            # 타일 색상
+            if tile == TILE_TEMP_WALL:
+                color = (100, 100, 200)  # 파란 장벽
+            elif tile == TILE_KEY:
+                color = (255, 255, 0)  # 노랑 열쇠
+            elif tile == TILE_EXIT:
+                color = (0, 255, 0) if self.level.can_exit() else (100, 100, 100)
+            else:
+                color = COLOR_WHITE
+            
+            # 화면 좌표
+            screen_x = gx * TILE_SIZE - self.camera.x
+            screen_y = gy * TILE_SIZE - self.camera.y
+            
+            # 타일 그리기
+            pygame.draw.rect(self.screen, color, 
+                           (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
+            
+            # 그리드 선 (디버그)
+            if DEBUG_SHOW_GRID:
+                pygame.draw.rect(self.screen, (80, 80, 80),
+                               (screen_x, screen_y, TILE_SIZE, TILE_SIZE), 1)
@@ -0,0 +1,25 @@
+"""
+이벤트 구독/발행
+레벨/플레이어의 상태 변화를 적들에게 알려 필요할 때만 재계획하게 함
+"""
+
+
+class EventSource:
+    """이벤트 이름별 콜백 목록 (상속해서 subscribe/emit 사용)"""
+    
+    def __init__(self):
+        self._listeners = {}
+    
+    def subscribe(self, event, callback):
+        """event가 발생하면 callback(*args) 호출"""
+        self._listeners.setdefault(event, []).append(callback)
+    
+    def unsubscribe(self, event, callback):
+        listeners = self._listeners.get(event)
+        if listeners and callback in listeners:
+            listeners.remove(callback)
+    
+    def emit(self, event, *args):
+        """구독자 호출 (콜백 안에서 구독이 바뀌어도 안전하도록 복사본 순회)"""
+        for callback in list(self._listeners.get(event, ())):
+            callback(*args)
@@ -16,19 +16,27 @@ def world_to_grid(x, y):
     return int(x // TILE_SIZE), int(y // TILE_SIZE)
 
 
-def is_valid_grid(gx, gy):
-    """그리드 좌표가 유효한지 확인"""
-    return 0 <= gx < GRID_WIDTH and 0 <= gy < GRID_HEIGHT
+def is_valid_grid(gx, gy, grid_map=None):
+    """그리드 좌표가 유효한지 확인 (grid_map을 주면 그 맵의 크기 기준, 없으면 기본 맵 크기)"""
+    if grid_map is None:
+        return 0 <= gx < GRID_WIDTH and 0 <= gy < GRID_HEIGHT
+    return 0 <= gx < len(grid_map[0]) and 0 <= gy < len(grid_map)
 
 
 def is_walkable(grid_map, gx, gy):
     """해당 그리드 타일을 걸어갈 수 있는지 확인"""
-    if not is_valid_grid(gx, gy):
+    if not is_valid_grid(gx, gy, grid_map):
         return False
     tile = grid_map[gy][gx]
     return tile != TILE_WALL and tile != TILE_TEMP_WALL
 
 
+def walkable_mask(grid_map):
+    """이동 가능한 타일을 True로 표시한 bool 배열 반환 (벡터화 연산용)"""
+    grid_map = np.asarray(grid_map)
+    return (grid_map != TILE_WALL) & (grid_map != TILE_TEMP_WALL)
+
+
 def get_neighbors(gx, gy, grid_map, diagonal=True):
     """인접한 이동 가능한 그리드 좌표들을 반환"""
     neighbors = []
@@ -80,6 +88,69 @@ def line_of_sight(grid_map, start, end):
             y += sy
 
 
+def segment_clear(grid_map, start, end):
+    """
+    두 타일 중심을 잇는 선분이 지나는 모든 타일이 이동 가능한지 확인 (supercover)
+    
+    Bresenham과 달리 선분이 스치는 타일도 모두 검사하고, 타일 꼭짓점을 정확히 지나면
+    양쪽 직교 타일이 모두 비어 있어야 함 (A*의 대각선 모서리 통과 금지와 같은 규칙).
+    적은 중심이 들어간 타일로만 벽 충돌을 판정하므로 이 검사를 통과한 구간은 그대로 따라갈 수 있다.
+    """
+    x, y = start
+    x1, y1 = end
+    dx = abs(x1 - x)
+    dy = abs(y1 - y)
+    sx = 1 if x < x1 else -1
+    sy = 1 if y < y1 else -1
+    
+    if not is_walkable(grid_map, x, y):
+        return False
+    
+    ix = iy = 0
+    while ix < dx or iy < dy:
+        # 다음 세로 경계((0.5 + ix) / dx)와 가로 경계((0.5 + iy) / dy) 중 먼저 만나는 쪽으로
+        decision = (1 + 2 * ix) * dy - (1 + 2 * iy) * dx
+        if decision == 0:
+            # 꼭짓점 통과
+            if not (is_walkable(grid_map, x + sx, y) and is_walkable(grid_map, x, y + sy)):
+                return False
+            x += sx
+            y += sy
+            ix += 1
+            iy += 1
+        elif decision < 0:
+            x += sx
+            ix += 1
+        else:
+            y += sy
+            iy += 1
+        
+        if not is_walkable(grid_map, x, y):
+            return False
+    
+    return True
+
+
+def path_blocked_by(grid_map, points, tiles):
+    """
+    경로 구간(연속한 점 사이 직선) 중 tiles 근처를 지나는 구간이 막혔는지 확인
+    
+    구간의 바운딩 박스에 바뀐 타일이 있을 때만 segment_clear로 검사하므로
+    경로가 길어도 대부분의 구간은 비교만 하고 넘어감
+    """
+    if len(points) == 1:
+        return points[0] in tiles
+    for prev, point in zip(points, points[1:]):
+        x0, x1 = min(prev[0], point[0]), max(prev[0], point[0])
+        y0, y1 = min(prev[1], point[1]), max(prev[1], point[1])
+        for tx, ty in tiles:
+            if x0 <= tx <= x1 and y0 <= ty <= y1:
+                if not segment_clear(grid_map, prev, point):
+                    return True
+                break
+    return False
+
+
 def distance_grid(p1, p2):
     """두 그리드 좌표 사이의 유클리드 거리"""
     return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
@@ -90,7 +161,7 @@ def distance_world(p1, p2):
     return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
 
-def get_rectangle_tiles(center_x, center_y, width, height):
+def get_rectangle_tiles(center_x, center_y, width, height, grid_map=None):
     """중심점 기준 사각형 영역의 그리드 타일들을 반환"""
     tiles = []
     half_w = width // 2
@@ -99,7 +170,7 @@ def get_rectangle_tiles(center_x, center_y, width, height):
     for dy in range(-half_h, half_h + 1):
         for dx in range(-half_w, half_w + 1):
             gx, gy = center_x + dx, center_y + dy
-            if is_valid_grid(gx, gy):
+            if is_valid_grid(gx, gy, grid_map):
                 tiles.append((gx, gy))
     
     return tiles
@@ -116,7 +187,7 @@ def check_collision_circle(x, y, radius, grid_map):
     # 경계 상자 내의 모든 타일 체크
     for gy in range(gy_min, gy_max + 1):
         for gx in range(gx_min, gx_max + 1):
-            if not is_valid_grid(gx, gy):
+            if not is_valid_grid(gx, gy, grid_map):
                 return True
             
             if not is_walkable(grid_map, gx, gy):
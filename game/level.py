@@ -3,33 +3,110 @@
 """
 
 import numpy as np
-import random
+import heapq
+from collections import deque
+from algos.planner import NavGrid
+from algos.path_cache import PathCache
+from game.events import EventSource
+from game.chunks import ChunkedTileMap
+from game.mapgen import make_rng, stamp_rectangles, connect_points, place_keys
+from game.levelfile import load_level_file
 from config import (
-    GRID_WIDTH, GRID_HEIGHT, TILE_EMPTY, TILE_WALL, TILE_TEMP_WALL, 
-    TILE_KEY, TILE_EXIT, KEYS_REQUIRED
+    GRID_WIDTH, GRID_HEIGHT, RANDOM_MAP_WIDTH, RANDOM_MAP_HEIGHT, TILE_SIZE,
+    TILE_EMPTY, TILE_WALL, TILE_TEMP_WALL, 
+    TILE_KEY, TILE_EXIT, KEYS_REQUIRED, PATH_CACHE_SIZE, MAP_JOURNAL_SIZE,
+    LEVEL_SEED, KEY_MIN_SPAWN_DIST, KEY_MIN_SPACING
 )
 
 
-class Level:
-    """게임 레벨을 관리하는 클래스"""
+class Level(EventSource):
+    """게임 레벨을 관리하는 클래스
     
-    def __init__(self, stage_num=1):
+    맵은 두 층으로 나뉜다.
+    - static_map: 생성 직후의 고정 벽만 담은 읽기 전용 맵 (스테이지 동안 바뀌지 않음)
+    - 동적 오버레이: 임시 장벽(temp_walls)과 열쇠/출구 (overlay 청크 저장소, grid_map에 합성되어 있음)
+    고정 벽에서만 유도되는 데이터는 static_data로 한 번 만들어 스테이지 내내 공유하고,
+    질의 시 grid_map과 비교해 오버레이만 반영한다.
+    오버레이는 청크마다 버전이 있어서 NavGrid는 바뀐 청크 영역만 다시 계산한다.
+    
+    이벤트:
+        'tile_changed' (level, tiles, blocked): 임시 장벽 설치(blocked=True)/만료(False)
+    """
+    
+    def __init__(self, stage_num=1, seed=LEVEL_SEED, path=None):
+        """
+        Args:
+            stage_num: 스테이지 번호 (7 이상은 절차적 생성)
+            seed: 맵 생성 시드 ((stage_num, seed)가 같으면 같은 맵, None이면 매번 다름)
+            path: 레벨 파일 경로 (주어지면 생성 대신 파일에서 불러옴)
+        """
+        super().__init__()
         self.stage_num = stage_num
+        self.seed = seed
+        self.rng = make_rng(stage_num, seed)
         self.grid_map = None
+        self.static_map = None
+        self.overlay = None
+        self._static_data = {}
+        
+        # 맵 크기 (타일 단위, 화면 크기와 무관)
+        self.width = 0
+        self.height = 0
         self.spawn_pos = None
         self.exit_pos = None
         self.key_positions = []
         self.keys_collected = 0
         
-        # 임시 장벽 관리 (위치, 남은 시간)
+        # 임시 장벽 관리: 만료 시각 기준 최소 힙 [(만료 시각, 위치), ...]
         self.temp_walls = []
         
-        self.generate_level()
+        # 레벨 경과 시간 (공유 타이머용)
+        self.elapsed_time = 0.0
+        
+        # 이동 가능 영역이 바뀔 때마다 증가 (맵 버전별 캐시 무효화용)
+        self.map_version = 0
+        self._nav = None
+        self._snapshot = None
+        self._nav_stamp = 0  # _nav를 만들 때의 overlay.version
+        self._snapshot_stamp = 0
+        
+        # 맵 변경 기록 [(맵 버전, 막힌 타일들, 열린 타일들), ...] (changes_since로 조회)
+        self.journal = deque(maxlen=MAP_JOURNAL_SIZE)
+        
+        # 적들이 공유하는 경로 질의 캐시 (변경 기록으로 영향받은 경로만 무효화)
+        self.path_cache = PathCache(PATH_CACHE_SIZE, self.changes_since)
+        
+        if path is not None:
+            self.load_level(path)
+        else:
+            self.generate_level()
+    
+    def load_level(self, path):
+        """레벨 파일에서 불러오기 (고정 벽 레이어는 파일을 memmap한 읽기 전용 배열 그대로 사용)"""
+        level_file = load_level_file(path)
+        
+        self.static_map = level_file.tiles
+        self.height, self.width = level_file.tiles.shape
+        self.grid_map = np.array(level_file.tiles, dtype=int)
+        self.spawn_pos = level_file.spawn
+        self.exit_pos = level_file.exit_pos
+        self.grid_map[self.exit_pos[1]][self.exit_pos[0]] = TILE_EXIT
+        self.key_positions = list(level_file.keys)
+        for x, y in self.key_positions:
+            self.grid_map[y][x] = TILE_KEY
+        
+        # 파일에 들어 있는 사전 계산 섹션은 static_data로 바로 제공
+        self._static_data = dict(level_file.sections)
+        self._build_overlay()
     
     def generate_level(self):
         """레벨 생성"""
-        # 빈 맵 초기화
-        self.grid_map = np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=int)
+        # 빈 맵 초기화 (1~6은 고정 설계 맵이라 기본 크기, 절차적 맵은 더 넓게)
+        if self.stage_num <= 6:
+            self.width, self.height = GRID_WIDTH, GRID_HEIGHT
+        else:
+            self.width, self.height = RANDOM_MAP_WIDTH, RANDOM_MAP_HEIGHT
+        self.grid_map = np.zeros((self.height, self.width), dtype=int)
         
         # 외벽 생성
         self.grid_map[0, :] = TILE_WALL
@@ -54,27 +131,46 @@ class Level:
             self._generate_random()
         
         # 플레이어 시작 위치 설정 (안전 확보)
-        self.spawn_pos = (5, GRID_HEIGHT // 2)
+        self.spawn_pos = (5, self.height // 2)
         # 스폰 지역 주변 클리어 (3x3)
         for dy in range(-1, 2):
             for dx in range(-1, 2):
                 sx, sy = self.spawn_pos[0] + dx, self.spawn_pos[1] + dy
-                if 0 < sx < GRID_WIDTH - 1 and 0 < sy < GRID_HEIGHT - 1:
+                if 0 < sx < self.width - 1 and 0 < sy < self.height - 1:
                     self.grid_map[sy][sx] = TILE_EMPTY
         
         # 출구 위치 설정
-        self.exit_pos = (GRID_WIDTH - 6, GRID_HEIGHT // 2)
+        self.exit_pos = (self.width - 6, self.height // 2)
         self.grid_map[self.exit_pos[1]][self.exit_pos[0]] = TILE_EXIT
         # 출구 주변도 클리어
         for dy in range(-1, 2):
             for dx in range(-1, 2):
                 ex, ey = self.exit_pos[0] + dx, self.exit_pos[1] + dy
-                if 0 < ex < GRID_WIDTH - 1 and 0 < ey < GRID_HEIGHT - 1:
+                if 0 < ex < self.width - 1 and 0 < ey < self.height - 1:
                     if self.grid_map[ey][ex] != TILE_EXIT:
                         self.grid_map[ey][ex] = TILE_EMPTY
         
+        # 출구가 스폰과 이어지도록 (끊겨 있으면 복도를 뚫음)
+        connect_points(self.grid_map, self.spawn_pos, [self.exit_pos])
+        
         # 열쇠 배치
         self._place_keys()
+        
+        # 고정 벽 레이어 (열쇠/출구는 이동 가능하므로 빈 칸으로 취급)
+        self.static_map = np.where(self.grid_map == TILE_WALL, TILE_WALL, TILE_EMPTY)
+        self.static_map.setflags(write=False)
+        self._static_data.clear()
+        self._build_overlay()
+    
+    def _build_overlay(self):
+        """grid_map에서 고정 벽을 뺀 동적 오버레이 저장소 생성 (열쇠/출구가 있는 청크만 할당)"""
+        self.overlay = ChunkedTileMap.from_dense(
+            np.where(self.grid_map == TILE_WALL, TILE_EMPTY, self.grid_map))
+    
+    def _set_tile(self, grid_x, grid_y, tile):
+        """동적 타일 쓰기 (grid_map과 오버레이 청크를 함께 갱신)"""
+        self.grid_map[grid_y][grid_x] = tile
+        self.overlay.set(grid_x, grid_y, tile)
     
     def _generate_stage1(self):
         """스테이지 1: 기본 맵 (Bug1 학습용)"""
@@ -92,7 +188,7 @@ class Level:
     def _generate_stage2(self):
         """스테이지 2: U자 구조 (APF 로컬 미니멈 유도용)"""
         # 중앙에 U자 구조 만들기 (더 넓게)
-        cx, cy = GRID_WIDTH // 2, GRID_HEIGHT // 2
+        cx, cy = self.width // 2, self.height // 2
         
         # 왼쪽 벽
         for i in range(cy - 5, cy + 5):
@@ -108,8 +204,8 @@ class Level:
         
         # 추가 작은 장애물들 (스폰 지역은 피함)
         for i in range(5):
-            x = random.randint(15, GRID_WIDTH - 10)
-            y = random.randint(8, GRID_HEIGHT - 8)
+            x = int(self.rng.integers(15, self.width - 9))
+            y = int(self.rng.integers(8, self.height - 7))
             if self.grid_map[y][x] == TILE_EMPTY:
                 self.grid_map[y][x] = TILE_WALL
     
@@ -133,8 +229,8 @@ class Level:
                 self.grid_map[y + i][x + w - 1] = TILE_WALL
             
             # 출입구 2개 (더 많은 경로)
-            door1 = random.randint(1, w - 2)
-            door2 = random.randint(1, h - 2)
+            door1 = int(self.rng.integers(1, w - 1))
+            door2 = int(self.rng.integers(1, h - 1))
             self.grid_map[y][x + door1] = TILE_EMPTY
             self.grid_map[y + door2][x] = TILE_EMPTY
     
@@ -159,16 +255,16 @@ class Level:
                 self.grid_map[y + i][x + w - 1] = TILE_WALL
             
             # 출입구 2개
-            door1 = random.randint(1, w - 2)
-            door2 = random.randint(1, h - 2)
+            door1 = int(self.rng.integers(1, w - 1))
+            door2 = int(self.rng.integers(1, h - 1))
             self.grid_map[y][x + door1] = TILE_EMPTY
             self.grid_map[y + door2][x] = TILE_EMPTY
     
     def _generate_stage5(self):
         """스테이지 5: Belief용 - 시야 차단 많은 맵"""
         # 기둥들이 많은 맵
-        for y in range(5, GRID_HEIGHT - 5, 4):
-            for x in range(8, GRID_WIDTH - 8, 5):
+        for y in range(5, self.height - 5, 4):
+            for x in range(8, self.width - 8, 5):
                 # 2x2 기둥
                 self.grid_map[y][x] = TILE_WALL
                 self.grid_map[y][x + 1] = TILE_WALL
@@ -183,118 +279,158 @@ class Level:
     
     def _generate_stage6(self):
         """스테이지 6: 보스전 - 넓은 아레나"""
-        cx, cy = GRID_WIDTH // 2, GRID_HEIGHT // 2
+        cx, cy = self.width // 2, self.height // 2
         
         # 모서리에만 작은 장애물 배치 (전략적 엄폐용)
         corners = [
             (8, 5, 3, 3),   # 좌상단
-            (GRID_WIDTH - 11, 5, 3, 3),  # 우상단
-            (8, GRID_HEIGHT - 8, 3, 3),  # 좌하단
-            (GRID_WIDTH - 11, GRID_HEIGHT - 8, 3, 3),  # 우하단
+            (self.width - 11, 5, 3, 3),  # 우상단
+            (8, self.height - 8, 3, 3),  # 좌하단
+            (self.width - 11, self.height - 8, 3, 3),  # 우하단
         ]
         
         for x, y, w, h in corners:
             for dy in range(h):
                 for dx in range(w):
-                    if 0 < x + dx < GRID_WIDTH - 1 and 0 < y + dy < GRID_HEIGHT - 1:
+                    if 0 < x + dx < self.width - 1 and 0 < y + dy < self.height - 1:
                         self.grid_map[y + dy][x + dx] = TILE_WALL
         
         # 중앙에 작은 십자가 기둥 (시야 차단 최소화)
         for i in range(-2, 3):
-            if 0 < cx + i < GRID_WIDTH - 1:
+            if 0 < cx + i < self.width - 1:
                 self.grid_map[cy][cx + i] = TILE_WALL
-            if 0 < cy + i < GRID_HEIGHT - 1:
+            if 0 < cy + i < self.height - 1:
                 self.grid_map[cy + i][cx] = TILE_WALL
         
         # 십자가 중앙은 비우기
         self.grid_map[cy][cx] = TILE_EMPTY
     
     def _generate_random(self):
-        """랜덤 장애물 배치"""
-        num_obstacles = 20 + self.stage_num * 5
-        
-        for _ in range(num_obstacles):
-            # 랜덤 위치
-            x = random.randint(3, GRID_WIDTH - 3)
-            y = random.randint(3, GRID_HEIGHT - 3)
-            
-            # 랜덤 크기 (1x1 ~ 4x4)
-            w = random.randint(1, 4)
-            h = random.randint(1, 4)
-            
-            for dy in range(h):
-                for dx in range(w):
-                    nx, ny = x + dx, y + dy
-                    if 0 < nx < GRID_WIDTH - 1 and 0 < ny < GRID_HEIGHT - 1:
-                        if self.grid_map[ny][nx] == TILE_EMPTY:
-                            self.grid_map[ny][nx] = TILE_WALL
+        """랜덤 장애물 배치 (1x1 ~ 4x4 사각형, 개수는 기본 맵 대비 넓이에 비례)"""
+        area_ratio = (self.width * self.height) / (GRID_WIDTH * GRID_HEIGHT)
+        count = int((20 + self.stage_num * 5) * area_ratio)
+        stamp_rectangles(self.grid_map, self.rng, count, max_size=4)
     
     def _place_keys(self):
-        """열쇠 배치"""
-        self.key_positions = []
-        placed = 0
-        attempts = 0
-        max_attempts = 100
-        
-        while placed < KEYS_REQUIRED and attempts < max_attempts:
-            x = random.randint(5, GRID_WIDTH - 5)
-            y = random.randint(5, GRID_HEIGHT - 5)
-            
-            if self.grid_map[y][x] == TILE_EMPTY:
-                # 스폰 위치와 충분히 멀리 떨어진 곳에만 배치
-                dist = abs(x - self.spawn_pos[0]) + abs(y - self.spawn_pos[1])
-                if dist > 10:
-                    self.grid_map[y][x] = TILE_KEY
-                    self.key_positions.append((x, y))
-                    # 주변 3x3 클리어 (접근 가능하도록)
-                    for dy in range(-1, 2):
-                        for dx in range(-1, 2):
-                            kx, ky = x + dx, y + dy
-                            if 0 < kx < GRID_WIDTH - 1 and 0 < ky < GRID_HEIGHT - 1:
-                                if self.grid_map[ky][kx] == TILE_WALL:
-                                    self.grid_map[ky][kx] = TILE_EMPTY
-                    placed += 1
-            
-            attempts += 1
+        """열쇠 배치 (스폰에서 도달 가능한 칸 중 스폰에서 멀고 서로 떨어진 곳)"""
+        self.key_positions = place_keys(self.grid_map, self.rng, self.spawn_pos, KEYS_REQUIRED,
+                                        KEY_MIN_SPAWN_DIST, KEY_MIN_SPACING, avoid=[self.exit_pos])
     
     def collect_key(self, grid_x, grid_y):
         """열쇠 수집"""
         if self.grid_map[grid_y][grid_x] == TILE_KEY:
-            self.grid_map[grid_y][grid_x] = TILE_EMPTY
+            self._set_tile(grid_x, grid_y, TILE_EMPTY)
             self.keys_collected += 1
             if (grid_x, grid_y) in self.key_positions:
                 self.key_positions.remove((grid_x, grid_y))
             return True
         return False
     
+    @property
+    def pixel_size(self):
+        """맵 전체 크기 (월드 픽셀 단위, 카메라 제한용)"""
+        return self.width * TILE_SIZE, self.height * TILE_SIZE
+    
     def can_exit(self):
         """출구로 나갈 수 있는지 확인"""
         return self.keys_collected >= KEYS_REQUIRED
     
+    def get_nav(self):
+        """현재 맵 버전의 NavGrid (플래너 공통 인터페이스용, 버전이 바뀔 때만 새로 만듦)"""
+        if self._nav is None or self._nav.map_version != self.map_version:
+            self._nav = self._build_nav(self._nav, self._nav_stamp, self.grid_map)
+            self._nav_stamp = self.overlay.version
+        return self._nav
+    
+    def get_snapshot(self):
+        """백그라운드 계획용 읽기 전용 NavGrid (맵을 복사해 이후 변경과 분리, 버전마다 한 번)"""
+        if self._snapshot is None or self._snapshot.map_version != self.map_version:
+            grid_map = self.grid_map.copy()
+            grid_map.setflags(write=False)
+            self._snapshot = self._build_nav(self._snapshot, self._snapshot_stamp, grid_map)
+            self._snapshot_stamp = self.overlay.version
+        return self._snapshot
+    
+    def _build_nav(self, previous, stamp, grid_map):
+        """
+        NavGrid 생성 (previous가 있으면 stamp 이후 바뀐 오버레이 청크 영역만 다시 계산)
+        
+        바뀐 청크가 맵의 절반을 넘으면 처음부터 계산하는 편이 빠르다.
+        """
+        if previous is not None:
+            dirty = self.overlay.changed_chunks(stamp)
+            if len(dirty) * 2 <= self.overlay.chunks_x * self.overlay.chunks_y:
+                windows = [self.overlay.chunk_bounds(cx, cy) for cx, cy in dirty]
+                return NavGrid.patched(previous, grid_map, self.map_version, windows)
+        return NavGrid(grid_map, self.map_version)
+    
+    def static_data(self, key, build):
+        """
+        고정 벽 레이어에서 유도한 공유 데이터 (키마다 스테이지당 한 번 build(static_map) 호출)
+        
+        임시 장벽이 생기거나 사라져도 다시 만들지 않으므로, 사용하는 쪽이 질의할 때
+        grid_map과 비교해 오버레이를 반영해야 한다.
+        """
+        if key not in self._static_data:
+            self._static_data[key] = build(self.static_map)
+        return self._static_data[key]
+    
+    def changes_since(self, version):
+        """
+        version 이후의 맵 변경 (같은 타일이 막혔다 열렸으면 서로 상쇄)
+        
+        Returns:
+            (막힌 타일 set, 열린 타일 set), 기록이 잘려 알 수 없으면 None
+        """
+        if version is None or version > self.map_version:
+            return None
+        if self.journal and version < self.journal[0][0] - 1:
+            return None
+        
+        added, removed = set(), set()
+        for entry_version, blocked, opened in self.journal:
+            if entry_version <= version:
+                continue
+            for tile in blocked:
+                if tile in removed:
+                    removed.discard(tile)
+                else:
+                    added.add(tile)
+            for tile in opened:
+                if tile in added:
+                    added.discard(tile)
+                else:
+                    removed.add(tile)
+        return added, removed
+    
+    def _record_change(self, blocked, opened):
+        """맵 버전을 올리고 변경 기록 추가"""
+        self.map_version += 1
+        self.journal.append((self.map_version, tuple(blocked), tuple(opened)))
+    
     def add_temp_wall(self, grid_x, grid_y, duration):
         """임시 장벽 추가"""
         if self.grid_map[grid_y][grid_x] == TILE_EMPTY:
-            self.grid_map[grid_y][grid_x] = TILE_TEMP_WALL
-            self.temp_walls.append(((grid_x, grid_y), duration))
+            self._set_tile(grid_x, grid_y, TILE_TEMP_WALL)
+            heapq.heappush(self.temp_walls, (self.elapsed_time + duration, (grid_x, grid_y)))
+            self._record_change([(grid_x, grid_y)], ())
+            self.emit('tile_changed', self, [(grid_x, grid_y)], True)
             return True
         return False
     
     def update(self, dt):
         """레벨 업데이트 (임시 장벽 타이머 등)"""
-        # 임시 장벽 시간 감소
-        walls_to_remove = []
+        self.elapsed_time += dt
         
-        for i, (pos, time_left) in enumerate(self.temp_walls):
-            time_left -= dt
-            self.temp_walls[i] = (pos, time_left)
-            
-            if time_left <= 0:
-                walls_to_remove.append(i)
-                # 맵에서 제거
-                gx, gy = pos
-                if self.grid_map[gy][gx] == TILE_TEMP_WALL:
-                    self.grid_map[gy][gx] = TILE_EMPTY
-        
-        # 제거할 장벽들 삭제 (역순으로)
-        for i in reversed(walls_to_remove):
-            del self.temp_walls[i]
+        # 만료된 임시 장벽만 힙에서 꺼내 제거 (한 프레임의 만료는 한 번의 버전 변경)
+        opened = []
+        while self.temp_walls and self.temp_walls[0][0] <= self.elapsed_time:
+            _, pos = heapq.heappop(self.temp_walls)
+            gx, gy = pos
+            if self.grid_map[gy][gx] == TILE_TEMP_WALL:
+                self._set_tile(gx, gy, TILE_EMPTY)
+                opened.append(pos)
+        
+        if opened:
+            self._record_change((), opened)
+            self.emit('tile_changed', self, opened, False)
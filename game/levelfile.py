@@ -0,0 +1,183 @@
+"""
+레벨 파일 포맷 (.lvl)
+고정 벽 타일 + 스폰/출구/열쇠 + 선택적 사전 계산 내비게이션 섹션을 하나의 바이너리로 저장
+
+구조 (리틀 엔디언):
+    헤더       magic, 포맷 버전, 너비, 높이, 스폰, 출구, 열쇠 수, 섹션 수, CRC32
+    열쇠       (x, y) * 열쇠 수
+    섹션 표    (이름, dtype, 행, 열, 오프셋, 바이트 수) * 섹션 수
+    섹션 데이터 SECTION_ALIGN 바이트 정렬 ('tiles'는 항상 있음, uint8 고정 벽 레이어)
+
+섹션은 np.memmap으로 열기 때문에 큰 맵도 실제로 읽는 부분만 디스크에서 가져옴 (복사 없음).
+CRC32는 헤더 뒤의 모든 바이트에 대해 계산한다.
+"""
+
+import os
+import struct
+import zlib
+import numpy as np
+from config import TILE_WALL, TILE_EMPTY, LEVEL_DIR
+
+MAGIC = b'PFLV'
+FORMAT_VERSION = 1
+SECTION_ALIGN = 64
+
+_HEADER = struct.Struct('<4sHHIIiiiiIII')
+_KEY = struct.Struct('<ii')
+_SECTION = struct.Struct('<16s8sIIQQ')
+
+
+class LevelFile:
+    """읽어 들인 레벨 파일 (tiles와 sections는 읽기 전용 memmap)"""
+    
+    def __init__(self, path, version, tiles, spawn, exit_pos, keys, sections):
+        self.path = path
+        self.version = version
+        self.tiles = tiles
+        self.spawn = spawn
+        self.exit_pos = exit_pos
+        self.keys = keys
+        self.sections = sections  # 'tiles'를 제외한 이름 -> 배열
+
+
+def save_level_file(path, tiles, spawn, exit_pos, keys, sections=None):
+    """
+    레벨 파일 저장
+    
+    Args:
+        tiles: 2D 배열 (벽이면 벽, 나머지는 빈 칸으로 저장)
+        spawn, exit_pos: (x, y)
+        keys: [(x, y), ...]
+        sections: 이름 -> 1~2차원 numpy 배열 (사전 계산한 내비게이션 데이터 등,
+                  불러올 때 Level.static_data의 같은 키로 들어감)
+    """
+    height, width = tiles.shape
+    arrays = [('tiles', np.where(np.asarray(tiles) == TILE_WALL, TILE_WALL, TILE_EMPTY).astype(np.uint8))]
+    for name, array in (sections or {}).items():
+        if name == 'tiles' or len(name.encode()) > 16:
+            raise ValueError(f"잘못된 섹션 이름: {name}")
+        array = np.ascontiguousarray(array)
+        if array.ndim == 1:
+            array = array.reshape(-1, 1)
+        if array.ndim != 2 or array.size == 0:
+            raise ValueError(f"섹션은 비어 있지 않은 1~2차원 배열이어야 함: {name}")
+        arrays.append((name, array))
+    
+    # 섹션 데이터 위치 계산 (헤더/열쇠/섹션 표 뒤, 정렬)
+    offset = _HEADER.size + _KEY.size * len(keys) + _SECTION.size * len(arrays)
+    table = []
+    for name, array in arrays:
+        offset = -(-offset // SECTION_ALIGN) * SECTION_ALIGN
+        rows, cols = array.shape
+        table.append((name, array, rows, cols, offset))
+        offset += array.nbytes
+    
+    body = bytearray()
+    for x, y in keys:
+        body += _KEY.pack(x, y)
+    for name, array, rows, cols, data_offset in table:
+        body += _SECTION.pack(name.encode(), array.dtype.str.encode(), rows, cols,
+                              data_offset, array.nbytes)
+    for name, array, rows, cols, data_offset in table:
+        body += bytes(data_offset - _HEADER.size - len(body))
+        body += array.tobytes()
+    
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, width, height, spawn[0], spawn[1],
+                          exit_pos[0], exit_pos[1], len(keys), len(table), zlib.crc32(body))
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+
+
+def load_level_file(path, verify=True):
+    """
+    레벨 파일 열기 (섹션은 memmap, 실제 데이터는 접근할 때 읽힘)
+    
+    Args:
+        verify: CRC32 검사 (파일 전체를 한 번 읽음)
+    
+    Raises:
+        ValueError: 형식/버전이 맞지 않거나 체크섬이 다름
+    """
+    with open(path, 'rb') as f:
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"레벨 파일이 너무 짧음: {path}")
+        (magic, version, _, width, height, sx, sy, ex, ey,
+         num_keys, num_sections, checksum) = _HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError(f"레벨 파일이 아님: {path}")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 레벨 파일 버전 {version}: {path}")
+        
+        keys = [_KEY.unpack(f.read(_KEY.size)) for _ in range(num_keys)]
+        entries = [_SECTION.unpack(f.read(_SECTION.size)) for _ in range(num_sections)]
+    
+    if verify and _checksum(path) != checksum:
+        raise ValueError(f"레벨 파일 체크섬 불일치: {path}")
+    
+    sections = {}
+    for name, dtype, rows, cols, offset, nbytes in entries:
+        name = name.rstrip(b'\0').decode()
+        array = np.memmap(path, dtype=np.dtype(dtype.rstrip(b'\0').decode()), mode='r',
+                          offset=offset, shape=(rows, cols))
+        sections[name] = array
+    
+    tiles = sections.pop('tiles', None)
+    if tiles is None or tiles.shape != (height, width):
+        raise ValueError(f"타일 섹션이 없거나 크기가 다름: {path}")
+    
+    return LevelFile(path, version, tiles, (sx, sy), (ex, ey),
+                     [tuple(k) for k in keys], sections)
+
+
+def find_level_file(stage_num):
+    """LEVEL_DIR에 해당 스테이지 파일이 있으면 경로, 없으면 None (코드로 생성)"""
+    path = os.path.join(LEVEL_DIR, f"stage{stage_num}.lvl")
+    return path if os.path.exists(path) else None
+
+
+def _checksum(path, chunk_size=1 << 20):
+    """헤더 뒤 전체 바이트의 CRC32 (큰 파일도 조각으로 읽음)"""
+    crc = 0
+    with open(path, 'rb') as f:
+        f.seek(_HEADER.size)
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def export_builtin_stages(out_dir, seed=0, stages=range(1, 7)):
+    """
+    내장 스테이지(코드로 생성하는 1~6)를 레벨 파일로 내보내기
+    
+    연결 요소 라벨('components')을 사전 계산 섹션으로 함께 저장한다.
+    
+    Returns:
+        저장한 파일 경로 리스트
+    """
+    from game.level import Level
+    from game.mapgen import component_labels
+    
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for stage in stages:
+        level = Level(stage, seed)
+        path = os.path.join(out_dir, f"stage{stage}.lvl")
+        save_level_file(path, level.static_map, level.spawn_pos, level.exit_pos,
+                        level.key_positions,
+                        {'components': component_labels(level.static_map).astype(np.int32)})
+        paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="내장 스테이지를 레벨 파일로 내보내기")
+    parser.add_argument('out_dir', nargs='?', default=LEVEL_DIR)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    for exported in export_builtin_stages(args.out_dir, args.seed):
+        print(exported)
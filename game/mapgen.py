@@ -0,0 +1,118 @@
+"""
+절차적 레벨 생성 (NumPy 기반, (스테이지, 시드)로 재현 가능)
+사각형 장애물 찍기, 연결 요소 검사/복도 뚫기, 도달 가능한 위치에서 열쇠 샘플링
+"""
+
+import numpy as np
+from scipy import ndimage
+from config import TILE_EMPTY, TILE_WALL, TILE_KEY
+
+
+def make_rng(stage_num, seed=None):
+    """스테이지별 난수 생성기 (seed가 None이면 실행마다 다른 맵)"""
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng([seed, stage_num])
+
+
+def stamp_rectangles(grid_map, rng, count, max_size=4, margin=3):
+    """
+    무작위 사각형 벽을 count개 찍기 (외벽 안쪽만, 크기 1 ~ max_size)
+    
+    사각형 네 모서리에 +1/-1을 더한 차분 배열을 누적합하면 덮인 칸이 양수가 되므로
+    사각형 개수와 관계없이 배열 연산 몇 번으로 끝남
+    """
+    height, width = grid_map.shape
+    x0 = rng.integers(margin, width - margin + 1, size=count)
+    y0 = rng.integers(margin, height - margin + 1, size=count)
+    # 외벽을 넘지 않도록 잘라냄
+    x1 = np.minimum(x0 + rng.integers(1, max_size + 1, size=count), width - 1)
+    y1 = np.minimum(y0 + rng.integers(1, max_size + 1, size=count), height - 1)
+    
+    stride = width + 1
+    size = (height + 1) * stride
+    plus = np.concatenate([y0 * stride + x0, y1 * stride + x1])
+    minus = np.concatenate([y0 * stride + x1, y1 * stride + x0])
+    diff = np.bincount(plus, minlength=size) - np.bincount(minus, minlength=size)
+    diff = diff.reshape(height + 1, stride)
+    covered = diff.cumsum(axis=0).cumsum(axis=1)[:height, :width] > 0
+    
+    # 빈 칸만 벽으로
+    grid_map[covered & (grid_map == TILE_EMPTY)] = TILE_WALL
+
+
+def component_labels(grid_map):
+    """벽이 아닌 타일의 4방향 연결 요소 라벨 (0은 벽)"""
+    labels, _ = ndimage.label(grid_map != TILE_WALL)
+    return labels
+
+
+def connect_points(grid_map, start, targets):
+    """
+    targets가 모두 start와 같은 연결 요소에 속하도록 필요한 곳에 복도를 뚫음
+    
+    떨어진 목표마다 start 요소에서 가장 가까운 타일까지 ㄱ자 복도(가로 -> 세로)를 낸다.
+    
+    Returns:
+        뚫은 복도 수
+    """
+    carved = 0
+    for tx, ty in targets:
+        labels = component_labels(grid_map)
+        main = labels[start[1], start[0]]
+        if labels[ty, tx] == main:
+            continue
+        
+        ys, xs = np.nonzero(labels == main)
+        nearest = np.argmin(np.abs(xs - tx) + np.abs(ys - ty))
+        nx, ny = int(xs[nearest]), int(ys[nearest])
+        
+        x0, x1 = min(nx, tx), max(nx, tx)
+        y0, y1 = min(ny, ty), max(ny, ty)
+        row = grid_map[ty, x0:x1 + 1]
+        row[row == TILE_WALL] = TILE_EMPTY
+        col = grid_map[y0:y1 + 1, nx]
+        col[col == TILE_WALL] = TILE_EMPTY
+        carved += 1
+    return carved
+
+
+def place_keys(grid_map, rng, spawn, count, min_spawn_dist, min_spacing, avoid=()):
+    """
+    spawn에서 도달 가능한 빈 타일 중에서 열쇠 위치 샘플링
+    
+    spawn과 맨해튼 거리 min_spawn_dist 초과, 열쇠끼리 min_spacing 이상 떨어지도록 뽑고,
+    조건을 만족하는 칸이 모자라면 거리 조건 없이 도달 가능한 칸에서 채운다.
+    
+    Args:
+        avoid: 열쇠를 두지 않을 타일들 (출구 등)
+    
+    Returns:
+        [(x, y), ...] (grid_map에 TILE_KEY로 기록됨)
+    """
+    labels = component_labels(grid_map)
+    reachable = (labels == labels[spawn[1], spawn[0]]) & (grid_map == TILE_EMPTY)
+    for x, y in avoid:
+        reachable[y, x] = False
+    
+    height, width = grid_map.shape
+    yy, xx = np.mgrid[0:height, 0:width]
+    candidates = reachable & (np.abs(xx - spawn[0]) + np.abs(yy - spawn[1]) > min_spawn_dist)
+    
+    keys = []
+    while len(keys) < count:
+        pool = candidates if candidates.any() else reachable
+        ys, xs = np.nonzero(pool)
+        if len(xs) == 0:
+            break
+        
+        i = rng.integers(len(xs))
+        x, y = int(xs[i]), int(ys[i])
+        keys.append((x, y))
+        grid_map[y, x] = TILE_KEY
+        
+        # 이미 뽑은 열쇠 주변 제외
+        reachable[y, x] = False
+        candidates &= np.abs(xx - x) + np.abs(yy - y) >= min_spacing
+        candidates[y, x] = False
+    return keys
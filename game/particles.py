@@ -105,9 +105,13 @@ class ParticleSystem:
         self.particles = [p for p in self.particles if p.is_alive()]
     
     def draw(self, surface, camera_offset=(0, 0)):
-        """모든 파티클 그리기"""
+        """모든 파티클 그리기 (화면 밖 파티클은 임시 서페이스를 만들지 않고 스킵)"""
+        ox, oy = camera_offset
+        width, height = surface.get_size()
         for particle in self.particles:
-            particle.draw(surface, camera_offset)
+            size = particle.size
+            if -size <= particle.x - ox <= width + size and -size <= particle.y - oy <= height + size:
+                particle.draw(surface, camera_offset)
     
     def clear(self):
         """모든 파티클 제거"""
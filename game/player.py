@@ -6,17 +6,23 @@ import pygame
 import math
 from config import (
     PLAYER_SPEED, PLAYER_DASH_SPEED, PLAYER_DASH_DURATION, PLAYER_DASH_COOLDOWN,
-    PLAYER_MAX_HEALTH, PLAYER_INVINCIBLE_TIME, COLOR_GREEN, COLOR_CYAN,
+    PLAYER_MAX_HEALTH, PLAYER_INVINCIBLE_TIME, COLOR_GREEN, COLOR_CYAN, PLAYER_MOVE_EVENT_TILES,
     SKILL_WALL_COOLDOWN, SKILL_NOISE_COOLDOWN, SKILL_SLOWMO_COOLDOWN,
     SKILL_WALL_DURATION, SKILL_NOISE_DURATION, SKILL_SLOWMO_DURATION
 )
 from game.grid import world_to_grid, check_collision_circle, get_rectangle_tiles
+from game.events import EventSource
 
 
-class Player:
-    """플레이어 캐릭터"""
+class Player(EventSource):
+    """플레이어 캐릭터
+    
+    이벤트:
+        'moved' (player, tile): 마지막 이벤트 이후 PLAYER_MOVE_EVENT_TILES 타일 이상 이동
+    """
     
     def __init__(self, x, y):
+        super().__init__()
         self.x = x
         self.y = y
         self.radius = 12
@@ -39,6 +45,9 @@ class Player:
         self.noise_skill_cooldown = 0
         self.slowmo_skill_cooldown = 0
         
+        # 'moved' 이벤트를 마지막으로 보낸 타일
+        self.event_tile = world_to_grid(x, y)
+        
         # 통계
         self.stats = {
             'distance_traveled': 0,
@@ -173,6 +182,13 @@ class Player:
             if not check_collision_circle(self.x, new_y, self.radius, level.grid_map):
                 self.y = new_y
                 self.stats['distance_traveled'] += abs(vy * speed * dt)
+            
+            # 충분히 움직였으면 구독자(적)에게 알림
+            tile = world_to_grid(self.x, self.y)
+            ex, ey = self.event_tile
+            if max(abs(tile[0] - ex), abs(tile[1] - ey)) >= PLAYER_MOVE_EVENT_TILES:
+                self.event_tile = tile
+                self.emit('moved', self, tile)
     
     def take_damage(self):
         """피해 입기"""
@@ -6,8 +6,7 @@ import pygame
 from config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, HUD_MARGIN, HUD_FONT_SIZE,
     COLOR_WHITE, COLOR_RED, COLOR_GREEN, COLOR_BLUE, COLOR_YELLOW,
-    COLOR_GRAY, MINIMAP_SIZE, MINIMAP_ALPHA, GRID_WIDTH, GRID_HEIGHT,
-    TILE_WALL, TILE_KEY, TILE_EXIT
+    COLOR_GRAY, MINIMAP_SIZE, MINIMAP_ALPHA, TILE_SIZE
 )
 
 
@@ -23,6 +22,10 @@ class UI:
         self.minimap_enabled = True
         self.show_debug = False
         
+        # 미니맵 고정 벽 캐시 (레벨이 바뀔 때만 다시 그림)
+        self._minimap_base = None
+        self._minimap_level = None
+    
     def draw_hud(self, surface, player, level, time_left, game_state):
         """HUD 그리기"""
         # 체력
@@ -39,7 +42,13 @@ class UI:
         
         # 미니맵
         if self.minimap_enabled:
-            self._draw_minimap(surface, player, level, game_state.enemies)
+            self._draw_minimap(surface, player, level, game_state.enemies, game_state.camera)
+        
+        # 디버그 통계 (F3)
+        if self.show_debug:
+            self._draw_debug_stats(surface, level, game_state.replan_scheduler,
+                                   game_state.planning_executor, game_state.tile_renderer,
+                                   game_state.cooperative)
     
     def _draw_health(self, surface, health):
         """체력 표시"""
@@ -134,55 +143,97 @@ class UI:
         text_rect = text.get_rect(center=(x + 60, y + 17))
         surface.blit(text, text_rect)
     
-    def _draw_minimap(self, surface, player, level, enemies):
-        """미니맵"""
+    def _draw_minimap(self, surface, player, level, enemies, camera=None):
+        """미니맵 (맵 크기에 맞춰 축소, 고정 벽은 캐시한 서페이스 재사용)"""
         size = MINIMAP_SIZE
         x = SCREEN_WIDTH - size - HUD_MARGIN
         y = SCREEN_HEIGHT - size - HUD_MARGIN
         
-        # 반투명 배경
-        minimap_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        minimap_surface.fill((30, 30, 40, MINIMAP_ALPHA))
-        
-        # 스케일 계산
-        scale_x = size / GRID_WIDTH
-        scale_y = size / GRID_HEIGHT
-        
-        # 맵 그리기
-        for gy in range(GRID_HEIGHT):
-            for gx in range(GRID_WIDTH):
-                tile = level.grid_map[gy][gx]
-                mx = int(gx * scale_x)
-                my = int(gy * scale_y)
-                
-                if tile == TILE_WALL:
-                    pygame.draw.rect(minimap_surface, COLOR_GRAY, 
-                                   (mx, my, max(2, int(scale_x)), max(2, int(scale_y))))
-                elif tile == TILE_KEY:
-                    pygame.draw.circle(minimap_surface, COLOR_YELLOW,
-                                     (mx + int(scale_x/2), my + int(scale_y/2)), 3)
-                elif tile == TILE_EXIT:
-                    pygame.draw.rect(minimap_surface, COLOR_GREEN,
-                                   (mx, my, max(3, int(scale_x)), max(3, int(scale_y))))
+        # 스케일 계산 (월드 좌표 -> 미니맵 좌표)
+        height, width = level.grid_map.shape
+        scale_x = size / width
+        scale_y = size / height
+        
+        if self._minimap_level is not level:
+            self._minimap_level = level
+            self._minimap_base = self._render_minimap_base(level.static_map, scale_x, scale_y)
+        minimap_surface = self._minimap_base.copy()
+        
+        # 열쇠/출구 (동적 타일만 매 프레임)
+        for gx, gy in level.key_positions:
+            pygame.draw.circle(minimap_surface, COLOR_YELLOW,
+                             (int((gx + 0.5) * scale_x), int((gy + 0.5) * scale_y)), 3)
+        ex, ey = level.exit_pos
+        pygame.draw.rect(minimap_surface, COLOR_GREEN,
+                       (int(ex * scale_x), int(ey * scale_y), max(3, int(scale_x)), max(3, int(scale_y))))
         
         # 적 표시
         for enemy in enemies:
-            ex = int(enemy.x / SCREEN_WIDTH * GRID_WIDTH * scale_x)
-            ey = int(enemy.y / SCREEN_HEIGHT * GRID_HEIGHT * scale_y)
+            ex = int(enemy.x / TILE_SIZE * scale_x)
+            ey = int(enemy.y / TILE_SIZE * scale_y)
             pygame.draw.circle(minimap_surface, enemy.color, (ex, ey), 3)
         
         # 플레이어 표시
-        px = int(player.x / SCREEN_WIDTH * GRID_WIDTH * scale_x)
-        py = int(player.y / SCREEN_HEIGHT * GRID_HEIGHT * scale_y)
+        px = int(player.x / TILE_SIZE * scale_x)
+        py = int(player.y / TILE_SIZE * scale_y)
         pygame.draw.circle(minimap_surface, COLOR_GREEN, (px, py), 4)
         pygame.draw.circle(minimap_surface, COLOR_WHITE, (px, py), 4, 1)
         
+        # 카메라가 보고 있는 영역
+        if camera is not None:
+            view = pygame.Rect(int(camera.x / TILE_SIZE * scale_x), int(camera.y / TILE_SIZE * scale_y),
+                               int(camera.view_width / TILE_SIZE * scale_x),
+                               int(camera.view_height / TILE_SIZE * scale_y))
+            pygame.draw.rect(minimap_surface, COLOR_WHITE, view.clip(minimap_surface.get_rect()), 1)
+        
         # 테두리
         pygame.draw.rect(minimap_surface, COLOR_WHITE, (0, 0, size, size), 2)
         
         # 표면에 그리기
         surface.blit(minimap_surface, (x, y))
     
+    def _render_minimap_base(self, static_map, scale_x, scale_y):
+        """반투명 배경 + 고정 벽 (스테이지마다 한 번)"""
+        size = MINIMAP_SIZE
+        base = pygame.Surface((size, size), pygame.SRCALPHA)
+        base.fill((30, 30, 40, MINIMAP_ALPHA))
+        
+        tile_w, tile_h = max(2, int(scale_x)), max(2, int(scale_y))
+        for gy, gx in zip(*static_map.nonzero()):
+            pygame.draw.rect(base, COLOR_GRAY, (int(gx * scale_x), int(gy * scale_y), tile_w, tile_h))
+        return base
+    
+    def _draw_debug_stats(self, surface, level, scheduler, executor=None, renderer=None,
+                          cooperative=None):
+        """경로 캐시 / 재계획 스케줄러 / 백그라운드 계획 / 렌더링 / 협력 경로 통계 (디버그)"""
+        stats = level.path_cache.stats()
+        replan = scheduler.stats()
+        lines = [
+            f"Path cache: {stats['entries']}/{stats['max_entries']}",
+            f"Hit: {stats['hits']}  Partial: {stats['partial_hits']}  Miss: {stats['misses']}",
+            f"Hit rate: {stats['hit_rate'] * 100:.1f}%  Invalidated: {stats['invalidated']}",
+            f"Replan: {replan['spent_ms']:.1f}/{replan['budget_ms']:.1f} ms  Ran: {replan['executed']}",
+            f"Queue: {replan['queue_depth']}  Tasks: {replan['tasks']}  Max wait: {replan['max_wait']}"
+        ]
+        if executor is not None:
+            jobs = executor.stats()
+            lines.append(f"Jobs: {jobs['in_flight']} running  {jobs['completed']} done  "
+                         f"{jobs['discarded']} stale")
+        if renderer is not None:
+            lines.append(f"Map: {level.width}x{level.height}  Chunks drawn: {renderer.chunks_drawn}  "
+                         f"Overlay: {level.overlay.allocated_chunks} chunks "
+                         f"{level.overlay.nbytes // 1024} KB")
+        if cooperative is not None:
+            lines.append(f"Reserved: {len(cooperative.reservations)}  "
+                         f"Window: {cooperative.window}  Expanded: {cooperative.expanded}")
+        
+        x = HUD_MARGIN
+        y = SCREEN_HEIGHT - HUD_MARGIN - len(lines) * 20
+        for line in lines:
+            text = self.font_small.render(line, True, COLOR_WHITE)
+            surface.blit(text, (x, y))
+            y += 20
+    
     def draw_game_over(self, surface, won, stats, stage_num):
         """게임 오버 화면"""
         # 반투명 오버레이
@@ -48,6 +48,7 @@ def main():
         pygame.display.flip()
     
     # 종료
+    game.shutdown()
     pygame.quit()
     sys.exit()
 